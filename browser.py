@@ -0,0 +1,182 @@
+import os
+import queue
+import shutil
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from selenium import webdriver
+from local_state import state_path
+import cassette
+
+# ==========================================
+# [공통] 크롤러용 Chrome 드라이버 생성
+# ==========================================
+# FLINTSTONING_CHROME_PROFILE=1 이면 소스별로 고정된 user-data-dir을 사용해
+# JS 번들/폰트/CSS의 HTTP 디스크 캐시와 서비스 워커 캐시를 다음 실행에서 재사용합니다.
+# 프로필은 .flintstoning/chrome-profile/<source>/<slot> 아래에 두고 (동시에 뜨는 드라이버마다
+# slot 하나), 워크플로에서는 actions/cache로 이 디렉터리를 복원/저장합니다.
+#
+# 캐시가 계속 커지지 않도록 Chrome 자체 캐시 크기 제한(--disk-cache-size)을 걸고,
+# 실행 전 프로필 전체 크기가 상한을 넘으면 오래된 캐시 디렉터리부터 지웁니다.
+
+PROFILE_ENV = "FLINTSTONING_CHROME_PROFILE"
+PROFILE_CAP_MB = int(os.environ.get("FLINTSTONING_CHROME_PROFILE_MB", "300"))
+DISK_CACHE_MB = 200
+
+# 지워도 되는 캐시 디렉터리 (쿠키, 로컬 스토리지 등 나머지 프로필은 유지)
+CACHE_DIRS = [
+    os.path.join("Default", "Cache"),
+    os.path.join("Default", "Code Cache"),
+    os.path.join("Default", "GPUCache"),
+    os.path.join("Default", "Service Worker", "CacheStorage"),
+    os.path.join("Default", "Service Worker", "ScriptCache"),
+]
+
+# 다른 러너에서 복원한 프로필에 남아 있으면 Chrome이 프로필을 열지 못함
+LOCK_FILES = ["SingletonLock", "SingletonCookie", "SingletonSocket"]
+
+DEFAULT_STEALTH = "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
+
+# selenium(기본): chromedriver 경유, cdp: DevTools WebSocket으로 직접 조작 (cdp_driver.py)
+DRIVER_ENV = "FLINTSTONING_DRIVER"
+
+
+def profile_enabled():
+    return os.environ.get(PROFILE_ENV, "") == "1"
+
+
+def profile_dir(source, slot=0):
+    return os.path.dirname(state_path("chrome-profile", source, str(slot), "Local State"))
+
+
+def _dir_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def prune_profile(path, cap_mb=PROFILE_CAP_MB):
+    total = _dir_size(path)
+    if total <= cap_mb * 1024 * 1024: return
+
+    caches = [os.path.join(path, d) for d in CACHE_DIRS if os.path.isdir(os.path.join(path, d))]
+    caches.sort(key=os.path.getmtime)
+    for cache in caches:
+        size = _dir_size(cache)
+        shutil.rmtree(cache, ignore_errors=True)
+        total -= size
+        print(f"🧹 브라우저 캐시 정리: {os.path.relpath(cache, path)} ({size / 1024 / 1024:.0f}MB)")
+        if total <= cap_mb * 1024 * 1024: break
+
+
+def use_profile(options, source, slot=0):
+    path = profile_dir(source, slot)
+    for name in LOCK_FILES:
+        lock = os.path.join(path, name)
+        if os.path.lexists(lock): os.remove(lock)
+    prune_profile(path)
+
+    options.add_argument(f"--user-data-dir={path}")
+    options.add_argument(f"--disk-cache-size={DISK_CACHE_MB * 1024 * 1024}")
+    return path
+
+
+# options는 각 크롤러가 구성하고, 공통 처리(프로필, 자동화 흔적 제거)만 여기서 합니다.
+def create_driver(options, source, stealth=DEFAULT_STEALTH, slot=0):
+    backend = os.environ.get(DRIVER_ENV, "selenium")
+    if backend not in ("selenium", "cdp"):
+        raise Exception(f"{DRIVER_ENV} 값은 selenium 또는 cdp 이어야 합니다: {backend}")
+
+    def launch():
+        if backend == "cdp":
+            import cdp_driver
+            # 소스별 브라우저 하나에 탭을 여럿 여므로 프로필도 slot 0 하나만 사용
+            prepare = (lambda: use_profile(options, source, 0)) if profile_enabled() else None
+            return cdp_driver.open_tab(options, source, prepare)
+        if profile_enabled():
+            use_profile(options, source, slot)
+        return webdriver.Chrome(options=options)
+
+    # 카세트 녹화/재생 중이면 드라이버 조작도 함께 녹화/재생
+    cassette.start(source)
+    driver = cassette.open_resource('driver', launch)
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": stealth})
+    return driver
+
+
+# ==========================================
+# [공통] 목록 페이지/필터 병렬 수집
+# ==========================================
+# 크롤러 CONFIG의 "urls"(필터/페이지별 목록 주소)를 드라이버 여러 개로 동시에 수집하고,
+# 결과는 주소 순서대로 url 기준 중복 제거 후 합칩니다.
+# 동시에 뜨는 드라이버 수는 concurrency로 제한하며, 각 작업은 빈 slot 번호를 받아
+# 해당 slot의 프로필로 드라이버를 띄웁니다 (같은 프로필을 두 Chrome이 함께 쓰지 않도록).
+#
+# paged()로 만든 페이지 묶음은 1페이지부터 차례로 수집하고, 어떤 페이지가 비었거나
+# 이전 페이지와 같은 항목만 돌려주면 (사이트가 페이지 파라미터를 무시하는 경우) 그 뒤 페이지는
+# 건너뜁니다. 파라미터를 잘못 짐작해도 목록마다 한 번만 더 읽고 멈춥니다.
+
+DEFAULT_CONCURRENCY = int(os.environ.get("FLINTSTONING_SCRAPE_CONCURRENCY", "3"))
+
+
+# 목록 주소마다 [1페이지, 2페이지, ..., pages페이지] 묶음을 만듦 (CONFIG의 "pages"/"page_param", 1페이지는 원래 주소)
+def paged(urls, pages=1, param="page"):
+    chains = []
+    for url in urls:
+        parts = urlsplit(url)
+        query = [(k, v) for k, v in parse_qsl(parts.query) if k != param]
+        chains.append([url] + [urlunsplit(parts._replace(query=urlencode(query + [(param, str(page))])))
+                               for page in range(2, pages + 1)])
+    return chains
+
+
+# targets: 목록 주소 목록 (paged()의 페이지 묶음도 가능)
+def fan_out(targets, scrape_one, concurrency=DEFAULT_CONCURRENCY, key='url'):
+    chains = [t if isinstance(t, list) else [t] for t in targets]
+    workers = max(1, min(concurrency, len(chains)))
+    if cassette.active():
+        # 녹화/재생 순서가 어긋나지 않도록 카세트 사용 중에는 순차 실행
+        workers = 1
+    slots = queue.Queue()
+    for slot in range(workers):
+        slots.put(slot)
+
+    def run(target):
+        slot = slots.get()
+        try:
+            return scrape_one(target, slot)
+        finally:
+            slots.put(slot)
+
+    results = {}   # (목록 번호, 페이지 번호) -> 행 목록
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        running = {pool.submit(run, chain[0]): (c, 0) for c, chain in enumerate(chains)}
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                c, p = running.pop(future)
+                target = chains[c][p]
+                try:
+                    rows = future.result()
+                except Exception as e:
+                    print(f"❌ 목록 수집 실패 ({target}): {e}")
+                    continue
+                results[(c, p)] = rows
+                if p + 1 >= len(chains[c]): continue
+                keys = {row[key] for row in rows}
+                if not keys or p > 0 and keys == {row[key] for row in results[(c, p - 1)]}:
+                    print(f"ℹ️ 빈 페이지이거나 이전 페이지와 같음 ({target}): 남은 {len(chains[c]) - p - 1}페이지 건너뜀")
+                    continue
+                running[pool.submit(run, chains[c][p + 1])] = (c, p + 1)
+
+    merged, seen = [], set()
+    for position in sorted(results):
+        for row in results[position]:
+            if row[key] in seen: continue
+            seen.add(row[key])
+            merged.append(row)
+    return merged
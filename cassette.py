@@ -0,0 +1,286 @@
+import os
+import json
+import gzip
+import time
+import atexit
+import hashlib
+import importlib
+import threading
+from datetime import datetime
+from types import SimpleNamespace
+from local_state import state_path
+
+# ==========================================
+# [공통] 외부 I/O 녹화/재생 (cassette)
+# ==========================================
+# 실제 크롤러/센더 실행의 외부 호출(페이지 HTML, 브라우저 조작, OpenAI, 슬랙, 시트 읽기/쓰기)을
+# 로컬 카세트에 녹화하고, 같은 파이프라인을 네트워크/API 비용 없이 다시 돌려 봅니다.
+#
+#   FLINTSTONING_CASSETTE=record              # .flintstoning/cassettes/<source>-<시각>.json.gz 로 녹화
+#   FLINTSTONING_CASSETTE=record:<name>       # 이름 지정 녹화
+#   FLINTSTONING_CASSETTE=replay:<name>       # 녹화본으로 재생 (외부 호출 없음)
+#   FLINTSTONING_REPLAY_LATENCY=original      # 재생 시 녹화된 응답 시간과 대기를 그대로 재현 (기본: zero)
+#
+# 응답 본문은 내용의 sha256으로 저장(blobs/<hh>/<hash>.json.gz)해 여러 카세트가 공유하고,
+# 카세트 파일에는 호출 순서와 요청 키, 응답 blob, 소요 시간만 남깁니다.
+# 재생은 같은 객체/메서드에서 요청 키가 같은 녹화를 먼저 찾고, 없으면(시각 등이 들어간 요청)
+# 녹화 순서대로 다음 응답을 돌려줍니다.
+#
+# 재생한 실행은 실제 판정이 아니므로 센더 실행 리포트(.flintstoning/reports/)를 남기지 않습니다.
+
+CASSETTE_ENV = "FLINTSTONING_CASSETTE"
+LATENCY_ENV = "FLINTSTONING_REPLAY_LATENCY"
+
+
+class CassetteMiss(Exception):
+    pass
+
+
+def _digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, sort_keys=True, default=str)
+
+
+def _to_namespace(value):
+    if isinstance(value, dict):
+        return SimpleNamespace(**{k: _to_namespace(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return [_to_namespace(v) for v in value]
+    return value
+
+
+# 녹화된 예외를 같은 타입으로 다시 만들어, except 절이 녹화 때와 똑같이 동작하도록 함
+def _rebuild_error(value):
+    module_name, _, class_name = value.get('type', '').rpartition('.')
+    try:
+        cls = getattr(importlib.import_module(module_name), class_name)
+        if isinstance(cls, type) and issubclass(cls, Exception):
+            return cls(value['__error__'])
+    except Exception:
+        pass
+    return Exception(value['__error__'])
+
+
+# requests.Response 대신 돌려주는 응답 (헤더 대소문자 무시, raise_for_status는 requests.HTTPError)
+class ReplayResponse:
+    def __init__(self, data):
+        from requests.structures import CaseInsensitiveDict
+        self.status_code = data['status_code']
+        self.headers = CaseInsensitiveDict(data['headers'])
+        self.url = data['url']
+        self.text = data['text']
+        self.content = self.text.encode('utf-8')
+
+    @property
+    def encoding(self):
+        return 'utf-8'
+
+    def iter_content(self, chunk_size=1, decode_unicode=False):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def close(self):
+        pass
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            from requests import HTTPError
+            raise HTTPError(f"{self.status_code} Error for url: {self.url}", response=self)
+
+
+class Cassette:
+    def __init__(self, mode, name, latency="zero"):
+        self.mode = mode
+        self.name = name
+        self.latency = latency
+        self.path = state_path("cassettes", f"{name}.json.gz")
+        self.lock = threading.Lock()
+        self.counter = 0
+        self.entries = []
+        if mode == "replay":
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                self.entries = json.load(f)
+            self.used = [False] * len(self.entries)
+
+    @property
+    def replaying(self):
+        return self.mode == "replay"
+
+    def next_id(self, prefix):
+        with self.lock:
+            self.counter += 1
+            return f"{prefix}#{self.counter}"
+
+    # ---------- blob 저장소 ----------
+    def _blob_path(self, digest):
+        return state_path("cassettes", "blobs", digest[:2], f"{digest}.json.gz")
+
+    def put_blob(self, value):
+        data = _dumps(value).encode('utf-8')
+        digest = _digest(data)
+        path = self._blob_path(digest)
+        if not os.path.exists(path):
+            with gzip.open(path, "wb") as f:
+                f.write(data)
+        return digest
+
+    def get_blob(self, digest):
+        with gzip.open(self._blob_path(digest), "rt", encoding="utf-8") as f:
+            return json.load(f)
+
+    # ---------- 녹화 ----------
+    def record(self, path, op, key, value, elapsed):
+        entry = {'path': path, 'op': op, 'key': key, 'blob': self.put_blob(value), 'elapsed': round(elapsed, 4)}
+        with self.lock:
+            self.entries.append(entry)
+
+    def save(self):
+        if self.replaying: return
+        with gzip.open(self.path, "wt", encoding="utf-8") as f:
+            json.dump(self.entries, f, ensure_ascii=False)
+        print(f"📼 카세트 저장: {self.path} ({len(self.entries)}건)")
+
+    # ---------- 재생 ----------
+    def _find(self, path, key=None, peek=False):
+        with self.lock:
+            candidates = [i for i, e in enumerate(self.entries) if not self.used[i] and e['path'] == path]
+            if not candidates: return None
+            exact = [i for i in candidates if self.entries[i]['key'] == key]
+            index = (exact or candidates)[0]
+            if not peek: self.used[index] = True
+            return self.entries[index]
+
+    def replay(self, path, key):
+        entry = self._find(path, key)
+        if entry is None:
+            raise CassetteMiss(f"카세트에 없는 호출: {path}")
+        if self.latency == "original":
+            time.sleep(entry['elapsed'])
+        return entry['op'], self.get_blob(entry['blob'])
+
+    def peek_op(self, path):
+        entry = self._find(path, peek=True)
+        return entry['op'] if entry else None
+
+    # ---------- 결과 변환 ----------
+    def encode(self, path, value):
+        """녹화할 값과 호출자에게 돌려줄 값을 함께 만든다."""
+        try:
+            json.dumps(value)
+            return value, value
+        except (TypeError, ValueError):
+            pass
+        if hasattr(value, 'status_code') and hasattr(value, 'text'):
+            data = {'status_code': value.status_code, 'headers': dict(value.headers), 'url': getattr(value, 'url', ''), 'text': value.text}
+            return {'__response__': data}, value
+        if hasattr(value, 'model_dump'):
+            return {'__namespace__': value.model_dump()}, value
+        if isinstance(value, (list, tuple)):
+            # [요소, href, 텍스트] 같은 중첩 목록도 항목별로 값 또는 프록시로 녹화
+            pairs = [self.encode(path, item) for item in value]
+            return {'__list__': [stored for stored, _ in pairs]}, [result for _, result in pairs]
+        proxy = Recorder(self, self.next_id(path), value)
+        return {'__proxy__': proxy._id}, proxy
+
+    def decode(self, value):
+        if isinstance(value, dict):
+            if '__response__' in value: return ReplayResponse(value['__response__'])
+            if '__namespace__' in value: return _to_namespace(value['__namespace__'])
+            if '__list__' in value: return [self.decode(item) for item in value['__list__']]
+            if '__proxies__' in value: return [Recorder(self, i) for i in value['__proxies__']]
+            if '__proxy__' in value: return Recorder(self, value['__proxy__'])
+            if '__error__' in value: raise _rebuild_error(value)
+        return value
+
+
+class Recorder:
+    """외부 객체를 감싸 속성 조회/메서드 호출을 녹화하거나, 녹화본으로 대신 응답하는 프록시."""
+
+    def __init__(self, cassette, obj_id, target=None):
+        self._cassette = cassette
+        self._id = obj_id
+        self._target = target
+
+    def __getattr__(self, name):
+        cassette, path = self._cassette, f"{self._id}.{name}"
+
+        if cassette.replaying:
+            if cassette.peek_op(path) == 'attr':
+                return cassette.decode(cassette.replay(path, None)[1])
+            return lambda *args, **kwargs: self._replay_call(path, args, kwargs)
+
+        value = getattr(self._target, name)
+        if callable(value):
+            return lambda *args, **kwargs: self._record_call(path, value, args, kwargs)
+        stored, result = cassette.encode(path, value)
+        cassette.record(path, 'attr', None, stored, 0)
+        return result
+
+    def _key(self, args, kwargs):
+        return _digest(_dumps([args, kwargs]).encode('utf-8'))
+
+    def _record_call(self, path, method, args, kwargs):
+        started = time.time()
+        try:
+            value = method(*args, **kwargs)
+        except Exception as e:
+            error = {'__error__': str(e), 'type': f"{type(e).__module__}.{type(e).__qualname__}"}
+            self._cassette.record(path, 'call', self._key(args, kwargs), error, time.time() - started)
+            raise
+        stored, result = self._cassette.encode(path, value)
+        self._cassette.record(path, 'call', self._key(args, kwargs), stored, time.time() - started)
+        return result
+
+    def _replay_call(self, path, args, kwargs):
+        return self._cassette.decode(self._cassette.replay(path, self._key(args, kwargs))[1])
+
+
+_active = None
+
+
+def active():
+    return _active
+
+
+def start(source):
+    """FLINTSTONING_CASSETTE 설정에 따라 녹화/재생을 시작한다 (설정이 없으면 None)."""
+    global _active
+    if _active is not None: return _active
+    spec = os.environ.get(CASSETTE_ENV, "")
+    if not spec: return None
+
+    mode, _, name = spec.partition(":")
+    if mode not in ("record", "replay"):
+        raise Exception(f"{CASSETTE_ENV} 값은 record[:이름] 또는 replay:이름 이어야 합니다: {spec}")
+    if mode == "replay" and not name:
+        raise Exception("재생할 카세트 이름이 필요합니다 (replay:<name>).")
+
+    name = name or f"{source}-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
+    _active = Cassette(mode, name, os.environ.get(LATENCY_ENV, "zero"))
+    print(f"📼 카세트 {'재생' if _active.replaying else '녹화'}: {name}")
+    if not _active.replaying:
+        atexit.register(_active.save)
+    return _active
+
+
+# 외부 자원(시트, 드라이버, API 클라이언트 등)을 열 때 사용.
+# 녹화 중이면 감싸서, 재생 중이면 실제 자원을 만들지 않고 녹화본 프록시를 돌려준다.
+def open_resource(name, factory):
+    if _active is None:
+        return factory()
+    if _active.replaying:
+        return Recorder(_active, _active.next_id(name))
+    return Recorder(_active, _active.next_id(name), factory())
+
+
+# 봇 감지 방지/렌더링 대기용 sleep. 재생(zero)에서는 기다리지 않음
+def pause(seconds):
+    if _active is not None and _active.replaying and _active.latency == "zero":
+        return
+    time.sleep(seconds)
@@ -0,0 +1,400 @@
+import os
+import json
+import time
+import shutil
+import tempfile
+import itertools
+import threading
+import subprocess
+import websocket
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import (
+    JavascriptException, NoSuchElementException, TimeoutException, WebDriverException,
+)
+
+# ==========================================
+# [공통] chromedriver 없이 DevTools WebSocket으로 Chrome을 직접 조작하는 드라이버
+# ==========================================
+# FLINTSTONING_DRIVER=cdp 이면 browser.create_driver()가 selenium 대신 이 드라이버를 돌려줍니다.
+#   - Python → chromedriver(HTTP) → Chrome 두 단계를 거치지 않고 WebSocket 명령 한 번으로 처리
+#   - 소스별로 Chrome을 하나만 띄우고, 드라이버(get_driver() 호출)마다 탭을 하나씩 엶
+#     (fan_out의 여러 작업이 한 브라우저의 여러 탭에서 동시에 수집)
+#   - 한 WebSocket 연결을 여러 탭(스레드)이 함께 쓰며, 응답은 명령 id로 각 호출자에게 전달
+#
+# 크롤러가 쓰는 selenium 기능만 같은 이름으로 제공합니다:
+#   get, find_element(s) (CSS/TAG/ID/CLASS/NAME/XPATH), execute_script, execute_cdp_cmd,
+#   page_source, current_url, title, get_log("performance"), set_page_load_timeout, quit
+#   요소: text, get_attribute, find_element(s)
+# WebDriverWait/expected_conditions, selenium 예외 타입은 그대로 동작합니다.
+
+CHROME_CANDIDATES = ["google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome"]
+LAUNCH_TIMEOUT = 20
+COMMAND_TIMEOUT = 30
+PAGE_LOAD_TIMEOUT = 60
+OBJECT_GROUP = "flintstoning"
+
+
+def find_chrome(options=None):
+    binary = getattr(options, "binary_location", "") or os.environ.get("CHROME_BIN")
+    if binary: return binary
+    for name in CHROME_CANDIDATES:
+        path = shutil.which(name)
+        if path: return path
+    raise WebDriverException("Chrome 실행 파일을 찾지 못했습니다 (CHROME_BIN 지정 필요).")
+
+
+# selenium Options의 인자를 Chrome 명령행 스위치로 (chromedriver처럼 '--'가 없으면 붙임)
+def chrome_args(options):
+    return [arg if arg.startswith("-") else f"--{arg}" for arg in options.arguments]
+
+
+# ---------- WebSocket 연결 (여러 탭/스레드가 공유) ----------
+class Connection:
+    def __init__(self, url):
+        self.ws = websocket.create_connection(url, suppress_origin=True, enable_multithread=True)
+        self.ids = itertools.count(1)
+        self.pending = {}      # 명령 id -> [Event, 응답]
+        self.listeners = {}    # sessionId -> 이벤트 콜백
+        self.send_lock = threading.Lock()
+        self.closed = False
+        threading.Thread(target=self._read, name="cdp-reader", daemon=True).start()
+
+    def send(self, method, params=None, session_id=None, timeout=COMMAND_TIMEOUT):
+        if self.closed: raise WebDriverException("브라우저 연결이 끊겼습니다.")
+        msg_id = next(self.ids)
+        waiter = [threading.Event(), None]
+        self.pending[msg_id] = waiter
+        message = {'id': msg_id, 'method': method, 'params': params or {}}
+        if session_id: message['sessionId'] = session_id
+        with self.send_lock:
+            self.ws.send(json.dumps(message))
+
+        if not waiter[0].wait(timeout):
+            self.pending.pop(msg_id, None)
+            raise TimeoutException(f"CDP 응답 시간 초과: {method}")
+        response = waiter[1]
+        if response is None:
+            raise WebDriverException("브라우저 연결이 끊겼습니다.")
+        if 'error' in response:
+            raise WebDriverException(f"{method}: {response['error'].get('message')}")
+        return response.get('result', {})
+
+    def _read(self):
+        while True:
+            try:
+                message = json.loads(self.ws.recv())
+            except Exception:
+                break
+            if 'id' in message:
+                waiter = self.pending.pop(message['id'], None)
+                if waiter:
+                    waiter[1] = message
+                    waiter[0].set()
+            else:
+                listener = self.listeners.get(message.get('sessionId'))
+                if listener: listener(message['method'], message.get('params', {}))
+
+        # 연결이 끊기면 기다리던 호출을 모두 깨움
+        self.closed = True
+        for waiter in list(self.pending.values()):
+            waiter[0].set()
+        self.pending.clear()
+
+    def close(self):
+        try:
+            self.ws.close()
+        except Exception:
+            pass
+
+
+# ---------- Chrome 프로세스 ----------
+class Browser:
+    def __init__(self, options, key):
+        self.key = key
+        args = chrome_args(options)
+        self.temp_dir = None
+        user_data = next((a.split("=", 1)[1] for a in args if a.startswith("--user-data-dir=")), None)
+        if not user_data:
+            self.temp_dir = user_data = tempfile.mkdtemp(prefix="flintstoning-cdp-")
+            args.append(f"--user-data-dir={user_data}")
+
+        # 포트 0으로 띄우면 Chrome이 고른 포트와 경로를 프로필의 DevToolsActivePort에 적음
+        port_file = os.path.join(user_data, "DevToolsActivePort")
+        if os.path.exists(port_file): os.remove(port_file)
+        self.process = subprocess.Popen(
+            [find_chrome(options), *args, "--remote-debugging-port=0", "--remote-allow-origins=*",
+             "--no-first-run", "--no-default-browser-check", "about:blank"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+
+        deadline = time.time() + LAUNCH_TIMEOUT
+        while not os.path.exists(port_file) or os.path.getsize(port_file) == 0:
+            if self.process.poll() is not None:
+                raise WebDriverException(f"Chrome이 바로 종료되었습니다 (코드 {self.process.returncode}).")
+            if time.time() > deadline:
+                self.process.kill()
+                raise WebDriverException("Chrome DevTools 포트를 기다리다 시간이 초과되었습니다.")
+            time.sleep(0.05)
+        with open(port_file, encoding="utf-8") as f:
+            port, path = f.read().split("\n")[:2]
+
+        self.conn = Connection(f"ws://127.0.0.1:{port}{path}")
+        self.tabs = 0
+
+    def open_tab(self, log_network=False):
+        target_id = self.conn.send('Target.createTarget', {'url': 'about:blank'})['targetId']
+        session_id = self.conn.send('Target.attachToTarget', {'targetId': target_id, 'flatten': True})['sessionId']
+        return CDPDriver(self, target_id, session_id, log_network)
+
+    def close(self):
+        try:
+            self.conn.send('Browser.close', timeout=5)
+        except Exception:
+            pass
+        self.conn.close()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+        if self.temp_dir:
+            shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+
+# 소스별로 브라우저 하나를 공유하고, 마지막 탭이 닫히면 브라우저도 종료
+_browsers = {}
+_browsers_lock = threading.Lock()
+
+
+# prepare: 새 브라우저를 띄울 때만 한 번 실행 (프로필 준비 등)
+def open_tab(options, key, prepare=None):
+    with _browsers_lock:
+        browser = _browsers.get(key)
+        if browser is None or browser.conn.closed:
+            if prepare: prepare()
+            browser = _browsers[key] = Browser(options, key)
+        browser.tabs += 1
+    logging_prefs = options.capabilities.get("goog:loggingPrefs") or {}
+    try:
+        return browser.open_tab(log_network="performance" in logging_prefs)
+    except Exception:
+        _release(browser)
+        raise
+
+
+def _release(browser):
+    with _browsers_lock:
+        browser.tabs -= 1
+        if browser.tabs > 0: return
+        if _browsers.get(browser.key) is browser: del _browsers[browser.key]
+    browser.close()
+
+
+# ---------- selenium 호환 드라이버 (탭 하나) ----------
+
+# 스크립트 결과의 DOM 노드를 표시로 바꿔 JSON으로 받고, 노드는 따로 objectId로 받음
+CALL_WRAPPER = """function() {
+    const result = (function() { __SCRIPT__ }).apply(window, arguments);
+    const nodes = [];
+    const walk = v => {
+        if (v instanceof Node) { nodes.push(v); return {__node__: nodes.length - 1}; }
+        if (v instanceof NodeList || v instanceof HTMLCollection) v = Array.from(v);
+        if (Array.isArray(v)) return v.map(walk);
+        if (v && typeof v === 'object' && v !== window) {
+            const out = {};
+            for (const key of Object.keys(v)) out[key] = walk(v[key]);
+            return out;
+        }
+        return v === undefined || v === window ? null : v;
+    };
+    return {value: walk(result), nodes: nodes};
+}"""
+
+FIND_CSS = "return Array.from((arguments[0] || document).querySelectorAll(arguments[1]));"
+FIND_XPATH = """
+const snapshot = document.evaluate(arguments[1], arguments[0] || document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+const found = [];
+for (let i = 0; i < snapshot.snapshotLength; i++) found.push(snapshot.snapshotItem(i));
+return found;
+"""
+# selenium처럼 href/src 등은 절대 주소(프로퍼티), 나머지는 속성 값
+GET_ATTRIBUTE = """
+const el = arguments[0], name = arguments[1];
+if (name === 'class') return el.getAttribute('class');
+const prop = el[name];
+if (prop !== undefined && prop !== null && typeof prop !== 'object' && typeof prop !== 'function') return String(prop);
+return el.getAttribute(name);
+"""
+
+CSS_BY = {
+    By.CSS_SELECTOR: lambda v: v,
+    By.TAG_NAME: lambda v: v,
+    By.ID: lambda v: f"[id=\"{v}\"]",
+    By.CLASS_NAME: lambda v: f".{v}",
+    By.NAME: lambda v: f"[name=\"{v}\"]",
+}
+
+
+class CDPElement:
+    def __init__(self, driver, object_id):
+        self.driver = driver
+        self.object_id = object_id
+
+    @property
+    def text(self):
+        return (self.driver.execute_script("return arguments[0].innerText;", self) or "").strip()
+
+    def get_attribute(self, name):
+        return self.driver.execute_script(GET_ATTRIBUTE, self, name)
+
+    def find_elements(self, by=By.ID, value=None):
+        return self.driver._find(by, value, self)
+
+    def find_element(self, by=By.ID, value=None):
+        return self.driver._find_one(by, value, self)
+
+
+class CDPDriver:
+    def __init__(self, browser, target_id, session_id, log_network=False):
+        self.browser = browser
+        self.target_id = target_id
+        self.session_id = session_id
+        self.page_load_timeout = PAGE_LOAD_TIMEOUT
+        self.log_network = log_network
+        self.log = []
+        self.loaded = threading.Event()
+        browser.conn.listeners[session_id] = self._on_event
+        self.execute_cdp_cmd('Page.enable', {})
+        if log_network:
+            self.execute_cdp_cmd('Network.enable', {})
+
+    def _on_event(self, method, params):
+        if method == 'Page.loadEventFired':
+            self.loaded.set()
+        # selenium performance 로그와 같은 형태로 쌓아 get_log("performance")로 돌려줌
+        if self.log_network and method.startswith(('Network.', 'Page.')):
+            self.log.append({
+                'level': 'INFO', 'timestamp': int(time.time() * 1000),
+                'message': json.dumps({'message': {'method': method, 'params': params}, 'webview': self.target_id}),
+            })
+
+    def execute_cdp_cmd(self, cmd, cmd_args=None):
+        return self.browser.conn.send(cmd, cmd_args or {}, self.session_id)
+
+    # ---------- 탐색 ----------
+    def get(self, url):
+        # 이전 페이지에서 받은 요소 핸들은 더 쓸 수 없으므로 정리
+        self.execute_cdp_cmd('Runtime.releaseObjectGroup', {'objectGroup': OBJECT_GROUP})
+        self.loaded.clear()
+        result = self.execute_cdp_cmd('Page.navigate', {'url': url})
+        if result.get('errorText'):
+            raise WebDriverException(f"페이지 열기 실패: {url} ({result['errorText']})")
+        # 같은 문서 안의 이동(#해시 등)은 load 이벤트가 없음
+        if not result.get('loaderId'): return
+        if not self.loaded.wait(self.page_load_timeout):
+            raise TimeoutException(f"페이지 로드 시간 초과: {url}")
+
+    def set_page_load_timeout(self, time_to_wait):
+        self.page_load_timeout = time_to_wait
+
+    def _evaluate(self, expression):
+        result = self.execute_cdp_cmd('Runtime.evaluate', {'expression': expression, 'returnByValue': True, 'awaitPromise': True})
+        if 'exceptionDetails' in result:
+            raise JavascriptException(result['exceptionDetails'].get('text', 'script error'))
+        return result['result'].get('value')
+
+    @property
+    def page_source(self):
+        return self._evaluate("document.documentElement.outerHTML")
+
+    @property
+    def current_url(self):
+        return self._evaluate("location.href")
+
+    @property
+    def title(self):
+        return self._evaluate("document.title")
+
+    def get_log(self, log_type):
+        if log_type != "performance": return []
+        entries, self.log = self.log, []
+        return entries
+
+    # ---------- 스크립트 ----------
+    def execute_script(self, script, *args):
+        declaration = CALL_WRAPPER.replace("__SCRIPT__", script)
+        call_args = [{'objectId': a.object_id} if isinstance(a, CDPElement) else {'value': a} for a in args]
+        element = next((a for a in args if isinstance(a, CDPElement)), None)
+
+        if element is not None:
+            # 요소 인자가 있으면 그 요소가 속한 문서에서 실행
+            result = self.execute_cdp_cmd('Runtime.callFunctionOn', {
+                'functionDeclaration': declaration, 'objectId': element.object_id, 'arguments': call_args,
+                'awaitPromise': True, 'objectGroup': OBJECT_GROUP,
+            })
+        else:
+            result = self.execute_cdp_cmd('Runtime.evaluate', {
+                'expression': f"({declaration}).apply(window, {json.dumps(list(args))})",
+                'awaitPromise': True, 'objectGroup': OBJECT_GROUP,
+            })
+        if 'exceptionDetails' in result:
+            details = result['exceptionDetails']
+            raise JavascriptException(details.get('exception', {}).get('description') or details.get('text', 'script error'))
+
+        holder = result['result']['objectId']
+        value = self._call_on(holder, "function() { return this.value; }", by_value=True)['value']
+        if not self._has_nodes(value): return value
+
+        nodes = self._call_on(holder, "function() { return this.nodes; }")
+        props = self.execute_cdp_cmd('Runtime.getProperties', {'objectId': nodes['objectId'], 'ownProperties': True})
+        elements = {int(p['name']): CDPElement(self, p['value']['objectId'])
+                    for p in props['result'] if p['name'].isdigit()}
+        return self._restore(value, elements)
+
+    def _call_on(self, object_id, declaration, by_value=False):
+        return self.execute_cdp_cmd('Runtime.callFunctionOn', {
+            'functionDeclaration': declaration, 'objectId': object_id,
+            'returnByValue': by_value, 'objectGroup': OBJECT_GROUP,
+        })['result']
+
+    def _has_nodes(self, value):
+        if isinstance(value, dict):
+            return '__node__' in value or any(self._has_nodes(v) for v in value.values())
+        if isinstance(value, list):
+            return any(self._has_nodes(v) for v in value)
+        return False
+
+    def _restore(self, value, elements):
+        if isinstance(value, dict):
+            if set(value) == {'__node__'}: return elements[value['__node__']]
+            return {k: self._restore(v, elements) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self._restore(v, elements) for v in value]
+        return value
+
+    # ---------- 요소 찾기 ----------
+    def _find(self, by, value, root=None):
+        if by == By.XPATH:
+            return self.execute_script(FIND_XPATH, root, value)
+        if by not in CSS_BY:
+            raise WebDriverException(f"cdp 드라이버가 지원하지 않는 탐색 방식입니다: {by}")
+        return self.execute_script(FIND_CSS, root, CSS_BY[by](value))
+
+    def _find_one(self, by, value, root=None):
+        found = self._find(by, value, root)
+        if not found:
+            raise NoSuchElementException(f"요소를 찾지 못했습니다: {by}={value}")
+        return found[0]
+
+    def find_elements(self, by=By.ID, value=None):
+        return self._find(by, value)
+
+    def find_element(self, by=By.ID, value=None):
+        return self._find_one(by, value)
+
+    def quit(self):
+        self.browser.conn.listeners.pop(self.session_id, None)
+        try:
+            self.browser.conn.send('Target.closeTarget', {'targetId': self.target_id}, timeout=5)
+        except Exception:
+            pass
+        _release(self.browser)
@@ -0,0 +1,97 @@
+import os
+import json
+import time
+from local_state import state_path
+
+# ==========================================
+# [공통] 외부 의존성 회로 차단기 (LLM, 슬랙, 시트)
+# ==========================================
+# 외부 서비스가 장애일 때 남은 행마다 페이지 수집 → 실패 → (429면 60초 대기)를 반복하지 않도록,
+# 의존성별로 연속 실패가 THRESHOLD번 쌓이면 회로를 열고(open) 남은 행은 손대지 않고
+# 'archived'로 남긴 채 실행을 끝냅니다.
+#
+#   closed    : 정상. 호출 성공 시 연속 실패 수 초기화
+#   open      : 차단. COOLDOWN_SEC 동안 해당 의존성을 쓰는 행을 시작하지 않음
+#   half_open : 대기 시간이 지나면 한 행만 시험 삼아 처리 → 성공하면 closed, 실패하면 다시 open
+#
+# 상태는 .flintstoning/circuits.json 에 저장해 run-all의 다음 센더와 다음 실행이 이어받습니다.
+
+THRESHOLD = int(os.environ.get("FLINTSTONING_CIRCUIT_THRESHOLD", "3"))
+COOLDOWN_SEC = float(os.environ.get("FLINTSTONING_CIRCUIT_COOLDOWN", "300"))
+DEPENDENCIES = ["llm", "slack", "sheets"]
+
+
+class DependencyError(Exception):
+    """외부 의존성 호출 실패 (행 자체의 문제가 아니므로 'failed'로 표시하지 않음)."""
+
+    def __init__(self, name, error):
+        super().__init__(f"[{name}] {error}")
+        self.name = name
+
+
+class CircuitBreaker:
+    def __init__(self, name, board, state="closed", failures=0, opened_at=0):
+        self.name = name
+        self.board = board
+        self.state = state
+        self.failures = failures
+        self.opened_at = opened_at
+
+    # 지금 이 의존성을 쓰는 행을 시작해도 되는지 (open이고 대기 중이면 False)
+    def allow(self):
+        if self.state != "open": return True
+        if time.time() - self.opened_at < COOLDOWN_SEC: return False
+        self.state = "half_open"
+        print(f"🔌 [{self.name}] 차단 대기 시간 경과 → 한 건으로 복구 여부를 확인합니다.")
+        self.board.save()
+        return True
+
+    def call(self, fn, *args, **kwargs):
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            self.failure()
+            raise DependencyError(self.name, e) from e
+        self.success()
+        return result
+
+    def success(self):
+        if self.state == "closed" and self.failures == 0: return
+        if self.state == "half_open":
+            print(f"✅ [{self.name}] 복구 확인 → 회로를 닫습니다.")
+        self.state, self.failures = "closed", 0
+        self.board.save()
+
+    def failure(self):
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= THRESHOLD:
+            if self.state != "open":
+                print(f"🚫 [{self.name}] 연속 {self.failures}회 실패 → 회로를 엽니다 ({COOLDOWN_SEC:.0f}초).")
+            self.state, self.opened_at = "open", time.time()
+        self.board.save()
+
+
+class CircuitBoard:
+    def __init__(self, path=None):
+        self.path = path or state_path("circuits.json")
+        saved = {}
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    saved = json.load(f)
+            except (OSError, ValueError):
+                saved = {}
+        self.breakers = {name: CircuitBreaker(name, self, **saved.get(name, {})) for name in DEPENDENCIES}
+
+    def __getitem__(self, name):
+        return self.breakers[name]
+
+    # 열려 있는(아직 대기 중인) 회로 이름 목록
+    def blocked(self):
+        return [name for name, breaker in self.breakers.items() if not breaker.allow()]
+
+    def save(self):
+        data = {name: {'state': b.state, 'failures': b.failures, 'opened_at': b.opened_at}
+                for name, b in self.breakers.items()}
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
@@ -0,0 +1,111 @@
+import os
+import json
+import gzip
+import time
+import random
+import hashlib
+import threading
+import importlib
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+from local_state import state_path, STATE_DIR
+from url_utils import url_key
+import cassette
+
+# ==========================================
+# [공통] 상세 페이지 본문 저장소 (크롤링 시점 선수집)
+# ==========================================
+# FLINTSTONING_PREFETCH=1 이면 크롤러가 새 행을 추가한 직후 상세 페이지를 동시에 받아
+# 센더와 같은 규칙(각 *_sender.py CONFIG의 tags, min_text_len)으로 본문을 추출하고
+# .flintstoning/content/<hh>/<hash>.json.gz 에 정규화 URL 키 기준으로 저장합니다.
+# 센더는 저장소를 먼저 보고, 없거나 오래된 항목만 직접 페이지를 받습니다.
+#
+# 같은 호스트에는 PER_HOST개까지만 동시에 요청하고 요청 사이에 HOST_DELAY초씩 쉽니다.
+# 요청과 대기는 카세트(cassette.py)를 거치므로 재생 중에는 네트워크를 쓰지 않으며, 이때는 순차로 받습니다.
+
+PREFETCH_ENV = "FLINTSTONING_PREFETCH"
+MAX_AGE_SEC = 3 * 24 * 3600
+MAX_WORKERS = 8
+PER_HOST = 2
+HOST_DELAY = 1.0
+
+
+def prefetch_enabled():
+    return os.environ.get(PREFETCH_ENV, "") == "1"
+
+
+def _path(url):
+    digest = hashlib.sha256(url_key(url).encode('utf-8')).hexdigest()
+    return state_path("content", digest[:2], f"{digest}.json.gz")
+
+
+def save(url, text):
+    with gzip.open(_path(url), "wt", encoding="utf-8") as f:
+        json.dump({'url': url, 'fetched_at': time.time(), 'text': text}, f, ensure_ascii=False)
+
+
+def load(url, max_age=MAX_AGE_SEC):
+    path = _path(url)
+    if not os.path.exists(path): return None
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if time.time() - entry['fetched_at'] > max_age: return None
+    return entry['text']
+
+
+def prune(max_age=MAX_AGE_SEC):
+    root = os.path.join(STATE_DIR, "content")
+    cutoff = time.time() - max_age
+    for dirpath, _, files in os.walk(root):
+        for name in files:
+            path = os.path.join(dirpath, name)
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+
+
+class _HostLimiter:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.slots = {}
+
+    def slot(self, url):
+        host = urlsplit(url).netloc
+        with self.lock:
+            return self.slots.setdefault(host, threading.Semaphore(PER_HOST))
+
+
+def prefetch(source, urls):
+    if not urls: return 0
+    from http_client import get_session
+    from page_text import read_text
+    from renderer import is_sufficient
+    config = importlib.import_module(f"{source}_sender").CONFIG
+
+    prune()
+    session = cassette.open_resource('http', get_session)
+    limiter = _HostLimiter()
+
+    def fetch(url):
+        with limiter.slot(url):
+            cassette.pause(random.uniform(0, HOST_DELAY))
+            text = read_text(session, url, config, headers=config.get("request_headers"))
+            cassette.pause(HOST_DELAY)
+            # 본문이 부족한 페이지(JS 앱 껍데기)는 저장하지 않아 센더가 렌더링해서 받도록 함
+            if not is_sufficient(text, config):
+                raise Exception(f"본문 부족({len(text)}자)")
+            save(url, text)
+
+    stored = 0
+    # 녹화/재생 순서가 어긋나지 않도록 카세트 사용 중에는 순차 실행
+    with ThreadPoolExecutor(max_workers=1 if cassette.active() else MAX_WORKERS) as pool:
+        for url, future in zip(urls, [pool.submit(fetch, url) for url in urls]):
+            try:
+                future.result()
+                stored += 1
+            except Exception as e:
+                print(f"⚠️ 본문 선수집 실패 ({url}): {e}")
+    print(f"📥 [{source}] 상세 페이지 {stored}/{len(urls)}건 선수집")
+    return stored
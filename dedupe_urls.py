@@ -0,0 +1,69 @@
+from gspread.utils import rowcol_to_a1
+from sheets import get_spreadsheet, get_worksheet, SOURCE_GIDS
+from url_utils import canonicalize, url_key
+from rollover import delete_rows
+
+# ==========================================
+# [공통] 기존 중복 URL 정리 (일회성)
+# ==========================================
+# 정규화 규칙(url_utils.py) 도입 전에 쌓인 행 중, 정규화 키가 같은 행들을 한 행으로 합칩니다.
+#   - 그룹마다 처리 단계가 가장 앞선 행(published > duplicate > dropped > failed > archived)을 남기고,
+#     같으면 먼저 들어온 행을 남김
+#   - 남긴 행의 URL은 정규화한 형태로 고쳐 씀
+# 기본은 보고만 하고, --apply를 줘야 시트를 수정합니다.
+# ⚠️ 행 삭제로 행 번호가 바뀌므로 센더가 도는 시간과 겹치지 않게 실행해야 합니다.
+
+STATUS_RANK = {'published': 5, 'duplicate': 4, 'dropped': 3, 'failed': 2, 'archived': 1}
+
+
+def plan_source(all_v, source):
+    headers = [h.strip() for h in all_v[0]]
+    url_idx, status_idx = headers.index('url'), headers.index('status')
+
+    groups = {}
+    for row_number, row in enumerate(all_v[1:], start=2):
+        cells = row + [''] * (len(headers) - len(row))
+        if not cells[url_idx].strip(): continue
+        groups.setdefault(url_key(cells[url_idx], source), []).append((row_number, cells))
+
+    deletes, rewrites = [], []
+    for rows in groups.values():
+        keep = max(rows, key=lambda r: (STATUS_RANK.get(r[1][status_idx].strip().lower(), 0), -r[0]))
+        deletes += [row_number for row_number, _ in rows if row_number != keep[0]]
+        canonical = canonicalize(keep[1][url_idx], source)
+        if canonical != keep[1][url_idx].strip():
+            rewrites.append((keep[0], canonical))
+    return url_idx, sorted(deletes), rewrites
+
+
+def dedupe_source(spreadsheet, source, apply=False):
+    ws = get_worksheet(SOURCE_GIDS[source], spreadsheet)
+    all_v = ws.get_all_values()
+    if len(all_v) < 2:
+        return print(f"[{source}] 확인할 행 없음")
+
+    url_idx, deletes, rewrites = plan_source(all_v, source)
+    print(f"🔗 [{source}] 전체 {len(all_v) - 1}건 중 중복 {len(deletes)}건, URL 정규화 {len(rewrites)}건")
+    for row_number in deletes[:10]:
+        print(f"  - {row_number}행 삭제: {all_v[row_number - 1][url_idx]}")
+    if not apply or not (deletes or rewrites): return
+
+    # 행 번호가 바뀌기 전에 URL부터 고쳐 쓰고, 삭제는 아래쪽부터 한 번에
+    if rewrites:
+        ws.batch_update([{'range': rowcol_to_a1(row_number, url_idx + 1), 'values': [[url]]} for row_number, url in rewrites])
+    if deletes:
+        delete_rows(spreadsheet, ws, deletes)
+    print(f"✅ [{source}] 중복 {len(deletes)}건 삭제, URL {len(rewrites)}건 정규화 완료")
+
+
+def main(sources=None, apply=False):
+    spreadsheet = get_spreadsheet()
+    for source in sources or SOURCE_GIDS:
+        try:
+            dedupe_source(spreadsheet, source, apply)
+        except Exception as e:
+            print(f"🚨 [{source}] 중복 정리 실패: {e}")
+
+
+if __name__ == "__main__":
+    main()
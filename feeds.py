@@ -0,0 +1,282 @@
+import os
+import re
+import json
+import time
+import codecs
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit
+from xml.etree import ElementTree
+from http_client import get_session
+from local_state import state_path
+from cassette import open_resource
+from url_utils import url_key
+
+# ==========================================
+# [공통] 사이트맵/RSS/Atom 기반 증분 수집
+# ==========================================
+# 아티클 소스(CONFIG["discovery"]에 feeds 또는 match가 있는 크롤러)는 Chrome으로 홈을 열어 스크롤하기 전에
+# 사이트가 공개하는 피드/사이트맵을 일반 HTTP로 읽고, 지난 실행의 기준 시각(watermark)보다
+# 새로운 항목만 돌려줍니다. 피드를 찾지 못하거나 읽지 못하면 None을 돌려주고 크롤러는
+# 기존 DOM 수집으로 넘어갑니다.
+#
+# 피드 주소는 CONFIG의 feeds → 지난 실행에서 찾은 주소 → robots.txt의 Sitemap: 줄과
+# 홈 <head>의 <link rel="alternate"> 순으로 찾고, 찾은 주소는 상태 파일에 남겨 다음 실행은
+# 피드 요청만 합니다. 상태는 .flintstoning/discovery/<source>.json 에 저장됩니다
+# (켜는 소스의 워크플로에는 이 디렉터리를 actions/cache로 복원/저장하는 단계를 함께 추가).
+#
+# CONFIG["discovery"]:
+#   feeds : 확인한 피드/사이트맵 주소 목록
+#   match : 수집할 글 주소 정규식 (사이트 전체 사이트맵의 태그/카테고리 페이지를 거르고,
+#           목록 주소가 카테고리라면 그 범위로 좁힘. 없으면 홈과 같은 호스트 전체)
+# 둘 다 비어 있으면 확인되지 않은 피드로 엉뚱한 페이지를 모으지 않도록 사용하지 않습니다.
+#
+# 날짜가 없는 항목은 기준 시각으로 거를 수 없으므로 시트에 이미 있는 주소(seen)와 비교해 거르고,
+# 날짜가 있는 항목이 하나도 없으면 피드 대신 DOM으로 수집합니다.
+#
+# FLINTSTONING_DISCOVERY=dom 이면 피드를 보지 않고 항상 DOM으로 수집합니다.
+
+DISCOVERY_ENV = "FLINTSTONING_DISCOVERY"
+FIRST_LOOKBACK_DAYS = 3
+MAX_ENTRIES = 50
+MAX_SITEMAPS = 3
+MAX_FEED_BYTES = 5 * 1024 * 1024
+FEED_TYPES = ("application/rss+xml", "application/atom+xml")
+
+
+def _state_file(source):
+    return state_path("discovery", f"{source}.json")
+
+
+def _load_state(source):
+    path = _state_file(source)
+    if not os.path.exists(path): return {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(source, state):
+    with open(_state_file(source), "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+
+
+def _parse_time(value):
+    value = (value or "").strip()
+    if not value: return None
+    try:
+        parsed = parsedate_to_datetime(value)          # RSS pubDate (RFC 822)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))   # Atom/사이트맵 (ISO 8601)
+        except ValueError:
+            return None
+    if parsed.tzinfo is None: parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _local(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def _child(node, name):
+    return next((c for c in node if _local(c.tag) == name), None)
+
+
+def _text(node, *names):
+    for name in names:
+        found = _child(node, name) if node is not None else None
+        if found is not None and (found.text or "").strip():
+            return found.text.strip()
+    return ""
+
+
+# 피드/사이트맵 XML → (항목 목록, 하위 사이트맵 목록). 항목은 {'url', 'title', 'ts'}
+def parse_feed(xml):
+    root = ElementTree.fromstring(xml)
+    kind = _local(root.tag)
+    entries, children = [], []
+
+    if kind == "rss" or kind == "RDF":
+        for item in root.iter():
+            if _local(item.tag) != "item": continue
+            entries.append({'url': _text(item, "link"), 'title': _text(item, "title"),
+                            'ts': _parse_time(_text(item, "pubDate", "date"))})
+    elif kind == "feed":
+        for entry in root:
+            if _local(entry.tag) != "entry": continue
+            link = next((c.get("href") for c in entry if _local(c.tag) == "link" and c.get("rel", "alternate") == "alternate"), "")
+            entries.append({'url': link, 'title': _text(entry, "title"),
+                            'ts': _parse_time(_text(entry, "updated", "published"))})
+    elif kind == "urlset":
+        for url in root:
+            # 뉴스 사이트맵이면 제목도 함께 있음
+            news = _child(url, "news")
+            entries.append({'url': _text(url, "loc"), 'title': _text(news, "title"),
+                            'ts': _parse_time(_text(url, "lastmod") or _text(news, "publication_date"))})
+    elif kind == "sitemapindex":
+        for sitemap in root:
+            children.append({'url': _text(sitemap, "loc"), 'ts': _parse_time(_text(sitemap, "lastmod"))})
+    else:
+        raise ValueError(f"피드/사이트맵 형식이 아닙니다: {kind}")
+    return [e for e in entries if e['url']], [c for c in children if c['url']]
+
+
+class _HeadReader(HTMLParser):
+    """<head>에서 제목(og:title/<title>)과 피드 링크만 읽고 </head>에서 멈춤."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = self.og_title = ""
+        self.feeds = []
+        self.in_title = False
+        self.done = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "title": self.in_title = True
+        elif tag == "meta" and attrs.get("property") == "og:title": self.og_title = attrs.get("content") or ""
+        elif tag == "link" and "alternate" in (attrs.get("rel") or "") and attrs.get("type") in FEED_TYPES and attrs.get("href"):
+            self.feeds.append(attrs["href"])
+        elif tag == "body": self.done = True
+
+    def handle_endtag(self, tag):
+        if tag == "title": self.in_title = False
+        elif tag == "head": self.done = True
+
+    def handle_data(self, data):
+        if self.in_title: self.title += data
+
+
+def _read_head(session, url):
+    reader = _HeadReader()
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    resp = session.get(url, stream=True)
+    try:
+        resp.raise_for_status()
+        for chunk in resp.iter_content(chunk_size=16 * 1024):
+            reader.feed(decoder.decode(chunk))
+            if reader.done: break
+    finally:
+        resp.close()
+    return reader
+
+
+def _get_xml(session, url):
+    resp = session.get(url)
+    resp.raise_for_status()
+    return resp.content[:MAX_FEED_BYTES]
+
+
+# robots.txt의 Sitemap: 줄 + 홈 <head>의 피드 링크
+def find_feeds(session, home):
+    found = []
+    try:
+        resp = session.get(urljoin(home, "/robots.txt"))
+        if resp.status_code == 200:
+            found += re.findall(r"(?im)^\s*sitemap:\s*(\S+)", resp.text)
+    except Exception as e:
+        print(f"⚠️ robots.txt 확인 실패: {e}")
+    try:
+        found += [urljoin(home, href) for href in _read_head(session, home).feeds]
+    except Exception as e:
+        print(f"⚠️ 홈 피드 링크 확인 실패: {e}")
+    return list(dict.fromkeys(found))
+
+
+class Discovery:
+    def __init__(self, source, entries, state, watermark, at_watermark):
+        self.source = source
+        self.entries = entries
+        self.state = state
+        self.watermark = watermark
+        self.at_watermark = at_watermark
+
+    # 시트 저장이 끝난 뒤에 기준 시각을 옮김 (저장 실패 시 다음 실행이 같은 항목을 다시 읽음)
+    def commit(self):
+        if self.at_watermark or self.watermark != self.state.get('watermark'):
+            self.state['last_urls'] = self.at_watermark
+        self.state['watermark'] = self.watermark
+        _save_state(self.source, self.state)
+
+
+def _collect(session, feed_url, since):
+    entries, children = parse_feed(_get_xml(session, feed_url))
+    # 사이트맵 인덱스는 기준 시각 이후 갱신된 하위 사이트맵만 (최신순 MAX_SITEMAPS개)
+    children = [c for c in children if c['ts'] is None or c['ts'] > since]
+    children.sort(key=lambda c: c['ts'] or 0, reverse=True)
+    for child in children[:MAX_SITEMAPS]:
+        entries += parse_feed(_get_xml(session, child['url']))[0]
+    return entries
+
+
+# 새 항목 목록을 담은 Discovery를 돌려줌 (피드를 쓸 수 없으면 None → DOM 수집)
+# seen: 시트에 이미 있는 url_key 집합을 돌려주는 함수 (피드를 읽은 뒤 필요할 때만 호출)
+def discover(source, config, seen=None):
+    settings = config.get("discovery") or {}
+    if not (settings.get("feeds") or settings.get("match")): return None
+    if os.environ.get(DISCOVERY_ENV, "feed") == "dom": return None
+
+    session = open_resource('http', get_session)
+    state = _load_state(source)
+    home = config["urls"][0]
+    since = state.get('watermark') or time.time() - FIRST_LOOKBACK_DAYS * 86400
+    match = re.compile(settings.get("match") or re.escape(urlsplit(home).netloc))
+
+    entries, working = [], []
+    known = list(dict.fromkeys(settings.get("feeds", []) + state.get('feeds', [])))
+    # 알고 있는 피드가 없거나 모두 실패하면 robots.txt/홈에서 다시 찾음
+    for candidates in (known, None):
+        for feed_url in candidates if candidates is not None else find_feeds(session, home):
+            try:
+                entries += _collect(session, feed_url, since)
+                working.append(feed_url)
+            except Exception as e:
+                print(f"⚠️ 피드 읽기 실패 ({feed_url}): {e}")
+        if working: break
+    if not working:
+        print(f"ℹ️ [{source}] 사용할 수 있는 피드/사이트맵이 없어 화면 수집으로 진행합니다.")
+        return None
+    state['feeds'] = working
+
+    # 글 주소만 (홈/다른 사이트/match 밖의 페이지 제외)
+    entries = [e for e in entries if match.search(e['url']) and urlsplit(e['url']).path.strip('/')]
+    if not any(e['ts'] is not None for e in entries):
+        print(f"ℹ️ [{source}] 피드 항목에 날짜가 없어 새 글을 가릴 수 없으므로 화면 수집으로 진행합니다.")
+        return None
+    # 이미 시트에 있는 주소는 제목 요청 전에 제외
+    existing = seen() if seen else set()
+
+    fresh, picked, last_urls = [], set(), set(state.get('last_urls', []))
+    for entry in entries:
+        key = url_key(entry['url'], source)
+        if key in picked or key in existing: continue
+        picked.add(key)
+        # 날짜만 있는 lastmod도 놓치지 않도록 기준 시각과 같은 항목은 포함 (지난번 기준 시각의 항목만 제외)
+        if entry['ts'] is not None and (entry['ts'] < since or entry['ts'] == since and entry['url'] in last_urls): continue
+        fresh.append(entry)
+    # 한 번에 최신 MAX_ENTRIES건까지만 (첫 실행이나 오래 쉬었을 때 과도한 제목 요청 방지)
+    fresh.sort(key=lambda e: e['ts'] or 0, reverse=True)
+    fresh = fresh[:MAX_ENTRIES]
+
+    today = datetime.now().strftime("%Y-%m-%d")
+    rows = []
+    for entry in fresh:
+        title = entry['title']
+        if not title:
+            # 사이트맵에는 제목이 없으므로 새 항목만 <head>를 읽어 제목을 채움
+            try:
+                head = _read_head(session, entry['url'])
+                title = (head.og_title or head.title).strip()
+            except Exception as e:
+                print(f"⚠️ 제목 확인 실패 ({entry['url']}): {e}")
+        if title:
+            rows.append({'title': title, 'url': entry['url'], 'scraped_at': today})
+
+    watermark = max([since] + [e['ts'] for e in fresh if e['ts'] is not None])
+    at_watermark = [e['url'] for e in fresh if e['ts'] == watermark]
+    print(f"🗺️ [{source}] 피드 {len(working)}개에서 기준 시각 이후 새 항목 {len(rows)}건")
+    return Discovery(source, rows, state, watermark, at_watermark)
@@ -0,0 +1,183 @@
+import os
+import re
+import json
+import hashlib
+import unicodedata
+from datetime import datetime
+from gspread.utils import rowcol_to_a1
+from sheets import get_or_create_tab, get_headers
+from url_utils import url_key
+from local_state import state_path
+from cassette import active as cassette_active
+
+# ==========================================
+# [공통] 소스 간 유사 중복 탐지 (SimHash 지문 인덱스)
+# ==========================================
+# 같은 사이드 프로젝트가 렛플과 사이드프로젝트에, 같은 아티클이 Mix와 서핏에
+# 서로 다른 URL로 올라오는 경우를 잡기 위해, 제목+본문을 정규화해 64비트 SimHash를
+# 만들고 'fingerprints' 탭에 모든 센더가 함께 기록/조회합니다.
+# 이미 처리된 항목과 해밍 거리가 가까우면 판정을 재사용하고 슬랙 중복 전송을 막습니다.
+#
+# 같은 탭에 정규화한 본문의 해시(content_hash)와 요약 결과(summary)도 함께 남겨,
+# URL만 바뀌어 다시 올라온 동일 본문은 판정과 요약을 그대로 물려받습니다.
+#
+# 프롬프트와 요약 키가 소스마다 다르므로, 재사용은 같은 소스이거나 같은 요약 형식
+# (센더 CONFIG의 summary_schema: project/article/job)끼리만 합니다.
+# 최종 판정이 난 항목(published/dropped/duplicate)만 기록하고, failed 행은 남기지 않습니다.
+#
+# 탭은 추가만 되므로 읽은 행을 .flintstoning/fingerprints.json 에 두고, 다음 실행은
+# 마지막으로 읽은 행부터만 batch_get 합니다 (그 행이 달라졌으면 전체를 다시 읽음).
+# 카세트 녹화/재생 중에는 호출 순서가 실행마다 같도록 항상 전체를 읽습니다.
+
+FINGERPRINT_TAB = "fingerprints"
+# 새 컬럼은 기존 행과 어긋나지 않도록 항상 뒤에 추가합니다.
+FINGERPRINT_HEADERS = ['source', 'url', 'title', 'simhash', 'identity_match', 'status', 'created_at', 'content_hash', 'summary',
+                       'summary_schema']
+REUSABLE_STATUSES = ('published', 'dropped', 'duplicate')
+CACHE_FILE = "fingerprints.json"
+
+HASH_BITS = 64
+MAX_DISTANCE = 3      # 이 거리 이하이면 같은 글로 판단
+BANDS = 4             # 64비트를 16비트씩 4구간으로 나눠 후보를 찾음 (거리 3 이하는 최소 한 구간이 일치)
+SHINGLE_SIZE = 3
+
+
+def normalize(text):
+    text = unicodedata.normalize("NFKC", text or "").lower()
+    text = re.sub(r"https?://\S+", " ", text)
+    return re.sub(r"[\W_]+", "", text)
+
+
+def _hash64(token):
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(text):
+    norm = normalize(text)
+    if len(norm) < SHINGLE_SIZE: return None
+
+    weights = [0] * HASH_BITS
+    for shingle in {norm[i:i + SHINGLE_SIZE] for i in range(len(norm) - SHINGLE_SIZE + 1)}:
+        h = _hash64(shingle)
+        for bit in range(HASH_BITS):
+            weights[bit] += 1 if h >> bit & 1 else -1
+
+    return sum(1 << bit for bit in range(HASH_BITS) if weights[bit] > 0)
+
+
+def content_hash(text):
+    norm = normalize(text)
+    if not norm: return None
+    return hashlib.sha256(norm.encode("utf-8")).hexdigest()[:32]
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+def _bands(value):
+    width = HASH_BITS // BANDS
+    return [(i, value >> (i * width) & ((1 << width) - 1)) for i in range(BANDS)]
+
+
+def _pad(row):
+    return list(row) + [''] * (len(FINGERPRINT_HEADERS) - len(row))
+
+
+def _load_cache():
+    path = state_path(CACHE_FILE)
+    if not os.path.exists(path): return []
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+
+def _save_cache(rows):
+    with open(state_path(CACHE_FILE), "w", encoding="utf-8") as f:
+        json.dump(rows, f, ensure_ascii=False)
+
+
+# 2행부터 읽은 원본 행 목록. 캐시가 있으면 캐시의 마지막 행부터만 읽어 이어 붙임
+def _read_rows(ws):
+    last_col = re.sub(r'\d+', '', rowcol_to_a1(1, len(FINGERPRINT_HEADERS)))
+    cached = [] if cassette_active() else _load_cache()
+    if cached:
+        # 캐시의 마지막 행 = 시트의 len(cached) + 1 행
+        values = ws.batch_get([f"A{len(cached) + 1}:{last_col}"])[0]
+        if values and _pad(values[0]) == _pad(cached[-1]):
+            return cached + [_pad(row) for row in values[1:]]
+        print("  ↺ 지문 탭이 바뀌어 전체를 다시 읽습니다.")
+    return [_pad(row) for row in ws.batch_get([f"A2:{last_col}"])[0]]
+
+
+class FingerprintIndex:
+    def __init__(self, ws, records, source=None, schema=None):
+        self.ws = ws
+        self.source = source
+        self.schema = schema
+        self.records = []
+        self.buckets = {}
+        self.by_content = {}
+        for record in records:
+            self._index(record)
+
+    # source/schema: 이 센더의 소스와 요약 형식 (재사용할 수 있는 기록을 고르는 기준)
+    @classmethod
+    def load(cls, spreadsheet, source=None, schema=None):
+        ws = get_or_create_tab(spreadsheet, FINGERPRINT_TAB, FINGERPRINT_HEADERS)
+        if get_headers(ws) != FINGERPRINT_HEADERS:
+            ws.update(values=[FINGERPRINT_HEADERS], range_name='A1')
+        rows = _read_rows(ws)
+        if not cassette_active(): _save_cache(rows)
+        return cls(ws, [dict(zip(FINGERPRINT_HEADERS, row)) for row in rows], source, schema)
+
+    def _index(self, record):
+        # 판정이 없는 기록(예전 failed 행 등)은 '부적합'으로 읽히지 않도록 색인하지 않음
+        if record.get('status') not in REUSABLE_STATUSES or not record.get('identity_match'): return
+        if not self._compatible(record): return
+        if record.get('content_hash'):
+            self.by_content[record['content_hash']] = record
+        try:
+            record['_simhash'] = int(record['simhash'], 16)
+        except (KeyError, ValueError):
+            return
+        self.records.append(record)
+        for band in _bands(record['_simhash']):
+            self.buckets.setdefault(band, []).append(record)
+
+    # 같은 소스이거나 같은 요약 형식의 기록만 재사용
+    def _compatible(self, record):
+        if self.source is None: return True
+        return record.get('source') == self.source or bool(self.schema) and record.get('summary_schema') == self.schema
+
+    def find_exact(self, digest):
+        return self.by_content.get(digest) if digest else None
+
+    def find_near_duplicate(self, value, exclude_url=None):
+        if value is None: return None
+        best, best_distance = None, MAX_DISTANCE + 1
+        exclude_key = url_key(exclude_url) if exclude_url else None
+        for band in _bands(value):
+            for record in self.buckets.get(band, []):
+                if exclude_key and url_key(record['url']) == exclude_key: continue
+                distance = hamming(value, record['_simhash'])
+                if distance < best_distance:
+                    best, best_distance = record, distance
+        return best
+
+    def add(self, source, url, title, value, identity_match, status, digest=None, summary=None):
+        if value is None and digest is None: return
+        if status not in REUSABLE_STATUSES or not identity_match: return
+        record = {
+            'source': source, 'url': url, 'title': title,
+            'simhash': f"{value:016x}" if value is not None else '',
+            'identity_match': identity_match, 'status': status,
+            'created_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'content_hash': digest or '',
+            'summary': json.dumps(summary, ensure_ascii=False) if summary else '',
+            'summary_schema': self.schema or '',
+        }
+        self.ws.append_row([record[h] for h in FINGERPRINT_HEADERS])
+        self._index(record)
@@ -0,0 +1,209 @@
+import sys
+import time
+import argparse
+import importlib
+import subprocess
+
+# ==========================================
+# [공통] 플린트스토닝 통합 실행기
+# ==========================================
+# 사용법:
+#   python flintstoning.py scrape <source>     # 크롤러 실행
+#   python flintstoning.py send <source>       # 센더 실행 (--lease: 여러 러너가 나눠 처리)
+#   python flintstoning.py scrape <source> --chain  # 크롤링 직후 새로 추가된 행만 바로 전송
+#   python flintstoning.py run-all             # 전체 크롤러 → 전체 센더 순서로 실행
+#   python flintstoning.py rollover            # 오래된 처리 완료 행을 아카이브로 이동
+#   python flintstoning.py dedupe-urls         # 정규화 기준 중복 행 보고 (--apply: 정리)
+#   python flintstoning.py sync                # 소스 탭을 로컬 미러로 증분 동기화
+#   python flintstoning.py query <name>        # 미러 대상 분석 쿼리 실행
+#   python flintstoning.py bench-startup       # 명령별 콜드 스타트 시간 검사
+#
+# scrape/send 앞에 FLINTSTONING_CASSETTE=record 또는 replay:<name>을 붙이면 외부 I/O를
+# 녹화하거나 녹화본으로 오프라인 재생합니다 (cassette.py 참고).
+# FLINTSTONING_PROFILE=wall 또는 cpu를 붙이면 실행을 프로파일링해 플레임그래프를 남깁니다.
+# FLINTSTONING_DRIVER=cdp를 붙이면 크롤러가 chromedriver 없이 DevTools로 Chrome을 직접 조작합니다 (cdp_driver.py).
+#
+# 무거운 라이브러리(selenium, openai, bs4 등)는 여기서 import하지 않고,
+# 명령에 필요한 모듈만 실행 시점에 불러옵니다.
+
+SOURCES = ["letspl", "mix", "surfit", "side", "offercent"]
+
+COMMAND_MODULES = {
+    "scrape": "{source}_scraper",
+    "send": "{source}_sender",
+}
+
+# 명령별 콜드 스타트 허용 시간(초): 인터프리터 기동 + 명령 모듈 import까지
+STARTUP_BUDGET = {
+    "scrape": 1.5,
+    "send": 1.5,
+}
+
+# 명령별로 불러오면 안 되는 모듈 (지연 import가 깨졌는지 확인)
+FORBIDDEN_IMPORTS = {
+    "scrape": ["openai", "bs4", "pandas"],
+    "send": ["selenium", "pandas"],
+}
+
+
+def load_entry(command, source):
+    from profiler import profiled
+    module = importlib.import_module(COMMAND_MODULES[command].format(source=source))
+    # FLINTSTONING_PROFILE=wall|cpu 이면 샘플링 프로파일러로 감쌈 (profiler.py 참고)
+    return profiled(f"{source}-{command}", module.main)
+
+
+def cmd_scrape(args):
+    load_entry("scrape", args.source)()
+    if args.chain:
+        # 방금 추가된 행만 큐에서 꺼내 바로 전송 (발견 → 슬랙 게시까지 몇 분 이내)
+        load_entry("send", args.source)(queue=True)
+
+
+def cmd_send(args):
+    options = {'queue': args.queue} if args.queue else {}
+    if args.deadline:
+        options['deadline'] = time.time() + args.deadline
+    if args.lease:
+        # 여러 러너가 같은 탭을 나눠 처리하는 임대 모드 (지정하지 않은 값은 lease.py 기본값)
+        lease = {'worker': args.worker_id, 'lease_sec': args.lease_sec, 'batch': args.batch}
+        options['lease'] = {k: v for k, v in lease.items() if v is not None}
+    load_entry("send", args.source)(**options)
+
+
+def cmd_run_all(args):
+    deadline = time.time() + args.deadline if args.deadline else None
+    for command in ("scrape", "send"):
+        sources, options = args.sources, {}
+        if command == "send":
+            # 적합 판정 비율이 높은 소스부터 전송하고, 전체 실행 시간 예산을 함께 씀
+            from sender_engine import acceptance_rate
+            sources = sorted(sources, key=acceptance_rate, reverse=True)
+            if deadline: options['deadline'] = deadline
+        for source in sources:
+            print(f"\n▶ {command} {source}")
+            try:
+                load_entry(command, source)(**options)
+            except Exception as e:
+                print(f"🚨 {command} {source} 실행 실패: {e}")
+
+
+def cmd_rollover(args):
+    import rollover
+    rollover.main(args.sources, args.days, args.target, args.dry_run)
+
+
+def cmd_dedupe_urls(args):
+    import dedupe_urls
+    dedupe_urls.main(args.sources, args.apply)
+
+
+def cmd_sync(args):
+    import mirror
+    mirror.sync(args.sources)
+
+
+def cmd_query(args):
+    import mirror
+    if not args.name:
+        for name, (description, _) in mirror.QUERIES.items():
+            print(f"{name:<20} {description}")
+        return
+    mirror.run_query(args.name)
+
+
+def check_import_only(command, source):
+    load_entry(command, source)
+    loaded = [m for m in FORBIDDEN_IMPORTS[command] if m in sys.modules]
+    if loaded:
+        print(f"❌ {command} {source}: 불필요한 모듈 로드 {loaded}")
+        sys.exit(2)
+
+
+def measure_startup(command, source):
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, __file__, "--import-only", command, source])
+    return time.perf_counter() - start, result.returncode
+
+
+def cmd_bench_startup(args):
+    failed = []
+    for command in ("scrape", "send"):
+        budget = args.budget or STARTUP_BUDGET[command]
+        for source in args.sources:
+            runs = [measure_startup(command, source) for _ in range(args.repeat)]
+            elapsed = min(t for t, _ in runs)
+            ok = elapsed <= budget and all(code == 0 for _, code in runs)
+            if not ok: failed.append(f"{command} {source}")
+            print(f"{'✅' if ok else '❌'} {command} {source}: {elapsed:.2f}s (예산 {budget:.2f}s)")
+
+    if failed:
+        print(f"🚨 콜드 스타트 예산 초과: {', '.join(failed)}")
+        sys.exit(1)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="flintstoning")
+    parser.add_argument("--import-only", action="store_true", help=argparse.SUPPRESS)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("scrape", help="소스 크롤러 실행")
+    p.add_argument("source", choices=SOURCES)
+    p.add_argument("--chain", action="store_true", help="크롤링 후 새로 추가된 행을 바로 센더로 처리")
+    p.set_defaults(func=cmd_scrape)
+
+    p = sub.add_parser("send", help="소스 센더 실행")
+    p.add_argument("source", choices=SOURCES)
+    p.add_argument("--deadline", type=float, default=None, help="시간 예산(초): 넘길 것 같으면 새 항목을 시작하지 않음")
+    p.add_argument("--queue", action="store_true", help="크롤러가 방금 추가한 행(.flintstoning/queue)만 처리")
+    p.add_argument("--lease", action="store_true", help="행을 선점하며 처리 (여러 러너 동시 실행용)")
+    p.add_argument("--worker-id", default=None, help="워커 이름 (기본: SENDER_WORKER_ID 또는 호스트명-pid)")
+    p.add_argument("--lease-sec", type=int, default=None, help="선점 유지 시간(초)")
+    p.add_argument("--batch", type=int, default=None, help="한 번에 선점할 행 수")
+    p.set_defaults(func=cmd_send)
+
+    p = sub.add_parser("run-all", help="전체 크롤러 → 전체 센더 실행")
+    p.add_argument("--sources", nargs="+", choices=SOURCES, default=SOURCES)
+    p.add_argument("--deadline", type=float, default=None, help="전체 실행 시간 예산(초)")
+    p.set_defaults(func=cmd_run_all)
+
+    p = sub.add_parser("rollover", help="오래된 published/dropped 행을 월별 아카이브로 이동")
+    p.add_argument("--sources", nargs="+", choices=SOURCES, default=SOURCES)
+    p.add_argument("--days", type=int, default=30, help="scraped_at 기준 보존 기간(일)")
+    p.add_argument("--target", choices=["sheet", "parquet"], default="sheet")
+    p.add_argument("--dry-run", action="store_true")
+    p.set_defaults(func=cmd_rollover)
+
+    p = sub.add_parser("dedupe-urls", help="정규화 기준으로 중복된 기존 행 정리 (기본은 보고만)")
+    p.add_argument("--sources", nargs="+", choices=SOURCES, default=SOURCES)
+    p.add_argument("--apply", action="store_true", help="실제로 중복 행을 삭제하고 URL을 정규화")
+    p.set_defaults(func=cmd_dedupe_urls)
+
+    p = sub.add_parser("sync", help="소스 탭을 로컬 미러(.flintstoning/mirror)로 증분 동기화")
+    p.add_argument("--sources", nargs="+", choices=SOURCES, default=SOURCES)
+    p.set_defaults(func=cmd_sync)
+
+    p = sub.add_parser("query", help="미러 대상 분석 쿼리 실행 (이름 생략 시 목록 출력)")
+    p.add_argument("name", nargs="?")
+    p.set_defaults(func=cmd_query)
+
+    p = sub.add_parser("bench-startup", help="명령별 콜드 스타트 시간 검사")
+    p.add_argument("--sources", nargs="+", choices=SOURCES, default=SOURCES)
+    p.add_argument("--budget", type=float, default=None, help="모든 명령에 적용할 허용 시간(초)")
+    p.add_argument("--repeat", type=int, default=3)
+    p.set_defaults(func=cmd_bench_startup)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if args.import_only and args.command in COMMAND_MODULES:
+        return check_import_only(args.command, args.source)
+
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
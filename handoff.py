@@ -0,0 +1,58 @@
+import os
+import re
+import json
+from datetime import datetime
+from local_state import state_path
+
+# ==========================================
+# [공통] 크롤러 → 센더 새 행 전달 큐
+# ==========================================
+# 크롤러가 시트에 행을 추가하면 append 응답의 updatedRange(예: '렛플'!A120:E124)로
+# 정확히 어떤 행이 추가됐는지 알 수 있으므로, 이를 .flintstoning/queue/<source>.jsonl 에 남깁니다.
+# 센더를 queue 모드로 실행하면 탭 전체를 훑지 않고 이 행들만 읽어 바로 처리합니다.
+#
+# 큐를 꺼낸 뒤 처리 도중 실패한 행은 'archived' 상태로 남아 있으므로
+# 정기 센더 실행이 그대로 이어서 처리합니다.
+
+RANGE_PATTERN = re.compile(r"([A-Z]+)(\d+)(?::([A-Z]+)(\d+))?$")
+
+
+def queue_path(source):
+    return state_path("queue", f"{source}.jsonl")
+
+
+def parse_updated_range(updated_range):
+    match = RANGE_PATTERN.search(updated_range or "")
+    if not match: return None
+    start = int(match.group(2))
+    return start, int(match.group(4) or start)
+
+
+def emit(source, append_response, urls):
+    updates = (append_response or {}).get('updates', {})
+    rows = parse_updated_range(updates.get('updatedRange'))
+    if not rows: return None
+
+    entry = {'rows': list(rows), 'urls': list(urls), 'appended_at': datetime.now().isoformat(timespec="seconds")}
+    with open(queue_path(source), "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    return rows
+
+
+# 쌓인 항목을 모두 꺼내고 큐를 비움 → {행 번호: url}
+def drain(source):
+    path = queue_path(source)
+    if not os.path.exists(path): return {}
+
+    # 다른 크롤러가 이어 쓰는 중이어도 섞이지 않도록 먼저 이름을 바꿔서 읽음
+    taken = f"{path}.{os.getpid()}"
+    os.replace(path, taken)
+    pending = {}
+    with open(taken, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip(): continue
+            entry = json.loads(line)
+            start, end = entry['rows']
+            pending.update(zip(range(start, end + 1), entry['urls']))
+    os.remove(taken)
+    return pending
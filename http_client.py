@@ -0,0 +1,133 @@
+import time
+import socket
+import threading
+from collections import OrderedDict
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError, ConnectTimeoutError
+from urllib3.util.connection import allowed_gai_family
+
+# ==========================================
+# [공통] 공유 HTTP 클라이언트
+# ==========================================
+# 센더의 페이지 수집과 슬랙 웹훅 전송이 모두 하나의 Session을 함께 씁니다.
+#   - 호스트별 커넥션 풀 + keep-alive: 같은 호스트로 가는 요청은 TLS 연결을 재사용
+#   - gzip/deflate (brotli 패키지가 있으면 br 포함) 압축 응답
+#   - DNS 조회 결과 캐시 (DNS_TTL초, 이 Session의 연결에만 적용)
+#   - 기본 연결/읽기 타임아웃, 일시 오류(429/5xx, 연결 실패) 재시도
+# POST는 연결 자체가 실패한 경우만 재시도하므로 슬랙 메시지가 두 번 올라가지 않습니다.
+
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 20
+POOL_SIZE = 10
+DNS_TTL = 300
+DNS_CACHE_SIZE = 256
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
+}
+
+try:
+    import brotli  # noqa: F401  (requests/urllib3가 br 응답을 풀 수 있을 때만 요청)
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
+
+# ---------- DNS 캐시 ----------
+# 공유 Session의 커넥션 풀에서만 쓰입니다 (socket.getaddrinfo를 바꾸지 않으므로 gspread, OpenAI 클라이언트,
+# Chrome 등 다른 코드의 이름 조회에는 영향이 없음). 새 연결을 열 때 캐시한 주소로 차례로 접속하고,
+# TLS 인증서 확인/SNI는 원래 호스트 이름으로 합니다. 캐시는 DNS_CACHE_SIZE개까지, 오래된 것부터 지웁니다.
+_dns_cache = OrderedDict()
+_dns_lock = threading.Lock()
+
+
+def _resolve(host, port):
+    key = (host, port)
+    now = time.time()
+    with _dns_lock:
+        hit = _dns_cache.get(key)
+        if hit and hit[0] > now:
+            return hit[1]
+    infos = socket.getaddrinfo(host, port, allowed_gai_family(), socket.SOCK_STREAM)
+    addresses = list(dict.fromkeys(info[4][0] for info in infos))
+    with _dns_lock:
+        _dns_cache[key] = (now + DNS_TTL, addresses)
+        _dns_cache.move_to_end(key)
+        while len(_dns_cache) > DNS_CACHE_SIZE:
+            _dns_cache.popitem(last=False)
+    return addresses
+
+
+class _CachedDNSConnection:
+    def _new_conn(self):
+        host = self._dns_host
+        try:
+            addresses = _resolve(host, self.port)
+        except OSError:
+            # 조회 실패는 urllib3의 원래 오류(NameResolutionError 등)로 보고되도록 그대로 맡김
+            return super()._new_conn()
+        error = None
+        for address in addresses:
+            self._dns_host = address
+            try:
+                return super()._new_conn()
+            except (NewConnectionError, ConnectTimeoutError) as e:
+                error = e
+            finally:
+                self._dns_host = host
+        raise error
+
+
+class _HTTPConnection(_CachedDNSConnection, HTTPConnection): pass
+class _HTTPSConnection(_CachedDNSConnection, HTTPSConnection): pass
+class _HTTPPool(HTTPConnectionPool): ConnectionCls = _HTTPConnection
+class _HTTPSPool(HTTPSConnectionPool): ConnectionCls = _HTTPSConnection
+
+
+class _Adapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {'http': _HTTPPool, 'https': _HTTPSPool}
+
+
+class _Session(requests.Session):
+    # 타임아웃을 지정하지 않은 요청에도 기본 타임아웃을 적용
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', (CONNECT_TIMEOUT, READ_TIMEOUT))
+        return super().request(method, url, **kwargs)
+
+
+def _build_session():
+    retry = Retry(
+        total=3, connect=3, read=2, status=3,
+        backoff_factor=1,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = _Adapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+
+    session = _Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+    return session
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = _build_session()
+        return _session
@@ -0,0 +1,128 @@
+import os
+import time
+import random
+import socket
+from cassette import pause
+from gspread.utils import rowcol_to_a1
+
+# ==========================================
+# [공통] 여러 러너가 나눠 처리하기 위한 작업 임대(lease)
+# ==========================================
+# status 컬럼에 'processing:<worker>:<만료 epoch>'를 써서 행을 선점합니다.
+#   1. status 컬럼만 읽어 'archived' 또는 만료된 processing 행을 후보로 고름
+#   2. 후보 중 일부에 내 선점 값을 한 번의 batch_update로 기록
+#   3. 잠시 기다린 뒤 다시 읽어 내 값이 남아 있는 행만 내 것으로 확정
+#      (동시에 쓴 경우 마지막에 쓴 워커만 자기 값을 보게 되므로 이중 처리를 막음)
+# 처리 중에는 만료 전에 임대를 갱신하고, 처리가 끝나면 최종 status가 선점 값을 덮어씁니다.
+# 워커가 죽으면 만료 시간이 지난 행을 다른 워커가 다시 가져갑니다.
+#
+# 한계: 3번 확인은 원자적이지 않습니다. 다른 워커의 읽기→쓰기 간격이 SETTLE_SEC보다 길면
+# 이미 확인을 마친 선점 값을 덮어쓸 수 있으므로, 슬랙 전송과 최종 status 기록 직전에
+# verify()로 내 선점 값이 그대로인지 다시 확인하고 아니면 LeaseLost로 처리를 멈춥니다.
+#
+# 한 워커는 한 번 가져간 행을 다시 선점하지 않습니다 (오류로 'archived'로 되돌린 행을
+# 같은 실행에서 계속 다시 가져가 무한 반복하지 않도록). 그런 행은 다른 워커나 다음 실행이 처리합니다.
+
+LEASE_PREFIX = "processing"
+DEFAULT_LEASE_SEC = 600
+DEFAULT_BATCH = 5
+SETTLE_SEC = 3   # 선점 기록 후 재확인까지 대기 (다른 워커의 읽기→쓰기 간격보다 길어야 함)
+
+
+class LeaseLost(Exception):
+    """처리 도중 다른 워커가 같은 행을 선점함 (이 워커는 해당 행을 더 건드리지 않음)."""
+
+
+def default_worker_id():
+    return os.environ.get("SENDER_WORKER_ID") or f"{socket.gethostname()}-{os.getpid()}"
+
+
+def make_claim(worker, expiry):
+    return f"{LEASE_PREFIX}:{worker}:{int(expiry)}"
+
+
+def parse_claim(value):
+    parts = value.strip().split(":")
+    if len(parts) < 3 or parts[0] != LEASE_PREFIX: return None
+    try:
+        return ":".join(parts[1:-1]), int(parts[-1])
+    except ValueError:
+        return None
+
+
+# 'archived' 이거나 임대가 만료된 행이면 처리 대상
+def is_claimable(value, now=None):
+    value = value.strip().lower()
+    if value == 'archived': return True
+    claim = parse_claim(value)
+    return bool(claim) and claim[1] < (now or time.time())
+
+
+class LeaseManager:
+    def __init__(self, sheet, status_col_idx, worker=None, lease_sec=DEFAULT_LEASE_SEC, batch=DEFAULT_BATCH):
+        self.sheet = sheet
+        self.status_col_idx = status_col_idx
+        self.worker = worker or default_worker_id()
+        self.lease_sec = lease_sec
+        self.batch = batch
+        self.held = {}   # 행 번호 -> 기록한 선점 값
+        self.attempted = set()   # 이번 실행에서 이미 선점했던 행 번호
+
+    def _cell(self, row_number):
+        return rowcol_to_a1(row_number, self.status_col_idx)
+
+    def _write(self, values):
+        self.sheet.batch_update([{'range': self._cell(r), 'values': [[v]]} for r, v in values.items()])
+
+    def claim_batch(self):
+        now = time.time()
+        status_values = self.sheet.col_values(self.status_col_idx)
+        candidates = [i + 1 for i, v in enumerate(status_values)
+                      if i > 0 and i + 1 not in self.attempted and is_claimable(v, now)]
+        if not candidates: return []
+
+        # 워커끼리 같은 행을 노리지 않도록 후보를 섞어서 선택
+        random.shuffle(candidates)
+        claim = make_claim(self.worker, now + self.lease_sec)
+        wanted = {r: claim for r in sorted(candidates[:self.batch])}
+        self._write(wanted)
+
+        pause(SETTLE_SEC)
+        current = self.sheet.batch_get([self._cell(r) for r in wanted])
+        owned = [r for r, values in zip(wanted, current) if values and values[0] and values[0][0] == claim]
+        self.held.update({r: claim for r in owned})
+        self.attempted.update(owned)
+        print(f"🔒 [{self.worker}] {len(owned)}/{len(wanted)}건 선점")
+        return owned
+
+    # 남은 임대 시간이 절반 아래로 떨어지면 보유 중인 행 전체를 갱신
+    def renew_if_needed(self):
+        if not self.held: return
+        expiry = min(parse_claim(v)[1] for v in self.held.values())
+        if expiry - time.time() > self.lease_sec / 2: return
+        claim = make_claim(self.worker, time.time() + self.lease_sec)
+        self.held = {r: claim for r in self.held}
+        self._write(self.held)
+
+    # 내 선점 값이 그대로인지 다시 읽어 확인 (다른 워커가 덮어썼으면 LeaseLost)
+    def verify(self, row_number):
+        claim = self.held.get(row_number)
+        if claim is None: return
+        current = self.sheet.batch_get([self._cell(row_number)])[0]
+        if current and current[0] and current[0][0] == claim: return
+        self.held.pop(row_number, None)
+        raise LeaseLost(f"{row_number}행을 다른 워커가 선점했습니다.")
+
+    # 처리가 끝난 행은 보유 목록에서 제외 (최종 status가 이미 선점 값을 덮어씀)
+    def done(self, row_number):
+        self.held.pop(row_number, None)
+
+    # 처리하지 못한 행은 다른 워커가 바로 가져갈 수 있도록 'archived'로 되돌림
+    def release(self, row_number):
+        if self.held.pop(row_number, None):
+            self._write({row_number: 'archived'})
+
+    def release_all(self):
+        if not self.held: return
+        self._write({r: 'archived' for r in self.held})
+        self.held = {}
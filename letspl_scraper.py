@@ -1,17 +1,27 @@
-import os, time, json, re
+import os, json, re
 import gspread
 from datetime import datetime
 from oauth2client.service_account import ServiceAccountCredentials
-from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from sheets import append_new_rows
+from browser import create_driver, fan_out, paged
+from cassette import open_resource, pause, start as start_cassette
 
 # [설정]
 CONFIG = {
     "name": "렛플(Letspl)",
-    "url": "https://letspl.me/project?location=KR00&type=00&recruitingType=all&jobD=0207",
+    "source": "letspl",
+    # 필터별 목록 주소 (병렬로 수집 후 합침). 콘텐츠 기획(jobD=0207) 외 직무는 센더 판정 대상이 아님
+    "urls": [
+        "https://letspl.me/project?location=KR00&type=00&recruitingType=all&jobD=0207",
+    ],
+    # 목록 주소마다 1~pages 페이지를 차례로 수집 (page_param으로 페이지 번호 전달, 사이트가
+    # 파라미터를 무시해 같은 목록이 나오면 2페이지에서 멈춤 - browser.fan_out)
+    "pages": 3,
+    "page_param": "page",
     "gid": "1669656972"
 }
 
@@ -27,29 +37,28 @@ def get_worksheet():
     return sheet
 
 # [공통] 브라우저 실행
-def get_driver():
+def get_driver(slot=0):
     options = Options()
     options.add_argument("--headless")
     options.add_argument("--disable-blink-features=AutomationControlled")
-    driver = webdriver.Chrome(options=options)
-    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"})
-    return driver
+    return create_driver(options, CONFIG["source"], slot=slot)
 
 # [전용] 데이터 수집 (누락 방지 이전 버전 - 안정화 및 오타 수정)
-def scrape_projects():
-    driver = get_driver()
+# 목록 주소 하나를 수집 (slot: 병렬 수집 시 드라이버 프로필 번호)
+def scrape_listing(url, slot=0):
+    driver = get_driver(slot)
     new_data = []
     today = datetime.now().strftime("%Y-%m-%d")
     REGIONS = ["서울", "경기", "인천", "대전", "대구", "부산", "광주", "울산", "세종", "강원", "충북", "충남", "전북", "전남", "경북", "경남", "제주", "온라인", "지역무관"]
 
     try:
         print(f"🌐 {CONFIG['name']} 접속 중...")
-        driver.get(CONFIG["url"])
+        driver.get(url)
         wait = WebDriverWait(driver, 15)
         wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "a[href^='/project/']")))
         
         # 이전 버전처럼 정해진 시간만큼만 대기 (스크롤 없음)
-        time.sleep(5) 
+        pause(5) 
         
         cards = driver.find_elements(By.CSS_SELECTOR, "a[href^='/project/']")
 
@@ -89,34 +98,30 @@ def scrape_projects():
         driver.quit()
     return new_data
 
+
+# CONFIG["urls"]의 목록 주소들을 동시에 수집해 하나로 합침
+def scrape_projects():
+    targets = paged(CONFIG["urls"], CONFIG["pages"], CONFIG["page_param"])
+    data = fan_out(targets, scrape_listing)
+    print(f"📦 {len(targets)}개 목록에서 총 {len(data)}건 (중복 제거 후)")
+    return data
+
 # [공통] 스마트 저장
 def update_sheet(ws, data):
     if not data: return print(f"[{CONFIG['name']}] 새 데이터 없음")
-    all_v = ws.get_all_values()
-    headers = all_v[0] if all_v else ['title', 'url', 'scraped_at', 'status', 'location']
-    
-    col_map = {name: i for i, name in enumerate(headers)}
-    if 'url' not in col_map: return print("❌ 'url' 컬럼을 찾을 수 없습니다.")
+    # 헤더와 url 컬럼, 중복 방지 인덱스만 읽어 새 행을 추가합니다.
+    rows = append_new_rows(ws, data, CONFIG["source"], ['title', 'url', 'scraped_at', 'status', 'location'])
+    if rows: print(f"💾 {CONFIG['name']} {len(rows)}건 저장 완료!")
 
-    existing_urls = {row[col_map['url']] for row in all_v[1:] if len(row) > col_map['url']}
-    
-    rows = []
-    for item in data:
-        if item['url'] in existing_urls: continue
-        row = [''] * len(headers)
-        for k, v in item.items():
-            if k in col_map: row[col_map[k]] = v
-        if 'status' in col_map: row[col_map['status']] = 'archived'
-        rows.append(row)
-    
-    if rows:
-        ws.append_rows(rows)
-        print(f"💾 {CONFIG['name']} {len(rows)}건 저장 완료!")
-
-if __name__ == "__main__":
+def main():
     try:
-        ws = get_worksheet()
+        start_cassette(CONFIG["source"])
+        ws = open_resource('sheet', get_worksheet)
         data = scrape_projects()
         update_sheet(ws, data)
     except Exception as e:
         print(f"🚨 {CONFIG['name']} 실행 실패: {e}")
+
+if __name__ == "__main__":
+    from profiler import profiled
+    profiled(f"{CONFIG['source']}-scrape", main)()
@@ -0,0 +1,175 @@
+import os
+import re
+import json
+import math
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# ==========================================
+# [공통] LLM 클라이언트 (헤지 요청 + 장애 전환)
+# ==========================================
+# 센더는 행을 하나씩 순서대로 처리하므로 응답 하나가 늦으면 실행 전체가 멈춥니다.
+# 이 클라이언트는 한 번의 ask_json 호출을 다음처럼 처리해 행당 지연의 상한을 둡니다.
+#   - 첫 공급자에 요청하고, 최근 응답 시간 p95(표본이 적으면 HEDGE_SEC)가 지나도 답이 없으면
+#     다음 공급자(공급자가 하나면 같은 모델)에 같은 요청을 한 번 더 보내 먼저 온 답을 사용
+#   - 요청이 오류로 끝나면 기다리지 않고 바로 다음 공급자로 전환
+#   - 전체 대기는 TIMEOUT_SEC로 제한
+# 응답은 코드 블록 등을 벗겨 JSON 객체(dict)로 정규화해 돌려줍니다.
+#
+# 환경 변수:
+#   FLINTSTONING_LLM_PROVIDERS : 공급자:모델 목록 (기본 openai:gpt-4o-mini,gemini:gemini-1.5-flash)
+#                                gemini는 GEMINI_API_KEY가 있을 때만 사용
+#   FLINTSTONING_LLM_TIMEOUT   : 한 번의 ask_json 전체 제한 시간(초)
+#   FLINTSTONING_LLM_HEDGE_SEC : 응답 시간 표본이 모이기 전 헤지 요청까지 기다리는 시간(초)
+#   OPENAI_BASE_URL / GEMINI_API_ENDPOINT : 로컬 대역 서버로 시험할 때의 접속 주소
+
+DEFAULT_PROVIDERS = "openai:gpt-4o-mini,gemini:gemini-1.5-flash"
+TIMEOUT_SEC = float(os.environ.get("FLINTSTONING_LLM_TIMEOUT", "45"))
+HEDGE_SEC = float(os.environ.get("FLINTSTONING_LLM_HEDGE_SEC", "10"))
+MIN_HEDGE_SEC = 1.0
+MIN_SAMPLES = 10
+MAX_ATTEMPTS = 3
+
+
+# [공통] LLM 응답 텍스트 → dict (```json 코드 블록, 앞뒤 설명 문장 허용)
+def parse_json(text):
+    text = (text or "").strip()
+    fenced = re.search(r"```(?:json)?\s*(.*?)```", text, re.S)
+    if fenced: text = fenced.group(1).strip()
+    try:
+        value = json.loads(text)
+    except ValueError:
+        start, end = text.find("{"), text.rfind("}")
+        if start < 0 or end <= start:
+            raise ValueError(f"JSON 응답이 아닙니다: {text[:80]}")
+        value = json.loads(text[start:end + 1])
+    if not isinstance(value, dict):
+        raise ValueError(f"JSON 객체가 아닙니다: {text[:80]}")
+    return value
+
+
+class OpenAIProvider:
+    def __init__(self, model):
+        from openai import OpenAI
+        self.name = f"openai:{model}"
+        self.model = model
+        # 재시도는 이 클라이언트가 다른 공급자로 하므로 SDK 자체 재시도는 끔
+        self.client = OpenAI(api_key=os.environ['OPENAI_API_KEY'], timeout=TIMEOUT_SEC, max_retries=0)
+
+    def complete(self, messages):
+        res = self.client.chat.completions.create(
+            model=self.model,
+            response_format={"type": "json_object"},
+            messages=messages
+        )
+        return res.choices[0].message.content
+
+
+class GeminiProvider:
+    def __init__(self, model):
+        import google.generativeai as genai
+        endpoint = os.environ.get("GEMINI_API_ENDPOINT")
+        genai.configure(api_key=os.environ['GEMINI_API_KEY'], transport="rest",
+                        client_options={"api_endpoint": endpoint} if endpoint else None)
+        self.name = f"gemini:{model}"
+        self.genai = genai
+        self.model = model
+
+    def complete(self, messages):
+        system = "\n".join(m['content'] for m in messages if m['role'] == 'system')
+        prompt = "\n".join(m['content'] for m in messages if m['role'] != 'system')
+        model = self.genai.GenerativeModel(self.model, system_instruction=system or None,
+                                           generation_config={"response_mime_type": "application/json"})
+        return model.generate_content(prompt, request_options={"timeout": TIMEOUT_SEC}).text
+
+
+PROVIDERS = {'openai': (OpenAIProvider, 'OPENAI_API_KEY'), 'gemini': (GeminiProvider, 'GEMINI_API_KEY')}
+
+
+def build_providers(spec=None):
+    providers = []
+    for entry in (spec or os.environ.get("FLINTSTONING_LLM_PROVIDERS", DEFAULT_PROVIDERS)).split(","):
+        kind, _, model = entry.strip().partition(":")
+        if kind not in PROVIDERS:
+            raise Exception(f"알 수 없는 LLM 공급자: {kind}")
+        cls, key_env = PROVIDERS[kind]
+        if not os.environ.get(key_env): continue
+        providers.append(cls(model))
+    if not providers:
+        raise Exception("사용할 수 있는 LLM 공급자가 없습니다 (API 키 확인).")
+    return providers
+
+
+class LLMClient:
+    def __init__(self, providers=None, stats=None, timeout=TIMEOUT_SEC):
+        self.providers = providers or build_providers()
+        self.stats = stats if stats is not None else {}
+        self.timeout = timeout
+        self.latencies = deque(maxlen=50)
+        # 늦게 끝난(버려진) 요청이 다음 호출을 막지 않도록 스레드를 넉넉히 둠
+        self.pool = ThreadPoolExecutor(max_workers=MAX_ATTEMPTS * 2, thread_name_prefix="llm")
+
+    def hedge_delay(self):
+        if len(self.latencies) < MIN_SAMPLES: return HEDGE_SEC
+        ordered = sorted(self.latencies)
+        # nearest-rank p95 (표본 n개 중 ceil(0.95n)번째)
+        return max(MIN_HEDGE_SEC, ordered[min(len(ordered), math.ceil(len(ordered) * 0.95)) - 1])
+
+    def _count(self, key):
+        self.stats[key] = self.stats.get(key, 0) + 1
+
+    def _call(self, provider, messages):
+        started = time.time()
+        result = parse_json(provider.complete(messages))
+        return result, time.time() - started
+
+    def ask_json(self, messages):
+        deadline = time.time() + self.timeout
+        attempts = 0
+        running = {}
+        errors = []
+        hedged = False
+
+        def launch():
+            nonlocal attempts
+            provider = self.providers[attempts % len(self.providers)]
+            attempts += 1
+            running[self.pool.submit(self._call, provider, messages)] = provider
+
+        launch()
+        while running:
+            remaining = deadline - time.time()
+            if remaining <= 0: break
+            # 헤지 요청을 아직 보내지 않았으면 p95 지연까지만 기다림
+            limit = remaining if hedged or attempts >= MAX_ATTEMPTS else min(remaining, self.hedge_delay())
+            done, _ = wait(running, timeout=limit, return_when=FIRST_COMPLETED)
+
+            if not done:
+                if not hedged and attempts < MAX_ATTEMPTS:
+                    hedged = True
+                    self._count('llm_hedged')
+                    print(f"⏱️ LLM 응답 지연({limit:.1f}초) → {self.providers[attempts % len(self.providers)].name}에 헤지 요청")
+                    launch()
+                continue
+
+            for future in done:
+                provider = running.pop(future)
+                try:
+                    result, elapsed = future.result()
+                except Exception as e:
+                    errors.append(f"{provider.name}: {e}")
+                    print(f"⚠️ LLM 오류 ({provider.name}): {e}")
+                    continue
+                self.latencies.append(elapsed)
+                return result
+
+            # 모두 오류로 끝났으면 다음 공급자로 바로 전환
+            if not running and attempts < MAX_ATTEMPTS:
+                self._count('llm_failover')
+                print(f"🔀 LLM 장애 전환 → {self.providers[attempts % len(self.providers)].name}")
+                launch()
+
+        if running:
+            raise Exception(f"LLM 응답 시간 초과 ({self.timeout:g}초)")
+        raise Exception(f"LLM 요청 실패: {' / '.join(errors)}")
@@ -0,0 +1,14 @@
+import os
+
+# ==========================================
+# [공통] 로컬 상태 저장 경로
+# ==========================================
+# 미러, 아카이브 등 로컬에 남기는 파일은 모두 이 디렉터리 아래에 둡니다.
+# 워크플로에서는 actions/cache로 이 디렉터리를 복원/저장합니다.
+STATE_DIR = os.environ.get("FLINTSTONING_HOME", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".flintstoning"))
+
+
+def state_path(*parts):
+    path = os.path.join(STATE_DIR, *parts)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
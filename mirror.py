@@ -0,0 +1,182 @@
+import os
+import re
+import json
+import glob
+from datetime import datetime
+from gspread.utils import rowcol_to_a1
+from sheets import get_spreadsheet, get_worksheet, get_headers, SOURCE_GIDS
+from local_state import state_path
+
+# ==========================================
+# [공통] 로컬 컬럼형 미러 (분석용)
+# ==========================================
+# 다섯 개 소스 탭을 .flintstoning/mirror/<source>.parquet 로 증분 동기화하고,
+# DuckDB로 미리 정의한 분석 쿼리를 로컬에서 실행합니다.
+#
+# 워터마크: 탭마다 '마지막으로 읽은 행' 번호와 그 행의 url을 기억하고, 다음 동기화는
+# 그 행부터만 읽습니다. 그 위에서 아직 최종 상태(published/dropped/duplicate/failed)가 아닌
+# 행(archived 등)은 워터마크를 붙잡지 않도록 pending 목록에 행 번호와 url을 따로 남겨 다음
+# 동기화에서 그 행들만 다시 읽습니다. 롤오버 등으로 행이 밀려 url이 맞지 않으면 전체를 다시 읽습니다.
+
+FINAL_STATUSES = {'published', 'dropped', 'duplicate', 'failed'}
+WATERMARK_FILE = "watermarks.json"
+
+
+def mirror_file(source):
+    return state_path("mirror", f"{source}.parquet")
+
+
+def load_watermarks():
+    path = state_path("mirror", WATERMARK_FILE)
+    if not os.path.exists(path): return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_watermarks(watermarks):
+    with open(state_path("mirror", WATERMARK_FILE), "w", encoding="utf-8") as f:
+        json.dump(watermarks, f, ensure_ascii=False, indent=2)
+
+
+def _last_col(headers):
+    return re.sub(r'\d+', '', rowcol_to_a1(1, len(headers)))
+
+
+def _to_row(headers, cells):
+    cells = list(cells) + [''] * (len(headers) - len(cells))
+    return dict(zip(headers, cells))
+
+
+def read_rows_from(ws, headers, start_row):
+    # 끝 행을 지정하지 않은 열린 범위 (예: A120:H)
+    values = ws.batch_get([f"A{start_row}:{_last_col(headers)}"])[0]
+    return [(start_row + offset, _to_row(headers, cells)) for offset, cells in enumerate(values)]
+
+
+# 워터마크 위의 미완료 행만 한 번의 batch_get으로 다시 읽음 (행이 밀려 url이 다르면 None)
+def read_pending(ws, headers, pending):
+    if not pending: return []
+    last_col = _last_col(headers)
+    values = ws.batch_get([f"A{p['row']}:{last_col}{p['row']}" for p in pending])
+    rows = []
+    for p, cells in zip(pending, values):
+        row = _to_row(headers, cells[0] if cells else [])
+        if row.get('url') != p['url']: return None
+        rows.append((p['row'], row))
+    return rows
+
+
+def next_watermark(rows, wm):
+    pending = [{"row": row_number, "url": row['url']} for row_number, row in rows
+               if row.get('url') and row.get('status', '').strip().lower() not in FINAL_STATUSES]
+    # 마지막 행은 다음 동기화의 기준(anchor)이 되므로 pending에서 제외
+    filled = [(row_number, row) for row_number, row in rows if row.get('url')]
+    if not filled: return dict(wm, pending=pending)
+    last_row, last = max(filled, key=lambda r: r[0])
+    return {"row": last_row, "anchor_url": last['url'], "pending": [p for p in pending if p['row'] != last_row]}
+
+
+def upsert(source, rows):
+    import pandas as pd
+
+    path = mirror_file(source)
+    synced_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    df = pd.DataFrame([dict(row, source=source, synced_at=synced_at) for _, row in rows])
+    if os.path.exists(path):
+        df = pd.concat([pd.read_parquet(path), df])
+    df = df[df['url'].astype(str).str.len() > 0].drop_duplicates(subset=['url'], keep='last')
+    df.to_parquet(path, index=False, compression='zstd')
+    return len(df)
+
+
+def sync_source(spreadsheet, source, watermarks):
+    ws = get_worksheet(SOURCE_GIDS[source], spreadsheet)
+    headers = get_headers(ws)
+    wm = watermarks.get(source, {"row": 2, "anchor_url": ""})
+
+    rows = read_rows_from(ws, headers, wm["row"])
+    pending = read_pending(ws, headers, wm.get("pending", []))
+    if pending is None or wm["anchor_url"] and (not rows or rows[0][1].get('url') != wm["anchor_url"]):
+        print(f"  ↺ [{source}] 워터마크 행이 이동해 전체를 다시 읽습니다.")
+        wm = {"row": 2, "anchor_url": ""}
+        rows, pending = read_rows_from(ws, headers, 2), []
+    rows = pending + rows
+
+    total = upsert(source, rows) if rows else None
+    watermarks[source] = dict(next_watermark(rows, wm), synced_at=datetime.now().isoformat(timespec="seconds"))
+    print(f"🔄 [{source}] {wm['row']}행부터 {len(rows)}건 동기화 (미러 {total if total is not None else '변경 없음'})")
+
+
+def sync(sources=None):
+    spreadsheet = get_spreadsheet()
+    watermarks = load_watermarks()
+    for source in sources or SOURCE_GIDS:
+        try:
+            sync_source(spreadsheet, source, watermarks)
+        except Exception as e:
+            print(f"🚨 [{source}] 동기화 실패: {e}")
+    save_watermarks(watermarks)
+
+
+# ==========================================
+# [공통] 미리 정의한 분석 쿼리 (DuckDB)
+# ==========================================
+# 모든 쿼리는 'items' 뷰(전체 소스 미러의 합집합)를 대상으로 합니다.
+QUERIES = {
+    "acceptance": (
+        "소스별 주간 수집량과 채택률(published / (published + dropped))",
+        """
+        SELECT source,
+               date_trunc('week', TRY_CAST(scraped_at AS DATE)) AS week,
+               count(*) AS scraped,
+               count(*) FILTER (WHERE lower(status) = 'published') AS published,
+               count(*) FILTER (WHERE lower(status) = 'dropped') AS dropped,
+               round(count(*) FILTER (WHERE lower(status) = 'published')
+                     / nullif(count(*) FILTER (WHERE lower(status) IN ('published', 'dropped')), 0), 3) AS acceptance_rate
+        FROM items
+        GROUP BY 1, 2
+        ORDER BY 2 DESC, 1
+        """,
+    ),
+    "repeat-companies": (
+        "오퍼센트에 반복해서 올라오는 회사",
+        """
+        SELECT company, count(*) AS postings,
+               count(*) FILTER (WHERE lower(status) = 'published') AS published,
+               min(scraped_at) AS first_seen, max(scraped_at) AS last_seen
+        FROM items
+        WHERE source = 'offercent' AND company NOT IN ('', '회사명 미상')
+        GROUP BY 1
+        HAVING count(*) > 1
+        ORDER BY postings DESC
+        """,
+    ),
+    "backlog": (
+        "소스별 상태 분포 (대기 중인 archived 건수 확인용)",
+        """
+        SELECT source, lower(status) AS status, count(*) AS items
+        FROM items
+        GROUP BY 1, 2
+        ORDER BY 1, 3 DESC
+        """,
+    ),
+}
+
+
+def connect():
+    import duckdb
+
+    files = glob.glob(os.path.join(os.path.dirname(mirror_file("_")), "*.parquet"))
+    if not files:
+        raise Exception("미러 파일이 없습니다. 먼저 'flintstoning.py sync'를 실행하세요.")
+    con = duckdb.connect()
+    con.execute(f"CREATE VIEW items AS SELECT * FROM read_parquet({files!r}, union_by_name = true)")
+    return con
+
+
+def run_query(name):
+    if name not in QUERIES:
+        raise Exception(f"알 수 없는 쿼리입니다: {name} (사용 가능: {', '.join(QUERIES)})")
+    description, sql = QUERIES[name]
+    print(f"📊 {name}: {description}")
+    connect().sql(sql).show(max_rows=100)
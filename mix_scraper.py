@@ -1,18 +1,24 @@
-import os, time, json, re
+import os, json, re
 import gspread
 from datetime import datetime
 from oauth2client.service_account import ServiceAccountCredentials
-from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from sheets import append_new_rows, existing_url_keys
+from browser import create_driver, fan_out
+from cassette import open_resource, pause, start as start_cassette
+from feeds import discover
 
 # [설정] 이 파일 전용 정보
 CONFIG = {
     "name": "Mix.day",
-    "url": "https://mix.day/",
+    "source": "mix",
+    "urls": ["https://mix.day/"],
     "gid": "981623942" # Mix 탭
+    # 사이트맵/피드 증분 수집(feeds.py)은 꺼져 있음. 피드 주소나 글 주소 패턴을 확인한 뒤
+    # "discovery": {"feeds": [...], "match": r"..."}를 추가하면 화면 수집 전에 피드를 먼저 읽음
 }
 
 # [공통] 시트 연결 (GID로 찾기)
@@ -28,21 +34,20 @@ def get_worksheet():
     return sheet
 
 # [공통] 브라우저 실행
-def get_driver():
+def get_driver(slot=0):
     options = Options()
     options.add_argument("--headless")
     options.add_argument("--disable-blink-features=AutomationControlled")
-    driver = webdriver.Chrome(options=options)
-    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"})
-    return driver
+    return create_driver(options, CONFIG["source"], slot=slot)
 
 # [전용] 데이터 수집
-def scrape_projects():
-    driver = get_driver()
+# 목록 주소 하나를 수집 (slot: 병렬 수집 시 드라이버 프로필 번호)
+def scrape_listing(url, slot=0):
+    driver = get_driver(slot)
     new_data = []
     today = datetime.now().strftime("%Y-%m-%d")
     try:
-        driver.get(CONFIG["url"])
+        driver.get(url)
         # 카드 요소가 로드될 때까지 대기
         wait = WebDriverWait(driver, 15)
         wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "article")))
@@ -50,7 +55,7 @@ def scrape_projects():
         # Mix.day는 무한 스크롤이 있을 수 있으므로 약간의 스크롤 수행
         for _ in range(3):
             driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)
+            pause(2)
         
         # 1. 각 콘텐츠 카드(article) 추출
         articles = driver.find_elements(By.CSS_SELECTOR, "article")
@@ -79,24 +84,29 @@ def scrape_projects():
                 
     finally: driver.quit()
     return new_data
+
+
+# CONFIG["urls"]의 목록 주소들을 동시에 수집해 하나로 합침
+def scrape_projects():
+    data = fan_out(CONFIG["urls"], scrape_listing)
+    print(f"📦 {len(CONFIG['urls'])}개 목록에서 총 {len(data)}건 (중복 제거 후)")
+    return data
 # [공통] 스마트 저장 (헤더 이름 기준)
 def update_sheet(ws, data):
     if not data: return print(f"[{CONFIG['name']}] 새 공고 없음")
-    all_v = ws.get_all_values()
-    headers = all_v[0] if all_v else ['title', 'url', 'scraped_at', 'status', 'location']
-    col_map = {name: i for i, name in enumerate(headers)}
-    existing_urls = {row[col_map['url']] for row in all_v[1:] if len(row) > col_map['url']}
-    
-    rows = []
-    for item in data:
-        if item['url'] in existing_urls: continue
-        row = [''] * len(headers)
-        for k, v in item.items():
-            if k in col_map: row[col_map[k]] = v
-        if 'status' in col_map: row[col_map['status']] = 'archived'
-        rows.append(row)
-    
-    if rows: ws.append_rows(rows); print(f"💾 {CONFIG['name']} {len(rows)}건 저장")
+    # 헤더와 url 컬럼, 중복 방지 인덱스만 읽어 새 행을 추가합니다.
+    rows = append_new_rows(ws, data, CONFIG["source"], ['title', 'url', 'scraped_at', 'status', 'location'])
+    if rows: print(f"💾 {CONFIG['name']} {len(rows)}건 저장")
+
+def main():
+    start_cassette(CONFIG["source"])
+    ws = open_resource('sheet', get_worksheet)
+    found = discover(CONFIG["source"], CONFIG, seen=lambda: existing_url_keys(ws, CONFIG["source"]))
+    data = found.entries if found else scrape_projects()
+    update_sheet(ws, data)
+    # 시트 저장까지 끝난 뒤에 기준 시각을 옮김
+    if found: found.commit()
 
 if __name__ == "__main__":
-    ws = get_worksheet(); data = scrape_projects(); update_sheet(ws, data)
+    from profiler import profiled
+    profiled(f"{CONFIG['source']}-scrape", main)()
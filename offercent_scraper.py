@@ -1,20 +1,31 @@
-import os, time, json, re
+import os, json, re
 import gspread
 from datetime import datetime
 from oauth2client.service_account import ServiceAccountCredentials
-from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from sheets import append_new_rows
+from url_utils import url_key
+from browser import create_driver, fan_out
+from cassette import open_resource, pause, start as start_cassette
 
 # ==========================================
 # [전용] 설정 정보
 # ==========================================
 CONFIG = {
     "name": "오퍼센트_통합_크롤러",
-    "url": "https://offercent.co.kr/list?jobCategories=0040002%2C0170004&sort=recent",
-    "gid": "639559541"
+    "source": "offercent",
+    # 직무 카테고리별로 나눠 각 탭이 따로 스크롤 (한 탭의 스크롤 한도에 묶이지 않도록)
+    "urls": [
+        "https://offercent.co.kr/list?jobCategories=0040002&sort=recent",
+        "https://offercent.co.kr/list?jobCategories=0170004&sort=recent",
+    ],
+    "gid": "639559541",
+    "jd_url": "https://offercent.co.kr/jd/{id}",
+    # network: 페이지가 받아오는 API 응답에서 수집 (실패 시 dom으로 전환), dom: 화면 탐색만 사용
+    "capture": os.environ.get("OFFERCENT_CAPTURE", "network"),
 }
 
 # ==========================================
@@ -33,7 +44,7 @@ def get_worksheet():
 # ==========================================
 # [공통] 셀레니움 브라우저 설정 로직
 # ==========================================
-def get_driver():
+def get_driver(slot=0):
     options = Options()
     options.add_argument("--headless")
     options.add_argument("--no-sandbox")
@@ -41,93 +52,246 @@ def get_driver():
     options.add_argument("--disable-blink-features=AutomationControlled")
     options.add_argument("window-size=1920,1080")
     options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-    driver = webdriver.Chrome(options=options)
-    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
-        "source": "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
-    })
-    return driver
+    # 네트워크 캡처용 performance 로그 (Network.* 이벤트)
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    return create_driver(options, CONFIG["source"], slot=slot)
+
+# ==========================================
+# [전용] 네트워크 응답 캡처 (페이지가 직접 받아오는 목록 API JSON)
+# ==========================================
+# 오퍼센트는 클라이언트 렌더링 앱이라, 화면의 난독화된 클래스(a.xqzk367)를 따라가는 대신
+# 브라우저 performance 로그의 Network 이벤트에서 JSON 응답을 찾아 본문을 읽습니다.
+# 응답 구조가 바뀌어도 버티도록, JSON 안에서 공고 id/제목/회사명을 가진 객체를 찾아 씁니다.
+# 처음 캡처한 공고로 만든 주소는 화면의 /jd/ 링크와 대조해, 하나도 겹치지 않으면(다른 id 필드를
+# 집은 경우) 잘못된 주소를 저장하지 않도록 버리고 DOM 탐색으로 전환합니다.
+# 캡처된 공고가 없을 때도 기존 DOM 탐색으로 수집합니다.
+
+API_URL_HINTS = ["api", "graphql", "/jd", "job"]
+TITLE_KEYS = ["title", "jobTitle", "jdTitle", "positionName", "name"]
+COMPANY_KEYS = ["companyName", "company", "corpName", "brandName"]
+LOCATION_KEYS = ["location", "address", "region", "workPlace", "area"]
+EXPERIENCE_KEYS = ["experience", "career", "careerText", "experienceText", "careerLevel"]
+ID_KEYS = ["jdId", "jobId", "id"]
+
+
+def _pick(obj, keys):
+    for key in keys:
+        value = obj.get(key)
+        if isinstance(value, dict):
+            value = _pick(value, ["name", "title", "text"] + keys)
+        if isinstance(value, list):
+            value = " ".join(str(v) for v in value if isinstance(v, (str, int)))
+        if value not in (None, ""):
+            return str(value).strip()
+    return ""
+
+
+def _iter_dicts(payload):
+    if isinstance(payload, dict):
+        yield payload
+        for value in payload.values():
+            yield from _iter_dicts(value)
+    elif isinstance(payload, list):
+        for value in payload:
+            yield from _iter_dicts(value)
+
+
+def records_from_payload(payload, today):
+    records = []
+    for obj in _iter_dicts(payload):
+        job_id, title, company = _pick(obj, ID_KEYS), _pick(obj, TITLE_KEYS), _pick(obj, COMPANY_KEYS)
+        # 공고 객체로 보려면 id, 제목, 회사명이 모두 있어야 함 (회사 객체 등은 제외)
+        if not (job_id and title and company) or company == title: continue
+        records.append({
+            'company': company, 'title': title,
+            'location': _pick(obj, LOCATION_KEYS), 'experience': _pick(obj, EXPERIENCE_KEYS),
+            'url': CONFIG["jd_url"].format(id=job_id), 'scraped_at': today
+        })
+    return records
+
+
+PAGE_JD_LINKS_JS = """
+return Array.from(document.querySelectorAll("a[href*='/jd/']")).map(a => a.href);
+"""
+
+
+# API 응답으로 만든 주소가 화면에 그려진 공고 링크와 하나라도 같은지 확인
+def api_urls_match(driver, records):
+    page_keys = {url_key(href, CONFIG["source"]) for href in driver.execute_script(PAGE_JD_LINKS_JS)}
+    return any(url_key(record['url'], CONFIG["source"]) in page_keys for record in records)
+
+
+def capture_api_records(driver, today):
+    records = []
+    for entry in driver.get_log("performance"):
+        try:
+            message = json.loads(entry["message"])["message"]
+            if message.get("method") != "Network.responseReceived": continue
+            response = message["params"]["response"]
+            if "json" not in response.get("mimeType", ""): continue
+            if not any(hint in response["url"] for hint in API_URL_HINTS): continue
+
+            body = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": message["params"]["requestId"]})
+            records.extend(records_from_payload(json.loads(body["body"]), today))
+        except Exception:
+            # 본문이 이미 해제됐거나 JSON이 아닌 응답은 건너뜀
+            continue
+    return records
+
 
 # ==========================================
 # [전용] 오퍼센트 사이트 데이터 수집 로직 (키워드 기반 분류 적용)
 # ==========================================
-def scrape_projects():
-    driver = get_driver()
+# 스크롤할 때마다 전체 카드를 다시 훑지 않도록, 처리한 카드에 표시(data-flint-seen)를 남기고
+# 표시가 없는 새 카드만 href/텍스트와 함께 한 번의 스크립트 호출로 가져옵니다.
+CARD_SELECTOR = "a.xqzk367[href*='/jd/']"
+SEEN_ATTR = "data-flint-seen"
+# 1이면 처리한 카드의 이미지를 비워 깊게 스크롤해도 브라우저 메모리가 늘지 않도록 함
+PRUNE_CARDS = os.environ.get("OFFERCENT_PRUNE_CARDS", "") == "1"
+
+NEW_CARDS_JS = """
+const cards = Array.from(document.querySelectorAll(arguments[0] + ':not([' + arguments[1] + '])'))
+    .filter(card => card.innerText.trim());  // 아직 내용이 그려지지 않은 카드는 다음 스크롤에서 다시 확인
+return cards.map(card => {
+    card.setAttribute(arguments[1], '1');
+    return [card, card.href, card.innerText];
+});
+"""
+
+# 처리한 카드 안의 이미지만 비움 (노드 자체는 앱이 관리하므로 지우지 않고, 카드 높이도 유지)
+PRUNE_CARDS_JS = """
+document.querySelectorAll('[' + arguments[0] + '] img').forEach(img => {
+    img.removeAttribute('srcset');
+    img.src = 'data:,';
+});
+"""
+
+
+def collect_dom_cards(driver, urls_check, new_data, today):
+    new_cards = driver.execute_script(NEW_CARDS_JS, CARD_SELECTOR, SEEN_ATTR)
+
+    for card, full_href, text in new_cards:
+        try:
+            clean_url = full_href.split('?')[0]
+            title = (text or "").strip()
+
+            if clean_url not in urls_check and title:
+                container = card.find_element(By.XPATH, "..")
+                company_name, location, experience = "회사명 미상", "", ""
+
+                for _ in range(5):
+                    try:
+                        # 회사명 추출
+                        company_el = container.find_element(By.CSS_SELECTOR, 'span[data-variant="body-02"]')
+                        company_name = company_el.text.strip()
+
+                        # 지역/경력 통합 텍스트 추출
+                        info_el = container.find_element(By.CSS_SELECTOR, 'span[data-variant="body-03"]')
+                        info_text = info_el.text.strip()
+
+                        # ------------------------------------------------------
+                        # [핵심] 키워드 기반 자동 분류 로직
+                        # ------------------------------------------------------
+                        if info_text:
+                            # 가운데 점(·)이 있으면 나누고, 없으면 통째로 리스트화
+                            parts = [p.strip() for p in info_text.split("·")] if "·" in info_text else [info_text]
+
+                            exp_keywords = ["경력", "신입", "년", "무관"]
+
+                            for part in parts:
+                                # 조각 내에 경력 관련 키워드가 있는지 검사
+                                if any(key in part for key in exp_keywords):
+                                    experience = part
+                                else:
+                                    # 키워드가 없으면 지역으로 간주 (단, 이미 채워졌다면 무시)
+                                    if not location:
+                                        location = part
+
+                        if company_name != "회사명 미상": break
+                    except:
+                        container = container.find_element(By.XPATH, "..")
+
+                new_data.append({
+                    'company': company_name, 'title': title, 'location': location,
+                    'experience': experience, 'url': clean_url, 'scraped_at': today
+                })
+                urls_check.add(clean_url)
+                print(f"✨ 수집: {company_name} | {location} | {experience}")
+
+        except: continue
+
+    if PRUNE_CARDS and new_cards:
+        driver.execute_script(PRUNE_CARDS_JS, SEEN_ATTR)
+
+
+# 목록 주소 하나를 수집 (slot: 병렬 수집 시 드라이버 프로필 번호)
+def scrape_listing(url, slot=0):
+    driver = get_driver(slot)
     new_data = []
     today = datetime.now().strftime("%Y-%m-%d")
     urls_check = set()
-    
+    use_network = CONFIG["capture"] == "network"
+    api_verified = False
+
     try:
-        print(f"🔗 접속 중: {CONFIG['url']}")
-        driver.get(CONFIG["url"])
+        if use_network:
+            driver.execute_cdp_cmd("Network.enable", {})
+        print(f"🔗 접속 중: {url}")
+        driver.get(url)
         wait = WebDriverWait(driver, 20)
-        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "a.xqzk367")))
-        
+        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "a[href*='/jd/']")))
+
         print("📥 실시간 누적 수집 및 데이터 분류를 시작합니다...")
-        
+
         # 단계별로 스크롤하며 수집 (필요시 range 숫자를 높여 더 많이 수집 가능)
+        idle_scrolls = 0
         for i in range(1, 21):
-            current_cards = driver.find_elements(By.CSS_SELECTOR, "a.xqzk367[href*='/jd/']")
-            
-            for card in current_cards:
-                try:
-                    full_href = card.get_attribute("href")
-                    clean_url = full_href.split('?')[0]
-                    title = card.text.strip()
-                    
-                    if clean_url not in urls_check and title:
-                        container = card.find_element(By.XPATH, "..")
-                        company_name, location, experience = "회사명 미상", "", ""
-                        
-                        for _ in range(5):
-                            try:
-                                # 회사명 추출
-                                company_el = container.find_element(By.CSS_SELECTOR, 'span[data-variant="body-02"]')
-                                company_name = company_el.text.strip()
-                                
-                                # 지역/경력 통합 텍스트 추출
-                                info_el = container.find_element(By.CSS_SELECTOR, 'span[data-variant="body-03"]')
-                                info_text = info_el.text.strip()
-                                
-                                # ------------------------------------------------------
-                                # [핵심] 키워드 기반 자동 분류 로직
-                                # ------------------------------------------------------
-                                if info_text:
-                                    # 가운데 점(·)이 있으면 나누고, 없으면 통째로 리스트화
-                                    parts = [p.strip() for p in info_text.split("·")] if "·" in info_text else [info_text]
-                                    
-                                    exp_keywords = ["경력", "신입", "년", "무관"]
-                                    
-                                    for part in parts:
-                                        # 조각 내에 경력 관련 키워드가 있는지 검사
-                                        if any(key in part for key in exp_keywords):
-                                            experience = part
-                                        else:
-                                            # 키워드가 없으면 지역으로 간주 (단, 이미 채워졌다면 무시)
-                                            if not location:
-                                                location = part
-
-                                if company_name != "회사명 미상": break
-                            except:
-                                container = container.find_element(By.XPATH, "..")
-
-                        new_data.append({
-                            'company': company_name, 'title': title, 'location': location,
-                            'experience': experience, 'url': clean_url, 'scraped_at': today
-                        })
-                        urls_check.add(clean_url)
-                        print(f"✨ 수집: {company_name} | {location} | {experience}")
-
-                except: continue
-            
+            if use_network:
+                captured = capture_api_records(driver, today)
+                # 첫 캡처는 화면 링크와 대조해 id 필드가 맞는지 확인
+                if captured and not api_verified:
+                    api_verified = api_urls_match(driver, captured)
+                    if not api_verified:
+                        print("⚠️ API 응답으로 만든 공고 주소가 화면의 /jd/ 링크와 맞지 않아 화면 탐색으로 전환합니다.")
+                        use_network = False
+
+            if use_network:
+                added = 0
+                for record in captured:
+                    if record['url'] in urls_check: continue
+                    new_data.append(record)
+                    urls_check.add(record['url'])
+                    added += 1
+                    print(f"✨ 수집(API): {record['company']} | {record['location']} | {record['experience']}")
+
+                if not new_data and i >= 3:
+                    # 목록 API 응답을 찾지 못함 → 화면(DOM) 탐색으로 전환
+                    print("⚠️ 목록 API 응답을 찾지 못해 화면 탐색으로 전환합니다.")
+                    use_network = False
+                else:
+                    # 스크롤해도 새 공고가 오지 않으면 목록 끝으로 판단
+                    idle_scrolls = idle_scrolls + 1 if added == 0 and new_data else 0
+                    if idle_scrolls >= 3: break
+
+            if not use_network:
+                collect_dom_cards(driver, urls_check, new_data, today)
+
             driver.execute_script("window.scrollBy(0, 1200);")
-            time.sleep(2.5)
+            pause(2.5)
 
-    finally: 
+    finally:
         driver.quit()
-    
+
     print(f"✅ 총 {len(new_data)}건의 공고를 정확하게 분류하여 수집했습니다!")
     return new_data
-    
+
+
+# CONFIG["urls"]의 목록 주소들을 동시에 수집해 하나로 합침
+def scrape_projects():
+    data = fan_out(CONFIG["urls"], scrape_listing)
+    print(f"📦 {len(CONFIG['urls'])}개 목록에서 총 {len(data)}건 (중복 제거 후)")
+    return data
+
 # ==========================================
 # [공통] 시트 데이터 업데이트 로직
 # ==========================================
@@ -136,33 +300,27 @@ def update_sheet(ws, data):
         print(f"[{CONFIG['name']}] 새로 수집된 공고가 없습니다.")
         return
 
-    all_v = ws.get_all_values()
-    headers = all_v[0] if all_v else ['company', 'title', 'location', 'experience', 'url', 'scraped_at', 'status']
-    
-    col_map = {name: i for i, name in enumerate(headers)}
-    # 기존 데이터 중복 비교 (URL 파라미터 제외)
-    existing_urls = {row[col_map['url']].split('?')[0] for row in all_v[1:] if len(row) > col_map['url']}
-    
-    rows_to_append = []
-    for item in data:
-        if item['url'] in existing_urls: continue
-        row = [''] * len(headers)
-        for k, v in item.items():
-            if k in col_map: row[col_map[k]] = v
-        if 'status' in col_map: row[col_map['status']] = 'archived'
-        rows_to_append.append(row)
+    # 기존 데이터 중복 비교 (정규화한 URL 기준, 중복 방지 인덱스 포함)
+    rows_to_append = append_new_rows(
+        ws, data, CONFIG["source"],
+        ['company', 'title', 'location', 'experience', 'url', 'scraped_at', 'status']
+    )
     
     if rows_to_append:
-        ws.append_rows(rows_to_append)
         print(f"💾 {CONFIG['name']} 신규 공고 {len(rows_to_append)}건 저장 완료")
 
 # ==========================================
 # [공통] 실행 메인 루틴
 # ==========================================
-if __name__ == "__main__":
+def main():
     try:
-        ws = get_worksheet()
+        start_cassette(CONFIG["source"])
+        ws = open_resource('sheet', get_worksheet)
         data = scrape_projects()
         update_sheet(ws, data)
     except Exception as e:
         print(f"❌ 실행 중 오류 발생: {e}")
+
+if __name__ == "__main__":
+    from profiler import profiled
+    profiled(f"{CONFIG['source']}-scrape", main)()
@@ -0,0 +1,224 @@
+import json
+import codecs
+from html.parser import HTMLParser
+
+# ==========================================
+# [공통] 상세 페이지 본문 추출 (스트리밍 + 조기 종료)
+# ==========================================
+# 센더는 본문 앞부분(max_text_len자)만 쓰므로 페이지 전체를 받아 디코딩할 필요가 없습니다.
+#   - Content-Type이 HTML이 아니면(PDF, 이미지 등) 본문을 받기 전에 NotHTML로 건너뜀
+#   - 응답을 조각 단위로 받아 바로 파싱하고, 본문 길이가 채워지면 연결을 끊음
+#   - MAX_PAGE_BYTES를 넘는 페이지는 그때까지 받은 부분만 사용
+#
+# 추출 규칙은 이전 BeautifulSoup(html.parser) 방식을 따릅니다: CONFIG["tags"]에 해당하는 요소마다
+# 안쪽 텍스트 전체를 strip 해서, min_text_len보다 긴 것만 여는 태그 순서대로 공백으로 이어 붙임.
+# 닫는 태그는 BeautifulSoup처럼 가장 가까운 같은 요소까지 안쪽 요소를 모두 닫고 (</ul>이 <li>를 닫음),
+# 공백만 있는 텍스트 조각은 줄바꿈이 있으면 "\n", 없으면 " " 하나로 줄입니다 (pre/textarea 제외).
+# 다른 점: script/style/template뿐 아니라 noscript 안의 텍스트도 본문에서 뺍니다
+# (앱 껍데기의 "JavaScript를 켜세요" 문구나 인라인 JSON이 본문 길이를 채우지 않도록).
+#
+# CONFIG에 metadata_min_len이 있으면 <head>의 메타데이터(JSON-LD articleBody/description,
+# og:description 등)를 먼저 읽고, </head>에서 그 길이가 metadata_min_len 이상이면
+# 본문 파싱 없이 메타데이터를 본문으로 씁니다 (스트리밍 중이면 거기서 연결을 끊음).
+
+MAX_PAGE_BYTES = 2 * 1024 * 1024
+CHUNK_BYTES = 16 * 1024
+HTML_TYPES = ("text/html", "application/xhtml+xml")
+SKIP_TAGS = {"script", "style", "noscript", "template"}
+PRESERVE_TAGS = {"pre", "textarea"}
+# 닫는 태그가 없는 요소 (열린 요소 목록에 넣지 않음)
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "keygen", "link", "menuitem",
+             "meta", "param", "source", "track", "wbr", "basefont", "bgsound", "command", "frame",
+             "image", "isindex", "nextid", "spacer"}
+META_KEYS = ("og:description", "twitter:description", "description")
+LD_KEYS = ("articleBody", "description")
+
+
+class NotHTML(Exception):
+    pass
+
+
+class TextCollector(HTMLParser):
+    def __init__(self, config):
+        super().__init__(convert_charrefs=True)
+        self.tags = set(config["tags"])
+        self.min_len = config.get("min_text_len", 10)
+        self.max_len = config.get("max_text_len", 3500)
+        self.stack = []       # (태그, 항목 번호 또는 None) - 아직 닫히지 않은 모든 요소
+        self.open = []        # 항목 번호 - 아직 닫히지 않은 대상 요소
+        self.skipping = 0     # 열려 있는 script/style/noscript/template 수
+        self.pending = []     # 다음 태그가 나올 때까지 모은 텍스트 (조각 경계에서 나뉜 텍스트를 합침)
+        self.buffers = []     # 항목 번호 -> 텍스트 조각 목록
+        self.closed = []      # 항목 번호 -> 닫힘 여부
+        self.kept = []        # 앞에서부터 확정된 항목 텍스트
+        self.kept_len = 0
+        self.next_kept = 0
+        # <head> 메타데이터
+        self.metadata_min = config.get("metadata_min_len")
+        self.head_done = self.metadata_min is None
+        self.metadata = []
+        self.ld_parts = None
+        self.meta_text = None
+
+    def handle_starttag(self, tag, attrs):
+        self._flush()
+        if not self.head_done:
+            self._head_tag(tag, dict(attrs))
+        if tag in VOID_TAGS: return
+        index = None
+        if tag in self.tags and not self.skipping:
+            index = len(self.buffers)
+            self.open.append(index)
+            self.buffers.append([])
+            self.closed.append(False)
+        if tag in SKIP_TAGS: self.skipping += 1
+        self.stack.append((tag, index))
+
+    def handle_endtag(self, tag):
+        self._flush()
+        if not self.head_done:
+            if tag == "script" and self.ld_parts is not None:
+                self._add_json_ld("".join(self.ld_parts))
+                self.ld_parts = None
+            elif tag == "head":
+                self._end_head()
+        if not any(t == tag for t, _ in self.stack): return
+        # 짝이 맞지 않게 열린 안쪽 요소는 함께 닫음
+        while self.stack:
+            t, index = self.stack.pop()
+            if t in SKIP_TAGS: self.skipping -= 1
+            if index is not None:
+                self.open.remove(index)
+                self.closed[index] = True
+            if t == tag: break
+        self._settle()
+
+    def handle_data(self, data):
+        self.pending.append(data)
+
+    def handle_comment(self, data):
+        self._flush()
+
+    def _flush(self):
+        if not self.pending: return
+        data = "".join(self.pending)
+        self.pending = []
+        if self.ld_parts is not None:
+            self.ld_parts.append(data)
+            return
+        if self.skipping or not self.open: return
+        if not data.strip() and not any(t in PRESERVE_TAGS for t, _ in self.stack):
+            data = "\n" if "\n" in data else " "
+        for index in self.open:
+            self.buffers[index].append(data)
+
+    # ---------- <head> 메타데이터 ----------
+    def _head_tag(self, tag, attrs):
+        if tag == "meta":
+            key = (attrs.get("property") or attrs.get("name") or "").lower()
+            if key in META_KEYS: self._add_metadata(attrs.get("content"))
+        elif tag == "script" and (attrs.get("type") or "").lower() == "application/ld+json":
+            self.ld_parts = []
+        elif tag == "body":
+            self._end_head()
+
+    def _add_metadata(self, value):
+        value = " ".join((value or "").split())
+        if value and value not in self.metadata:
+            self.metadata.append(value)
+
+    def _add_json_ld(self, raw):
+        try:
+            payload = json.loads(raw)
+        except ValueError:
+            return
+        stack = [payload]
+        while stack:
+            value = stack.pop()
+            if isinstance(value, list):
+                stack.extend(reversed(value))
+            elif isinstance(value, dict):
+                for key in LD_KEYS:
+                    if isinstance(value.get(key), str): self._add_metadata(value[key])
+                stack.extend(v for v in value.values() if isinstance(v, (dict, list)))
+
+    def _end_head(self):
+        self.head_done = True
+        # 본문 전체(articleBody)가 있으면 가장 앞에 오도록 긴 것부터
+        text = " ".join(sorted(self.metadata, key=len, reverse=True))
+        if len(text) >= self.metadata_min:
+            self.meta_text = text
+
+    # 앞 항목부터 닫힌 순서대로 확정 (바깥 요소가 닫혀야 그 뒤 항목도 확정됨)
+    def _settle(self):
+        while self.next_kept < len(self.buffers) and self.closed[self.next_kept]:
+            text = "".join(self.buffers[self.next_kept]).strip()
+            self.buffers[self.next_kept] = None
+            if len(text) > self.min_len:
+                self.kept.append(text)
+                self.kept_len += len(text) + 1
+            self.next_kept += 1
+
+    @property
+    def full(self):
+        if self.meta_text: return True
+        if self.kept_len > self.max_len: return True
+        # 맨 앞 미확정 항목(예: 본문 전체를 감싼 div)만으로 이미 길이가 넘치면 결과가 정해진 것
+        if self.next_kept < len(self.buffers):
+            pending = "".join(self.buffers[self.next_kept]).lstrip()
+            return self.kept_len + len(pending) > self.max_len
+        return False
+
+    def text(self):
+        if self.meta_text: return self.meta_text[:self.max_len]
+        self._flush()
+        # 문서가 끝났는데 닫히지 않은 요소는 끝에서 닫힌 것으로 봄
+        for index in self.open:
+            self.closed[index] = True
+        self.open, self.stack = [], []
+        self._settle()
+        return " ".join(self.kept)[:self.max_len]
+
+
+def extract_text(html, config):
+    parser = TextCollector(config)
+    # 이미 받은 HTML도 조각 단위로 넣어 본문(또는 메타데이터)이 채워지면 나머지 파싱을 건너뜀
+    for start in range(0, len(html), CHUNK_BYTES):
+        parser.feed(html[start:start + CHUNK_BYTES])
+        if parser.full: break
+    else:
+        parser.close()
+    return parser.text()
+
+
+def _is_html(content_type):
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    # Content-Type이 없으면 HTML로 보고 시도
+    return not content_type or content_type in HTML_TYPES
+
+
+# 응답을 스트리밍으로 읽으며 본문을 추출 (본문이 채워지거나 MAX_PAGE_BYTES에 닿으면 중단)
+def read_text(session, url, config, headers=None):
+    resp = session.get(url, headers=headers, stream=True)
+    try:
+        resp.raise_for_status()
+        content_type = resp.headers.get("Content-Type", "")
+        if not _is_html(content_type):
+            raise NotHTML(f"HTML이 아닌 문서입니다 ({content_type})")
+
+        # charset이 없으면 requests는 ISO-8859-1로 보므로, 헤더에 명시된 경우만 따르고 나머지는 UTF-8
+        encoding = resp.encoding if "charset=" in content_type.lower() else "utf-8"
+        decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+        parser = TextCollector(config)
+        received = 0
+        for chunk in resp.iter_content(chunk_size=CHUNK_BYTES):
+            received += len(chunk)
+            parser.feed(decoder.decode(chunk))
+            if parser.full or received >= config.get("max_page_bytes", MAX_PAGE_BYTES):
+                break
+        else:
+            parser.feed(decoder.decode(b"", final=True))
+            parser.close()
+        return parser.text()
+    finally:
+        resp.close()
@@ -0,0 +1,157 @@
+import os
+import sys
+import json
+import time
+import signal
+import threading
+from collections import Counter
+from datetime import datetime
+from local_state import state_path
+
+# ==========================================
+# [공통] 실행 단위 샘플링 프로파일러
+# ==========================================
+# FLINTSTONING_PROFILE=wall 또는 cpu 로 실행하면 크롤러/센더 진입점을 샘플링 프로파일러로 감싸
+# 실행 리포트와 같은 .flintstoning/reports/ 에 다음 두 파일을 남깁니다.
+#   <source>-<command>-<시각>.<mode>.speedscope.json  : https://www.speedscope.app 에서 여는 플레임그래프
+#   <source>-<command>-<시각>.<mode>.top.txt          : 자체/누적 시간 상위 함수 목록
+#
+#   wall : 별도 스레드가 주기적으로 모든 스레드의 스택을 기록 (네트워크/sleep 등 대기 시간 포함)
+#   cpu  : SIGPROF 타이머로 CPU를 쓰는 동안만 메인 스레드 스택을 기록 (유닉스 전용, 아니면 wall로 대체)
+#
+# flintstoning.py 명령과 각 *_scraper.py / *_sender.py 직접 실행(워크플로) 모두 적용됩니다.
+# 설정이 없으면 진입점을 그대로 돌려주므로 추가 비용이 없습니다.
+
+PROFILE_ENV = "FLINTSTONING_PROFILE"
+INTERVAL = float(os.environ.get("FLINTSTONING_PROFILE_INTERVAL", "0.005"))
+TOP_N = int(os.environ.get("FLINTSTONING_PROFILE_TOP", "20"))
+
+
+def _frame_key(frame):
+    code = frame.f_code
+    return (code.co_name, code.co_filename, code.co_firstlineno)
+
+
+def _stack(frame):
+    stack = []
+    while frame is not None:
+        stack.append(_frame_key(frame))
+        frame = frame.f_back
+    stack.reverse()
+    return tuple(stack)
+
+
+class Sampler:
+    def __init__(self, mode, interval=INTERVAL):
+        self.mode = mode
+        self.interval = interval
+        self.samples = Counter()   # 스택 -> 누적 시간(초)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self.mode == "cpu" and hasattr(signal, "SIGPROF") and threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGPROF, self._on_signal)
+            signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        else:
+            self.mode = "wall"
+            self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+            self._thread.start()
+        self.started = time.time()
+
+    def stop(self):
+        if self._thread:
+            self._stop.set()
+            self._thread.join()
+        else:
+            signal.setitimer(signal.ITIMER_PROF, 0, 0)
+            signal.signal(signal.SIGPROF, signal.SIG_DFL)
+        self.elapsed = time.time() - self.started
+
+    def _on_signal(self, signum, frame):
+        self.samples[_stack(frame)] += self.interval
+
+    def _run(self):
+        me = threading.get_ident()
+        names = {}
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            # 실제로 흐른 시간만큼 가중치 (스케줄링 지연으로 샘플이 덜 잡혀도 합계가 맞도록)
+            now = time.perf_counter()
+            weight, last = now - last, now
+            for ident, frame in sys._current_frames().items():
+                if ident == me: continue
+                if ident not in names:
+                    names[ident] = next((t.name for t in threading.enumerate() if t.ident == ident), str(ident))
+                self.samples[((f"[{names[ident]}]", "", 0),) + _stack(frame)] += weight
+
+    # ---------- 출력 ----------
+    def speedscope(self, name):
+        frames, index = [], {}
+        samples, weights = [], []
+        for stack, seconds in self.samples.items():
+            ids = []
+            for key in stack:
+                if key not in index:
+                    index[key] = len(frames)
+                    frames.append({'name': key[0], 'file': key[1], 'line': key[2]})
+                ids.append(index[key])
+            samples.append(ids)
+            weights.append(round(seconds, 6))
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'name': name,
+            'exporter': 'flintstoning-profiler',
+            'shared': {'frames': frames},
+            'profiles': [{
+                'type': 'sampled', 'name': f"{name} ({self.mode})", 'unit': 'seconds',
+                'startValue': 0, 'endValue': round(sum(weights), 6),
+                'samples': samples, 'weights': weights,
+            }],
+        }
+
+    def hotspots(self, top=TOP_N):
+        own, total = Counter(), Counter()
+        for stack, seconds in self.samples.items():
+            own[stack[-1]] += seconds
+            for key in set(stack):
+                total[key] += seconds
+
+        def label(key):
+            return f"{key[0]} ({os.path.relpath(key[1]) if key[1] else '-'}:{key[2]})"
+
+        lines = [f"mode={self.mode} interval={self.interval}s sampled={sum(self.samples.values()):.1f}s elapsed={self.elapsed:.1f}s", "",
+                 f"[자체 시간 상위 {top}]"]
+        lines += [f"{seconds:9.3f}s  {label(key)}" for key, seconds in own.most_common(top)]
+        lines += ["", f"[누적 시간 상위 {top}]"]
+        lines += [f"{seconds:9.3f}s  {label(key)}" for key, seconds in total.most_common(top)]
+        return "\n".join(lines)
+
+    def write(self, name):
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+        base = state_path("reports", f"{name}-{stamp}.{self.mode}")
+        with open(f"{base}.speedscope.json", "w", encoding="utf-8") as f:
+            json.dump(self.speedscope(name), f)
+        summary = self.hotspots()
+        with open(f"{base}.top.txt", "w", encoding="utf-8") as f:
+            f.write(summary + "\n")
+        print(f"🔥 프로파일 저장: {base}.speedscope.json")
+        print("\n".join(summary.splitlines()[:TOP_N // 2 + 3]))
+
+
+# 진입점을 프로파일러로 감쌈 (FLINTSTONING_PROFILE이 없으면 그대로 반환)
+def profiled(name, entry):
+    mode = os.environ.get(PROFILE_ENV, "")
+    if not mode: return entry
+    if mode not in ("wall", "cpu"):
+        raise Exception(f"{PROFILE_ENV} 값은 wall 또는 cpu 이어야 합니다: {mode}")
+
+    def run(*args, **kwargs):
+        sampler = Sampler(mode)
+        sampler.start()
+        try:
+            return entry(*args, **kwargs)
+        finally:
+            sampler.stop()
+            sampler.write(name)
+    return run
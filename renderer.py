@@ -0,0 +1,68 @@
+import time
+from cassette import pause
+
+# ==========================================
+# [공통] 센더용 헤드리스 렌더링 풀
+# ==========================================
+# requests로 받은 페이지가 JS 앱 껍데기뿐이라 본문이 거의 없을 때만 헤드리스 Chrome으로
+# 다시 렌더링합니다. 드라이버는 첫 렌더링 요청 때 띄워 실행 내내 재사용하고
+# (모든 페이지가 충분하면 Chrome을 아예 띄우지 않음), 실행이 끝나면 close()로 닫습니다.
+# selenium은 여기서만 지연 import 하므로 센더 시작 시간에는 영향이 없습니다.
+
+RENDER_TIMEOUT = 15
+POLL_SEC = 0.5
+DEFAULT_MIN_CONTENT_LEN = 100
+
+
+# [공통] 본문 충분성 검사 (CONFIG의 min_content_len, 없으면 DEFAULT_MIN_CONTENT_LEN자 이상)
+def is_sufficient(text, config):
+    return len((text or '').strip()) >= config.get("min_content_len", DEFAULT_MIN_CONTENT_LEN)
+
+
+class RenderPool:
+    def __init__(self, source, size=1):
+        self.source = source
+        self.size = size
+        self.idle = []
+        self.launched = 0
+
+    def _acquire(self):
+        if self.idle: return self.idle.pop()
+        if self.launched >= self.size:
+            raise Exception(f"렌더링 드라이버 {self.size}개가 모두 사용 중입니다.")
+        from selenium.webdriver.chrome.options import Options
+        from browser import create_driver
+
+        options = Options()
+        options.add_argument("--headless")
+        options.add_argument("--disable-blink-features=AutomationControlled")
+        # 렌더링 결과의 텍스트만 쓰므로 이미지는 받지 않음
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        print("🖥️ 본문이 부족한 페이지가 있어 헤드리스 렌더링 드라이버를 띄웁니다.")
+        driver = create_driver(options, self.source, slot=f"render-{self.launched}")
+        driver.set_page_load_timeout(RENDER_TIMEOUT * 2)
+        self.launched += 1
+        return driver
+
+    # extract(html) 결과가 충분해질 때까지(최대 RENDER_TIMEOUT초) 기다린 뒤 그 텍스트를 반환
+    def render(self, url, extract, config):
+        driver = self._acquire()
+        try:
+            driver.get(url)
+            deadline = time.time() + RENDER_TIMEOUT
+            while True:
+                text = extract(driver.page_source)
+                if is_sufficient(text, config) or time.time() >= deadline:
+                    return text
+                pause(POLL_SEC)
+        finally:
+            self.idle.append(driver)
+
+    def close(self):
+        while self.idle:
+            driver = self.idle.pop()
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        self.launched = 0
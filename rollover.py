@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta
+from sheets import get_spreadsheet, get_worksheet, get_or_create_tab, add_seen_urls, SOURCE_GIDS
+
+# ==========================================
+# [공통] 처리 완료 행 아카이브 (롤오버)
+# ==========================================
+# published/dropped/duplicate 상태이면서 scraped_at이 기준일보다 오래된 행을
+# 월별 아카이브 탭(또는 로컬 Parquet)으로 옮기고 원본 탭에서 삭제합니다.
+# 옮긴 URL은 seen_urls 탭에 남겨 크롤러가 계속 중복으로 인식하도록 합니다.
+# ⚠️ 행 삭제로 행 번호가 바뀌므로 센더가 도는 시간과 겹치지 않게 실행해야 합니다.
+
+TERMINAL_STATUSES = {'published', 'dropped', 'duplicate'}
+DEFAULT_MAX_AGE_DAYS = 30
+
+
+def archive_tab_title(ws, month):
+    return f"{ws.title}_archive_{month}"
+
+
+def parse_date(value):
+    try:
+        return datetime.strptime(value.strip()[:10], "%Y-%m-%d")
+    except ValueError:
+        return None
+
+
+def select_finished_rows(all_v, cutoff):
+    headers = all_v[0]
+    col_map = {name.strip(): i for i, name in enumerate(headers)}
+    finished = []
+    for row_number, row in enumerate(all_v[1:], start=2):
+        cells = row + [''] * (len(headers) - len(row))
+        status = cells[col_map['status']].strip().lower()
+        scraped_at = parse_date(cells[col_map['scraped_at']])
+        if status in TERMINAL_STATUSES and scraped_at and scraped_at < cutoff:
+            finished.append((row_number, cells, scraped_at.strftime("%Y-%m")))
+    return finished
+
+
+def write_to_archive_tabs(spreadsheet, ws, headers, by_month):
+    for month, rows in sorted(by_month.items()):
+        archive_ws = get_or_create_tab(spreadsheet, archive_tab_title(ws, month), headers)
+        archive_ws.append_rows(rows)
+        print(f"  📦 {archive_ws.title}: {len(rows)}건")
+
+
+def write_to_parquet(source, headers, by_month):
+    import os
+    import pandas as pd
+    from local_state import state_path
+
+    for month, rows in sorted(by_month.items()):
+        path = state_path("archive", source, f"{month}.parquet")
+        df = pd.DataFrame(rows, columns=headers)
+        if os.path.exists(path):
+            df = pd.concat([pd.read_parquet(path), df]).drop_duplicates(subset=['url'], keep='last')
+        df.to_parquet(path, index=False, compression='zstd')
+        print(f"  📦 {path}: {len(rows)}건")
+
+
+# 삭제는 아래쪽 행부터 연속 구간 단위로 한 번의 batch_update로 처리
+def delete_rows(spreadsheet, ws, row_numbers):
+    spans = []
+    for r in sorted(row_numbers, reverse=True):
+        if spans and spans[-1][0] == r + 1:
+            spans[-1][0] = r
+        else:
+            spans.append([r, r])
+
+    requests = [{
+        "deleteDimension": {
+            "range": {"sheetId": ws.id, "dimension": "ROWS", "startIndex": start - 1, "endIndex": end}
+        }
+    } for start, end in spans]
+    spreadsheet.batch_update({"requests": requests})
+
+
+def rollover_source(spreadsheet, source, max_age_days, target='sheet', dry_run=False):
+    ws = get_worksheet(SOURCE_GIDS[source], spreadsheet)
+    all_v = ws.get_all_values()
+    if len(all_v) < 2:
+        return print(f"[{source}] 옮길 행 없음")
+
+    headers = all_v[0]
+    cutoff = datetime.now() - timedelta(days=max_age_days)
+    finished = select_finished_rows(all_v, cutoff)
+    if not finished:
+        return print(f"[{source}] 옮길 행 없음")
+
+    print(f"🗄️ [{source}] {len(finished)}건을 '{target}' 아카이브로 옮깁니다 (전체 {len(all_v) - 1}건)")
+    if dry_run: return
+
+    by_month = {}
+    for _, cells, month in finished:
+        by_month.setdefault(month, []).append(cells)
+
+    if target == 'parquet':
+        write_to_parquet(source, headers, by_month)
+    else:
+        write_to_archive_tabs(spreadsheet, ws, headers, by_month)
+
+    url_idx = [h.strip() for h in headers].index('url')
+    add_seen_urls(spreadsheet, source, [cells[url_idx] for _, cells, _ in finished], datetime.now().strftime("%Y-%m-%d"))
+    delete_rows(spreadsheet, ws, [row_number for row_number, _, _ in finished])
+    print(f"✅ [{source}] 원본 탭에서 {len(finished)}건 삭제 완료")
+
+
+def main(sources=None, max_age_days=DEFAULT_MAX_AGE_DAYS, target='sheet', dry_run=False):
+    spreadsheet = get_spreadsheet()
+    for source in sources or SOURCE_GIDS:
+        try:
+            rollover_source(spreadsheet, source, max_age_days, target, dry_run)
+        except Exception as e:
+            print(f"🚨 [{source}] 롤오버 실패: {e}")
+
+
+if __name__ == "__main__":
+    main()
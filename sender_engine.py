@@ -0,0 +1,375 @@
+import os
+import json
+import time
+import random
+from glob import glob
+from collections import Counter
+from datetime import datetime
+from http_client import get_session
+from page_text import extract_text, read_text, NotHTML
+from sheets import get_worksheet, get_pending_rows, get_headers, fetch_rows
+from fingerprint import FingerprintIndex, simhash, content_hash
+from local_state import state_path
+from lease import LeaseManager, LeaseLost, is_claimable
+import handoff
+import content_store
+from renderer import RenderPool, is_sufficient
+from llm_client import LLMClient
+from circuit import CircuitBoard, DependencyError
+from cassette import open_resource, pause, start as start_cassette, active as cassette_active
+
+# =========================================================
+# [공통] 센더 실행 엔진
+# =========================================================
+# 각 *_sender.py 모듈은 CONFIG와 프롬프트/슬랙 블록 생성 함수만 정의하고,
+# 시트 조회 → 페이지 수집 → 적합성 판단 → 요약 → 슬랙 전송 → 상태 갱신의
+# 공통 흐름은 이 엔진이 담당합니다.
+#
+# 센더 모듈이 제공해야 하는 항목:
+#   CONFIG                              : 이름, GID, 수집 태그, 대기 시간 등 설정
+#                                         (summary_schema: 같은 값끼리 지문 인덱스의 판정/요약을 공유)
+#   prepare_row(row)           (선택)   : 시트 행을 표시용 값으로 정리
+#   identity_messages(item, text)       : 적합성 판단용 messages (OpenAI 형식, llm_client.py가 공급자별로 변환)
+#   summary_messages(item, text)        : 요약 생성용 messages
+#   build_blocks(item, gpt_res)         : 슬랙 블록 목록
+
+COL_STATUS = 'status'
+COL_IDENTITY = 'identity_match'
+COL_TITLE = 'title'
+COL_URL = 'url'
+COL_SCRAPED_AT = 'scraped_at'
+
+DEFAULT_ITEM_SEC = 30   # 처리 시간 기록이 없을 때 한 건에 걸린다고 보는 시간 (deadline 판단용)
+
+def default_prepare_row(row):
+    return {'title': row[COL_TITLE], 'url': row[COL_URL], 'row': row}
+
+
+# 본문 텍스트 추출 규칙(지정 태그 중 최소 길이를 넘는 텍스트만 이어 붙임)은 page_text.py에 있음
+def fetch_page(session, url, config):
+    # 공통 브라우저 헤더(User-Agent 등)는 세션에 있고, 소스별 추가 헤더만 덧붙임
+    headers_ua = config.get("request_headers")
+    # 봇 감지 방지 랜덤 대기
+    pause(random.uniform(*config.get("fetch_delay", (3.0, 5.0))))
+    # 본문 앞부분이 채워지면 나머지는 받지 않음
+    return read_text(session, url, config, headers=headers_ua)
+
+
+def ask_json(ctx, messages):
+    ctx['stats']['llm_calls'] += 1
+    # 헤지 요청/장애 전환/JSON 정규화는 llm_client.py가 담당
+    return ctx['circuits']['llm'].call(ctx['llm'].ask_json, messages)
+
+
+# 시트 쓰기 (연속 실패 시 회로 차단)
+def write_cell(ctx, row_index, col_idx, value):
+    ctx['circuits']['sheets'].call(ctx['sheet'].update_cell, row_index, col_idx, value)
+
+
+# 슬랙 전송: 429/5xx는 슬랙 장애로 보고 회로 차단기에 실패로 기록 (그 외 응답은 그대로 돌려줌)
+def post_slack(ctx, blocks):
+    def post():
+        resp = ctx['slack'].post(ctx['webhook_url'], json={"blocks": blocks})
+        if resp.status_code == 429 or resp.status_code >= 500:
+            raise Exception(f"슬랙 응답 {resp.status_code}")
+        return resp
+    return ctx['circuits']['slack'].call(post)
+
+
+def set_status(ctx, row_index, item, status, identity=None, summary=None):
+    # 임대 모드: 다른 워커가 선점을 가져갔으면 그 워커의 결과를 덮어쓰지 않음
+    if ctx['lease']: ctx['lease'].verify(row_index)
+    write_cell(ctx, row_index, ctx['status_col_idx'], status)
+    ctx['stats'][status] += 1
+    if ctx['lease']: ctx['lease'].done(row_index)
+    # 처리 결과를 지문 인덱스에 남겨 이후 동일/유사 항목이 판정과 요약을 재사용하도록 함
+    # (status는 이미 기록됐으므로 지문 기록이 실패해도 행의 상태를 바꾸지 않음)
+    try:
+        ctx['circuits']['sheets'].call(ctx['fingerprints'].add, ctx['config']['source'], item['url'], item['title'],
+                                       item.get('simhash'), identity, status, item.get('content_hash'), summary)
+    except DependencyError as e:
+        print(f"⚠️ 지문 기록 실패 (status '{status}'는 유지): {e}")
+
+
+def process_row(ctx, row_index, item):
+    source, config = ctx['source'], ctx['config']
+
+    # 크롤링 때 미리 받아 둔 본문이 있으면 페이지 요청(과 차단 방지 대기)을 건너뜀
+    truncated_text = content_store.load(item['url'])
+    if truncated_text is not None:
+        ctx['stats']['prefetched'] += 1
+    else:
+        try:
+            truncated_text = fetch_page(ctx['session'], item['url'], config)
+        except NotHTML as e:
+            # PDF/이미지 등은 렌더링해도 본문을 얻을 수 없으므로 LLM 호출 없이 실패 처리
+            print(f"📄 {e} → LLM 호출 없이 failed 처리")
+            ctx['stats']['empty'] += 1
+            set_status(ctx, row_index, item, 'failed')
+            return
+
+    # JS로 본문을 그리는 페이지는 앱 껍데기만 받아지므로, 본문이 부족할 때만 헤드리스로 다시 렌더링
+    if not is_sufficient(truncated_text, config):
+        print(f"🖥️ 본문 부족({len(truncated_text)}자) → 헤드리스 렌더링으로 재수집")
+        ctx['stats']['rendered'] += 1
+        rendered = ctx['renderer'].render(item['url'], lambda html: extract_text(html, config), config)
+        truncated_text = max(truncated_text, rendered, key=len)
+        if is_sufficient(truncated_text, config):
+            content_store.save(item['url'], truncated_text)
+
+    # 렌더링 후에도 본문이 부족하면 LLM을 부르지 않고 status를 그대로 둠 ('failed'는 다시 시도되지 않으므로,
+    # 기준 길이보다 짧은 글이나 일시적으로 덜 그려진 페이지는 다음 실행에서 다시 수집)
+    if not is_sufficient(truncated_text, config):
+        print(f"🈳 렌더링 후에도 본문 부족({len(truncated_text)}자) → 다음 실행에서 다시 시도")
+        ctx['stats']['empty'] += 1
+        return
+
+    item['content_hash'] = content_hash(truncated_text)
+    item['simhash'] = simhash(f"{item['title']} {truncated_text}")
+
+    # 0-1. [동일 본문 확인] URL만 바뀌어 다시 올라온 글이면 판정과 요약을 그대로 물려받음
+    prior = ctx['fingerprints'].find_exact(item['content_hash'])
+    gpt_res = None
+
+    if prior:
+        ctx['stats']['short_circuited'] += 1
+        print(f"⚡ 동일 본문 발견: [{prior['source']}] {prior['title']} → 판정/요약 재사용")
+        if prior.get('summary'):
+            gpt_res = json.loads(prior['summary'])
+    else:
+        # 0-2. [유사 중복 확인] 다른 소스/URL로 이미 처리된 글이면 판정을 재사용
+        prior = ctx['fingerprints'].find_near_duplicate(item['simhash'], exclude_url=item['url'])
+        if prior:
+            ctx['stats']['near_duplicates'] += 1
+            print(f"♻️ 유사 항목 발견: [{prior['source']}] {prior['title']} → 판정 재사용")
+
+    if prior:
+        is_appropriate = prior['identity_match'] == 'TRUE'
+    else:
+        # 1. [적합성 판단]
+        judgment = ask_json(ctx, source.identity_messages(item, truncated_text))
+        is_appropriate = judgment.get("is_appropriate", False)
+
+    identity = str(is_appropriate).upper()
+
+    # identity_match 업데이트
+    pause(config.get("identity_delay", 0))
+    write_cell(ctx, row_index, ctx['identity_col_idx'], identity)
+
+    # 부적합 시 status를 'dropped'로 변경하고 다음 행으로 이동
+    if not is_appropriate:
+        if not prior:
+            print(f"⚠️ 부적합 판정: {judgment.get('reason', 'status를 dropped로 변경합니다.')}")
+        set_status(ctx, row_index, item, 'dropped', identity)
+        return
+
+    # 이미 슬랙에 올라간 글이면 전송하지 않고 'duplicate'로 표시
+    # (이전 항목이 'duplicate'였다면 그 원본이 이미 전송된 것)
+    if prior and prior['status'] in ('published', 'duplicate'):
+        print("⏭️ 이미 전송된 글과 같은 내용이라 슬랙 전송을 건너뜁니다.")
+        set_status(ctx, row_index, item, 'duplicate', identity, gpt_res)
+        return
+
+    # 2. [요약 생성]
+    if gpt_res is None:
+        gpt_res = ask_json(ctx, source.summary_messages(item, truncated_text))
+
+    # 3. [슬랙 전송] (임대 모드에서는 선점이 그대로일 때만 전송)
+    if ctx['lease']: ctx['lease'].verify(row_index)
+    slack_resp = post_slack(ctx, source.build_blocks(item, gpt_res))
+
+    if slack_resp.status_code == 200:
+        print(f"✅ 전송 성공: {item.get('display_title', item['title'])}")
+        pause(config.get("published_delay", 0))
+        set_status(ctx, row_index, item, 'published', identity, gpt_res)
+    else:
+        print(f"❌ 슬랙 전송 실패: {slack_resp.status_code}")
+        if config.get("mark_failed_on_slack_error", True):
+            set_status(ctx, row_index, item, 'failed', identity, gpt_res)
+
+    pause(config.get("post_delay", 1))
+
+
+# [공통] 실행 결과 리포트 (콘솔 출력 + .flintstoning/reports/ 에 JSON 저장, 카세트 재생 중에는 콘솔만)
+def write_report(config, stats, started_at):
+    report = dict(stats, source=config['source'], started_at=started_at.isoformat(timespec="seconds"),
+                  elapsed_sec=round((datetime.now() - started_at).total_seconds(), 1))
+    print(f"📋 [{config['name']}] 처리 {stats['processed']}건 | 게시 {stats['published']} | 제외 {stats['dropped']} | "
+          f"중복 {stats['duplicate']} | 실패 {stats['failed'] + stats['errors']} | "
+          f"동일 본문 재사용 {stats['short_circuited']} | 유사 항목 {stats['near_duplicates']} | LLM 호출 {stats['llm_calls']} (헤지 {stats['llm_hedged']}, 전환 {stats['llm_failover']}) | "
+          f"이월 {stats['deferred']} | 선수집 본문 {stats['prefetched']} | 렌더링 {stats['rendered']} | 본문 없음 {stats['empty']}")
+
+    # 카세트 재생은 녹화본을 다시 돌린 것이므로 acceptance_rate 집계에서 빠지도록 저장하지 않음
+    if cassette_active() and cassette_active().replaying: return None
+    path = state_path("reports", f"{config['source']}-{started_at.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return path
+
+
+# [공통] 최근 리포트 기준 소스별 적합 판정 비율 (게시 / (게시 + 제외))
+def acceptance_rate(source_name, recent=30):
+    paths = sorted(glob(state_path("reports", f"{source_name}-[0-9]*.json")))[-recent:]
+    published = dropped = 0
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            report = json.load(f)
+        published += report.get('published', 0)
+        dropped += report.get('dropped', 0)
+    return published / (published + dropped) if published + dropped else 0.0
+
+
+# [공통] 최신 항목 우선: scraped_at 내림차순 (같은 날짜는 시트 순서 유지, 값이 없으면 뒤로)
+def by_freshness(rows):
+    return sorted(rows, key=lambda r: r[1].get(COL_SCRAPED_AT, ''), reverse=True)
+
+
+# 최근 처리 시간 평균으로 다음 한 건을 deadline 전에 끝낼 수 있는지 판단
+def out_of_time(deadline, durations):
+    if deadline is None: return False
+    recent = durations[-10:]
+    estimate = sum(recent) / len(recent) if recent else DEFAULT_ITEM_SEC
+    return time.time() + estimate > deadline
+
+
+# [공통] 임대 모드: 배치 단위로 행을 선점해 가며 처리할 행을 하나씩 내보냄
+def leased_rows(sheet, headers, lease):
+    while True:
+        owned = lease.claim_batch()
+        if not owned: return
+        for row_index, row in fetch_rows(sheet, headers, owned):
+            yield row_index, row
+
+
+# [공통] queue 모드: 크롤러가 방금 추가한 행만 읽어 처리 (탭 전체를 훑지 않음)
+# 큐에 적힌 뒤 행이 옮겨졌을 수 있으므로 url과 status가 그대로인 행만 처리
+def queued_rows(sheet, headers, source):
+    pending = handoff.drain(source)
+    rows = fetch_rows(sheet, headers, list(pending))
+    return [(row_index, row) for row_index, row in rows
+            if row.get(COL_URL) == pending[row_index] and is_claimable(row.get(COL_STATUS, ''))]
+
+
+# lease: None이면 단일 프로세스 모드, dict이면 임대 모드 (worker, lease_sec, batch)
+# queue: True이면 크롤러가 큐에 남긴 새 행만 처리
+# deadline: 이 시각(epoch초)까지 끝낼 수 없는 항목은 시작하지 않고 다음 실행으로 넘김
+def run_sender(source, lease=None, queue=False, deadline=None):
+    config = source.CONFIG
+    prepare_row = getattr(source, 'prepare_row', default_prepare_row)
+    stats = Counter()
+    started_at = datetime.now()
+    lease_manager = None
+    # 본문이 부족한 페이지가 나올 때만 드라이버를 띄우는 공유 렌더링 풀
+    renderer = RenderPool(config['source'])
+    circuits = CircuitBoard()
+
+    try:
+        print(f"--- [{config['name']}] 전체 자동화 프로세스를 시작합니다 ---")
+
+        # FLINTSTONING_CASSETTE가 있으면 외부 I/O를 녹화하거나 녹화본으로 재생
+        tape = start_cassette(config['source'])
+        sheet = open_resource('sheet', lambda: get_worksheet(config["gid"]))
+        headers = get_headers(sheet)
+        status_col_idx = headers.index(COL_STATUS) + 1
+
+        if queue:
+            target_rows = queued_rows(sheet, headers, config['source'])
+            if not target_rows:
+                print(f"ℹ️ 큐에 새로 추가된 {config['item_label']} 없음")
+                return
+            target_rows = by_freshness(target_rows)
+            print(f"큐에서 새로 추가된 {len(target_rows)}건의 {config['item_label']} 처리를 시작합니다.")
+        elif lease is not None:
+            # 여러 러너가 같은 탭을 나눠 처리: 선점한 행만 처리
+            lease_manager = LeaseManager(sheet, status_col_idx, **lease)
+            print(f"[{lease_manager.worker}] {lease_manager.batch}건씩 선점하며 {config['item_label']} 처리를 시작합니다.")
+            target_rows = leased_rows(sheet, headers, lease_manager)
+        else:
+            # status 컬럼만 읽어 'archived'(또는 임대가 만료된) 행만 가져옵니다 (전체 시트 로드 없음)
+            headers, target_rows = get_pending_rows(sheet, match=is_claimable)
+
+            if not target_rows:
+                print(f"ℹ️ 처리할 'archived' 상태의 {config['item_label']} 없음")
+                return
+
+            # 시간이 모자라 중단되더라도 가장 최근에 수집된 항목부터 처리되도록 정렬
+            target_rows = by_freshness(target_rows)
+            print(f"총 {len(target_rows)}건의 {config['item_label']} 처리를 시작합니다.")
+
+        ctx = {
+            'source': source,
+            'config': config,
+            'sheet': sheet,
+            'identity_col_idx': headers.index(COL_IDENTITY) + 1,
+            'status_col_idx': status_col_idx,
+            'llm': open_resource('llm', lambda: LLMClient(stats=stats)),
+            # 재생 중에는 실제 전송이 없으므로 웹훅 주소가 필요 없음
+            'webhook_url': '' if tape and tape.replaying else os.environ['SLACK_WEBHOOK_URL'],
+            # 페이지 수집과 슬랙 전송이 같은 커넥션 풀을 공유 (http_client.py)
+            'session': open_resource('http', get_session),
+            'slack': open_resource('slack', get_session),
+            # 모든 센더가 공유하는 유사 중복 지문 인덱스
+            'fingerprints': FingerprintIndex.load(sheet.spreadsheet, config['source'], config.get('summary_schema')),
+            'stats': stats,
+            'lease': lease_manager,
+            # 의존성별 회로 차단기 (이전 센더/실행의 상태를 이어받음)
+            'circuits': circuits,
+            'renderer': renderer,
+        }
+
+        # 메인 루프: 모든 'archived' 행을 끝까지 순회합니다.
+        durations = []
+        for position, (row_index, row) in enumerate(target_rows):
+            if out_of_time(deadline, durations):
+                if isinstance(target_rows, list):
+                    stats['deferred'] = len(target_rows) - position
+                print(f"\n⏰ 시간 예산이 부족해 남은 {config['item_label']} 처리를 다음 실행으로 넘깁니다.")
+                break
+
+            # 외부 서비스 장애로 회로가 열려 있으면 남은 행은 'archived' 그대로 두고 종료
+            blocked = circuits.blocked()
+            if blocked:
+                if isinstance(target_rows, list):
+                    stats['deferred'] = len(target_rows) - position
+                stats['circuit_open'] = 1
+                print(f"\n🚫 {', '.join(blocked)} 장애로 남은 {config['item_label']}은 다음 실행에서 처리합니다.")
+                break
+
+            item_started = time.time()
+            item = prepare_row(row)
+            print(f"\n🔍 {row_index}행 검토 중: {item['title']}")
+
+            stats['processed'] += 1
+            if lease_manager: lease_manager.renew_if_needed()
+            try:
+                process_row(ctx, row_index, item)
+            except LeaseLost as e:
+                stats['lease_lost'] += 1
+                print(f"🔓 {e} → 이 행은 건너뜁니다.")
+            except DependencyError as e:
+                # 외부 서비스 문제이므로 행은 'failed'로 바꾸지 않고 다음 실행에서 다시 처리
+                stats['errors'] += 1
+                print(f"❌ {row_index}행 처리 오류: {e}")
+                if "429" in str(e) and config.get("rate_limit_wait") and not circuits.blocked(): # 할당량 초과 시 대기
+                    pause(config["rate_limit_wait"])
+            except Exception as e:
+                stats['errors'] += 1
+                print(f"❌ {row_index}행 처리 오류: {e}")
+                if config.get("mark_failed_on_error", False):
+                    try:
+                        set_status(ctx, row_index, item, 'failed')
+                    except (LeaseLost, DependencyError) as status_error:
+                        print(f"⚠️ {row_index}행 failed 기록 실패: {status_error}")
+            finally:
+                # 최종 status를 쓰지 못한 행은 선점을 풀어 다음 실행/다른 워커가 처리하도록 함
+                if lease_manager: lease_manager.release(row_index)
+                durations.append(time.time() - item_started)
+
+        write_report(config, stats, started_at)
+
+    except Exception as e:
+        print(f"❌ 치명적 오류: {e}")
+    finally:
+        if lease_manager: lease_manager.release_all()
+        renderer.close()
+        print(f"--- [{config['name']}] 모든 프로세스가 종료되었습니다 ---")
@@ -0,0 +1,223 @@
+import os
+import json
+from gspread.utils import rowcol_to_a1
+import handoff
+import content_store
+from url_utils import canonicalize, url_key
+from local_state import state_path
+from cassette import active as cassette_active
+
+# ==========================================
+# [공통] 시트 행 선택 로직
+# ==========================================
+# 전체 시트를 get_all_values()로 읽지 않고, status 컬럼만 읽어
+# 대기 중인 행 번호를 계산한 뒤 해당 행의 셀만 batch_get으로 가져옵니다.
+# → 읽기 비용이 시트 누적 행 수가 아니라 대기 행 수에 비례합니다.
+
+COL_STATUS = 'status'
+BATCH_GET_RANGES = 100  # 한 번의 batch_get 요청에 담을 최대 범위 수 (URL 길이 제한 대비)
+
+
+def get_headers(sheet):
+    return [h.strip() for h in sheet.row_values(1)]
+
+
+# match를 주면 status 값 대신 match(value)가 참인 행을 고릅니다.
+def find_rows_by_status(sheet, headers, status='archived', match=None):
+    if COL_STATUS not in headers:
+        raise Exception(f"'{COL_STATUS}' 컬럼을 찾을 수 없습니다.")
+    match = match or (lambda v: v.strip().lower() == status)
+    status_values = sheet.col_values(headers.index(COL_STATUS) + 1)
+    # 1행은 헤더이므로 제외, 시트 행 번호는 1부터 시작
+    return [i + 1 for i, v in enumerate(status_values) if i > 0 and match(v)]
+
+
+def _merge_ranges(row_numbers):
+    # 연속된 행 번호는 하나의 범위로 묶어 요청 범위 수를 줄입니다.
+    spans = []
+    for r in sorted(row_numbers):
+        if spans and spans[-1][1] == r - 1:
+            spans[-1][1] = r
+        else:
+            spans.append([r, r])
+    return spans
+
+
+def fetch_rows(sheet, headers, row_numbers):
+    if not row_numbers: return []
+    last_col = len(headers)
+    spans = _merge_ranges(row_numbers)
+    rows = []
+
+    for i in range(0, len(spans), BATCH_GET_RANGES):
+        chunk = spans[i:i + BATCH_GET_RANGES]
+        ranges = [f"{rowcol_to_a1(start, 1)}:{rowcol_to_a1(end, last_col)}" for start, end in chunk]
+        results = sheet.batch_get(ranges)
+
+        for (start, end), values in zip(chunk, results):
+            for offset in range(end - start + 1):
+                row_number = start + offset
+                cells = list(values[offset]) if offset < len(values) else []
+                cells += [''] * (last_col - len(cells))
+                rows.append((row_number, dict(zip(headers, cells))))
+    return rows
+
+
+# status가 일치하는 행만 (시트 행 번호, {헤더: 값}) 목록으로 반환합니다.
+def get_pending_rows(sheet, status='archived', match=None):
+    headers = get_headers(sheet)
+    row_numbers = find_rows_by_status(sheet, headers, status, match)
+    return headers, fetch_rows(sheet, headers, row_numbers)
+
+
+# ==========================================
+# [공통] 구글 스프레드시트 연결 로직
+# ==========================================
+SPREADSHEET_URL = "https://docs.google.com/spreadsheets/d/1nKPVCZ6zAOfpqCjV6WfjkzCI55FA9r2yvi9XL3iIneo/edit"
+
+
+def get_spreadsheet():
+    import os, json
+    import gspread
+    from oauth2client.service_account import ServiceAccountCredentials
+
+    if 'GOOGLE_CREDENTIALS' not in os.environ:
+        raise Exception("환경변수 GOOGLE_CREDENTIALS가 설정되지 않았습니다.")
+
+    scope = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
+    creds_dict = json.loads(os.environ['GOOGLE_CREDENTIALS'])
+    creds = ServiceAccountCredentials.from_json_keyfile_dict(creds_dict, scope)
+    client = gspread.authorize(creds)
+    return client.open_by_url(SPREADSHEET_URL)
+
+
+# 순서가 바뀌어도 GID로 탭을 찾음
+def get_worksheet(gid, spreadsheet=None):
+    spreadsheet = spreadsheet or get_spreadsheet()
+    sheet = next((s for s in spreadsheet.worksheets() if str(s.id) == str(gid)), None)
+    if not sheet: raise Exception(f"GID가 {gid}인 워크시트를 찾을 수 없습니다.")
+    return sheet
+
+
+# 소스별 탭 GID
+SOURCE_GIDS = {
+    "letspl": 1669656972,
+    "mix": 981623942,
+    "surfit": 2112710663,
+    "side": 1818966683,
+    "offercent": 639559541,
+}
+
+
+def get_or_create_tab(spreadsheet, title, headers):
+    import gspread
+    try:
+        return spreadsheet.worksheet(title)
+    except gspread.WorksheetNotFound:
+        ws = spreadsheet.add_worksheet(title=title, rows=1000, cols=max(len(headers), 1))
+        ws.append_row(headers)
+        return ws
+
+
+# ==========================================
+# [공통] 중복 방지 인덱스 (seen_urls 탭)
+# ==========================================
+# 아카이브로 옮겨져 원본 탭에서 사라진 URL도 '이미 본 URL'로 취급하기 위해
+# (source, url, archived_at)을 별도 탭에 남겨 둡니다.
+#
+# 탭은 롤오버 때마다 추가만 되므로, 읽은 결과를 .flintstoning/seen/<source>.json 에
+# (읽은 행 수, 마지막 행, 이 소스의 URL)로 남기고 다음 실행은 마지막으로 읽은 행부터만
+# batch_get 합니다 (그 행이 달라졌으면 전체를 다시 읽음). 카세트 녹화/재생 중에는 항상 전체를 읽습니다.
+SEEN_TAB = "seen_urls"
+SEEN_HEADERS = ['source', 'url', 'archived_at']
+
+
+def _seen_cache_file(source):
+    return state_path("seen", f"{source}.json")
+
+
+def _load_seen_cache(source):
+    path = _seen_cache_file(source)
+    if cassette_active() or not os.path.exists(path): return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _seen_row(row):
+    return list(row) + [''] * (len(SEEN_HEADERS) - len(row))
+
+
+def load_seen_urls(spreadsheet, source):
+    ws = get_or_create_tab(spreadsheet, SEEN_TAB, SEEN_HEADERS)
+    cache, new = _load_seen_cache(source), None
+    if cache and cache.get('rows'):
+        # 캐시의 마지막 행 = 시트의 rows + 1 행
+        values = ws.batch_get([f"A{cache['rows'] + 1}:C"])[0]
+        if values and _seen_row(values[0]) == cache['last']:
+            new, urls, base, last = values[1:], cache['urls'], cache['rows'], cache['last']
+        else:
+            print("  ↺ seen_urls 탭이 바뀌어 전체를 다시 읽습니다.")
+    if new is None:
+        new, urls, base, last = ws.batch_get(['A2:C'])[0], [], 0, None
+
+    urls = urls + [row[1] for row in new if len(row) > 1 and row[0] == source]
+    if not cassette_active():
+        with open(_seen_cache_file(source), "w", encoding="utf-8") as f:
+            json.dump({'rows': base + len(new), 'last': _seen_row(new[-1]) if new else last, 'urls': urls},
+                      f, ensure_ascii=False)
+    return set(urls)
+
+
+def add_seen_urls(spreadsheet, source, urls, archived_at):
+    if not urls: return
+    ws = get_or_create_tab(spreadsheet, SEEN_TAB, SEEN_HEADERS)
+    ws.append_rows([[source, url, archived_at] for url in urls])
+
+
+# ==========================================
+# [공통] 스마트 저장 (헤더 이름 기준)
+# ==========================================
+# 헤더 행과 url 컬럼만 읽어 중복을 거르고, 새 행만 'archived' 상태로 추가합니다.
+# URL은 소스별 규칙으로 정규화한 키로 비교하고, 정규화한 형태로 저장합니다 (url_utils.py).
+
+
+# 탭의 url 컬럼과 중복 방지 인덱스에 있는 주소의 정규화 키
+def existing_url_keys(ws, source, headers=None):
+    headers = headers or ws.row_values(1)
+    url_values = ws.col_values(headers.index('url') + 1)[1:]
+    keys = {url_key(u, source) for u in url_values if u}
+    return keys | {url_key(u, source) for u in load_seen_urls(ws.spreadsheet, source)}
+
+
+def append_new_rows(ws, data, source, default_headers):
+    normalize = lambda u: url_key(u, source)
+    headers = ws.row_values(1) or default_headers
+    col_map = {name: i for i, name in enumerate(headers)}
+    if 'url' not in col_map:
+        print("❌ 'url' 컬럼을 찾을 수 없습니다.")
+        return []
+
+    existing_urls = existing_url_keys(ws, source, headers)
+
+    rows = []
+    for item in data:
+        if normalize(item['url']) in existing_urls: continue
+        row = [''] * len(headers)
+        for k, v in item.items():
+            if k in col_map: row[col_map[k]] = canonicalize(v, source) if k == 'url' else v
+        if 'status' in col_map: row[col_map['status']] = 'archived'
+        rows.append(row)
+        existing_urls.add(normalize(item['url']))
+
+    if rows:
+        response = ws.append_rows(rows)
+        # 추가된 행 범위를 센더 큐에 남김 (queue 모드 센더가 탭 전체를 훑지 않고 바로 처리)
+        urls = [row[col_map['url']] for row in rows]
+        handoff.emit(source, response, urls)
+        # FLINTSTONING_PREFETCH=1 이면 새 행의 상세 페이지 본문을 미리 받아 둠 (content_store.py)
+        if content_store.prefetch_enabled():
+            content_store.prefetch(source, urls)
+    return rows
@@ -1,17 +1,24 @@
-import os, time, json, re
+import os, json, re
 import gspread
 from datetime import datetime
 from oauth2client.service_account import ServiceAccountCredentials
-from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from sheets import append_new_rows
+from browser import create_driver, fan_out, paged
+from cassette import open_resource, pause, start as start_cassette
 
 # [설정] 이 파일 전용 정보
 CONFIG = {
     "name": "사이드프로젝트",
-    "url": "https://sideproject.co.kr/projects",
+    "source": "side",
+    "urls": ["https://sideproject.co.kr/projects"],
+    # 게시판 1~pages 페이지를 차례로 수집 (page_param으로 페이지 번호 전달, 사이트가
+    # 파라미터를 무시해 같은 목록이 나오면 2페이지에서 멈춤 - browser.fan_out)
+    "pages": 3,
+    "page_param": "page",
     "gid": "1818966683" # 탭 고유 번호
 }
 
@@ -27,7 +34,7 @@ def get_worksheet():
     if not sheet: raise Exception(f"{CONFIG['gid']} 시트를 못 찾았습니다.")
     return sheet
 
-def get_driver():
+def get_driver(slot=0):
     options = Options()
     # 1. 필수 보안/성능 옵션
     options.add_argument("--headless=new") # 최신 헤드리스 모드 사용
@@ -42,29 +49,25 @@ def get_driver():
     options.add_experimental_option("excludeSwitches", ["enable-automation"])
     options.add_experimental_option("useAutomationExtension", False)
     
-    driver = webdriver.Chrome(options=options)
-    
     # 3. 브라우저 지문 변조
-    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
-        "source": """
+    return create_driver(options, CONFIG["source"], slot=slot, stealth="""
             Object.defineProperty(navigator, 'webdriver', {get: () => undefined});
             window.chrome = { runtime: {} };
             Object.defineProperty(navigator, 'languages', {get: () => ['ko-KR', 'ko', 'en-US', 'en']});
-        """
-    })
-    return driver
+        """)
 
 # [전용] 데이터 수집
-def scrape_projects():
-    driver = get_driver()
+# 목록 주소 하나를 수집 (slot: 병렬 수집 시 드라이버 프로필 번호)
+def scrape_listing(url, slot=0):
+    driver = get_driver(slot)
     new_data = []
     today = datetime.now().strftime("%Y-%m-%d")
     regions = ["서울", "경기", "인천", "대전", "대구", "부산", "광주", "울산", "세종", "강원", "충북", "충남", "전북", "전남", "경북", "경남", "제주", "온라인"]
 
     try:
-        driver.get(CONFIG["url"])
+        driver.get(url)
         WebDriverWait(driver, 30).until(EC.presence_of_element_located((By.TAG_NAME, "a")))
-        time.sleep(5)
+        pause(5)
         
         for elem in driver.find_elements(By.TAG_NAME, "a"):
             href = elem.get_attribute("href")
@@ -89,24 +92,25 @@ def scrape_projects():
         driver.quit()
     return new_data
 
+
+# CONFIG["urls"]의 목록 주소들을 동시에 수집해 하나로 합침
+def scrape_projects():
+    targets = paged(CONFIG["urls"], CONFIG["pages"], CONFIG["page_param"])
+    data = fan_out(targets, scrape_listing)
+    print(f"📦 {len(targets)}개 목록에서 총 {len(data)}건 (중복 제거 후)")
+    return data
+
 # [공통] 스마트 저장 (헤더 이름 기준)
 def update_sheet(ws, data):
     if not data: return print(f"[{CONFIG['name']}] 새 공고 없음")
-    all_v = ws.get_all_values()
-    headers = all_v[0] if all_v else ['title', 'url', 'scraped_at', 'status', 'location']
-    col_map = {name: i for i, name in enumerate(headers)}
-    existing_urls = {row[col_map['url']] for row in all_v[1:] if len(row) > col_map['url']}
-    
-    rows = []
-    for item in data:
-        if item['url'] in existing_urls: continue
-        row = [''] * len(headers)
-        for k, v in item.items():
-            if k in col_map: row[col_map[k]] = v
-        if 'status' in col_map: row[col_map['status']] = 'archived'
-        rows.append(row)
-    
-    if rows: ws.append_rows(rows); print(f"💾 {CONFIG['name']} {len(rows)}건 저장")
+    # 헤더와 url 컬럼, 중복 방지 인덱스만 읽어 새 행을 추가합니다.
+    rows = append_new_rows(ws, data, CONFIG["source"], ['title', 'url', 'scraped_at', 'status', 'location'])
+    if rows: print(f"💾 {CONFIG['name']} {len(rows)}건 저장")
+
+def main():
+    start_cassette(CONFIG["source"])
+    ws = open_resource('sheet', get_worksheet); data = scrape_projects(); update_sheet(ws, data)
 
 if __name__ == "__main__":
-    ws = get_worksheet(); data = scrape_projects(); update_sheet(ws, data)
+    from profiler import profiled
+    profiled(f"{CONFIG['source']}-scrape", main)()
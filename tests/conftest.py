@@ -0,0 +1,9 @@
+import os
+import sys
+import tempfile
+
+# 저장소 루트의 모듈(llm_client.py 등)을 그대로 import
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 테스트가 남기는 로컬 상태(.flintstoning)는 임시 디렉터리에 (local_state는 import 시점에 경로를 정함)
+os.environ.setdefault("FLINTSTONING_HOME", tempfile.mkdtemp(prefix="flintstoning-test-"))
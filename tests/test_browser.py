@@ -0,0 +1,45 @@
+from browser import paged, fan_out
+
+# ==========================================
+# 페이지 묶음 수집: 페이지 파라미터를 무시하는 사이트에서 일찍 멈추는지 확인
+# ==========================================
+LISTINGS = ["https://example.com/list?f=1", "https://example.com/other"]
+
+
+def test_paged_builds_page_chains():
+    chains = paged(LISTINGS, 3)
+    assert chains[0] == ["https://example.com/list?f=1", "https://example.com/list?f=1&page=2",
+                         "https://example.com/list?f=1&page=3"]
+    assert paged(LISTINGS) == [[url] for url in LISTINGS]
+
+
+def test_ignored_page_param_stops_after_one_extra_fetch():
+    calls = []
+
+    def scrape(url, slot):
+        calls.append(url)
+        return [{'url': 'a'}, {'url': 'b'}]
+
+    rows = fan_out(paged(LISTINGS, 3), scrape)
+    assert sorted(calls) == sorted(LISTINGS + [url + ("&" if "?" in url else "?") + "page=2" for url in LISTINGS])
+    assert [r['url'] for r in rows] == ['a', 'b']
+
+
+def test_distinct_pages_are_all_fetched_and_merged_in_order():
+    chains = paged(LISTINGS, 3)
+    rows = fan_out(chains, lambda url, slot: [{'url': url}])
+    assert [r['url'] for r in rows] == [url for chain in chains for url in chain]
+
+
+def test_empty_or_failed_page_ends_chain():
+    def scrape(url, slot):
+        if "other" in url: raise Exception("boom")
+        return [] if "page=2" in url else [{'url': url}]
+
+    rows = fan_out(paged(LISTINGS, 3), scrape)
+    assert [r['url'] for r in rows] == ["https://example.com/list?f=1"]
+
+
+def test_plain_targets_still_supported():
+    rows = fan_out(["u1", "u2", "u1"], lambda url, slot: [{'url': url}])
+    assert [r['url'] for r in rows] == ['u1', 'u2']
@@ -0,0 +1,47 @@
+from datetime import datetime
+
+import pytest
+import requests
+
+import cassette
+import sender_engine
+
+# ==========================================
+# 재생 응답이 requests.Response처럼 동작하는지, 재생 실행이 리포트를 남기지 않는지 확인
+# ==========================================
+
+
+def _response(status_code=200):
+    return cassette.ReplayResponse({'status_code': status_code, 'headers': {'Content-Type': 'text/html'},
+                                    'url': 'https://example.com/a', 'text': '<p>hi</p>'})
+
+
+def _cassette(mode):
+    active = cassette.Cassette.__new__(cassette.Cassette)
+    active.mode = mode
+    return active
+
+
+def test_replay_headers_are_case_insensitive():
+    assert _response().headers['content-type'] == 'text/html'
+
+
+def test_replay_raise_for_status_raises_http_error():
+    _response(200).raise_for_status()
+    with pytest.raises(requests.HTTPError) as error:
+        _response(404).raise_for_status()
+    assert error.value.response.status_code == 404
+
+
+def test_replay_run_does_not_write_report(tmp_path, monkeypatch):
+    monkeypatch.setattr(sender_engine, 'state_path', lambda *parts: str(tmp_path.joinpath(*parts)))
+    config = {'source': 'letspl', 'name': 'Letspl Sender'}
+    stats = sender_engine.Counter()
+
+    monkeypatch.setattr(cassette, '_active', _cassette('record'))
+    (tmp_path / 'reports').mkdir()
+    assert sender_engine.write_report(config, stats, datetime.now())
+
+    monkeypatch.setattr(cassette, '_active', _cassette('replay'))
+    assert sender_engine.write_report(config, stats, datetime.now()) is None
+    assert len(list((tmp_path / 'reports').iterdir())) == 1
@@ -0,0 +1,219 @@
+import re
+from types import SimpleNamespace
+
+import pytest
+
+import circuit
+import sender_engine
+from circuit import CircuitBoard, DependencyError
+
+# ==========================================
+# 회로 차단기 상태 전이와, 장애 중 센더가 행을 확정하지 않는지 확인
+# ==========================================
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(circuit.time, 'time', clock)
+    monkeypatch.setattr(circuit, 'THRESHOLD', 3)
+    monkeypatch.setattr(circuit, 'COOLDOWN_SEC', 300)
+    return clock
+
+
+@pytest.fixture
+def board(tmp_path, clock):
+    return CircuitBoard(str(tmp_path / "circuits.json"))
+
+
+def fail():
+    raise Exception("503")
+
+
+def trip(breaker):
+    for _ in range(circuit.THRESHOLD):
+        with pytest.raises(DependencyError):
+            breaker.call(fail)
+
+
+def test_opens_after_threshold_consecutive_failures(board):
+    breaker = board['llm']
+    for _ in range(circuit.THRESHOLD - 1):
+        with pytest.raises(DependencyError):
+            breaker.call(fail)
+    assert breaker.state == "closed" and board.blocked() == []
+
+    with pytest.raises(DependencyError) as error:
+        breaker.call(fail)
+    assert error.value.name == "llm"
+    assert breaker.state == "open" and board.blocked() == ["llm"]
+
+
+def test_success_resets_failure_count(board):
+    breaker = board['slack']
+    for _ in range(circuit.THRESHOLD - 1):
+        with pytest.raises(DependencyError):
+            breaker.call(fail)
+    assert breaker.call(lambda: "ok") == "ok"
+    assert breaker.failures == 0
+    with pytest.raises(DependencyError):
+        breaker.call(fail)
+    assert breaker.state == "closed"
+
+
+def test_stays_open_during_cooldown_then_half_opens(board, clock):
+    trip(board['sheets'])
+    clock.now += circuit.COOLDOWN_SEC - 1
+    assert board.blocked() == ["sheets"]
+    clock.now += 1
+    assert board.blocked() == []
+    assert board['sheets'].state == "half_open"
+
+
+def test_half_open_success_closes(board, clock):
+    trip(board['llm'])
+    clock.now += circuit.COOLDOWN_SEC
+    board.blocked()
+    board['llm'].call(lambda: None)
+    assert board['llm'].state == "closed" and board['llm'].failures == 0
+
+
+def test_half_open_failure_reopens_immediately(board, clock):
+    trip(board['llm'])
+    clock.now += circuit.COOLDOWN_SEC
+    board.blocked()
+    with pytest.raises(DependencyError):
+        board['llm'].call(fail)
+    assert board['llm'].state == "open" and board['llm'].opened_at == clock.now
+    assert board.blocked() == ["llm"]
+
+
+def test_state_is_shared_through_the_state_file(board, tmp_path):
+    trip(board['slack'])
+    reloaded = CircuitBoard(str(tmp_path / "circuits.json"))
+    assert reloaded['slack'].state == "open"
+    assert reloaded.blocked() == ["slack"]
+
+
+# ---------- 센더: 의존성 장애 중에는 행을 확정하지 않음 ----------
+HEADERS = ['title', 'url', 'status', 'identity_match']
+
+
+class FakeSheet:
+    def __init__(self, rows):
+        self.rows = [list(HEADERS)] + [list(r) for r in rows]
+        self.spreadsheet = None
+        self.writes = []
+
+    def row_values(self, r):
+        return list(self.rows[r - 1])
+
+    def col_values(self, c):
+        return [row[c - 1] for row in self.rows]
+
+    def batch_get(self, ranges):
+        out = []
+        for rg in ranges:
+            first, last = (int(n) for n in re.findall(r'[A-Z]+(\d+)', rg))
+            out.append([list(self.rows[i - 1]) for i in range(first, last + 1)])
+        return out
+
+    def update_cell(self, r, c, value):
+        self.writes.append((r, c, value))
+        self.rows[r - 1][c - 1] = value
+
+
+class FakeResponse:
+    status_code = 200
+    headers = {"Content-Type": "text/html; charset=utf-8"}
+    encoding = "utf-8"
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size=1):
+        yield ("<p>" + "충분히 긴 본문 문단입니다. " * 20 + "</p>").encode("utf-8")
+
+    def close(self):
+        pass
+
+
+class FakeSession:
+    def __init__(self):
+        self.posts = []
+
+    def get(self, url, **kwargs):
+        return FakeResponse()
+
+    def post(self, url, **kwargs):
+        self.posts.append(kwargs)
+        return SimpleNamespace(status_code=200)
+
+
+class FailingLLM:
+    calls = 0
+
+    def __init__(self, stats=None):
+        pass
+
+    def ask_json(self, messages):
+        FailingLLM.calls += 1
+        raise Exception("503 Service Unavailable")
+
+
+class EmptyIndex:
+    def find_exact(self, digest):
+        return None
+
+    def find_near_duplicate(self, value, exclude_url=None):
+        return None
+
+    def add(self, *args):
+        pass
+
+
+SOURCE = SimpleNamespace(
+    CONFIG={"name": "Test Sender", "source": "test", "gid": 1, "item_label": "항목",
+            "tags": ['p'], "min_text_len": 10, "fetch_delay": (0, 0), "post_delay": 0,
+            # 행 자체의 오류만 failed로 표시 (의존성 장애는 해당 없음)
+            "mark_failed_on_error": True},
+    identity_messages=lambda item, text: [{'role': 'user', 'content': text}],
+    summary_messages=lambda item, text: [{'role': 'user', 'content': text}],
+    build_blocks=lambda item, res: [],
+)
+
+
+def test_sender_leaves_rows_unchanged_while_llm_is_down(board, monkeypatch):
+    rows = [[f"글 {i}", f"https://example.com/{i}", "archived", ""] for i in range(5)]
+    sheet = FakeSheet(rows)
+    session = FakeSession()
+    reports = []
+    FailingLLM.calls = 0
+    monkeypatch.setenv("SLACK_WEBHOOK_URL", "https://hooks.example.com/x")
+    monkeypatch.setattr(sender_engine, 'get_worksheet', lambda gid: sheet)
+    monkeypatch.setattr(sender_engine, 'get_session', lambda: session)
+    monkeypatch.setattr(sender_engine, 'LLMClient', FailingLLM)
+    monkeypatch.setattr(sender_engine.FingerprintIndex, 'load', classmethod(lambda cls, *args: EmptyIndex()))
+    monkeypatch.setattr(sender_engine, 'CircuitBoard', lambda: board)
+    monkeypatch.setattr(sender_engine, 'pause', lambda seconds: None)
+    monkeypatch.setattr(sender_engine, 'write_report', lambda config, stats, started_at: reports.append(stats.copy()))
+
+    sender_engine.run_sender(SOURCE)
+
+    # 모든 행이 'archived' 그대로이고 identity_match도 쓰지 않음
+    assert sheet.rows[1:] == rows
+    assert sheet.writes == [] and session.posts == []
+    # 회로가 열린 뒤의 행은 시작하지 않고 다음 실행으로 넘김
+    assert FailingLLM.calls == circuit.THRESHOLD
+    stats = reports[0]
+    assert stats['errors'] == circuit.THRESHOLD and stats['failed'] == 0
+    assert stats['circuit_open'] == 1 and stats['deferred'] == len(rows) - circuit.THRESHOLD
+    assert board['llm'].state == "open"
@@ -0,0 +1,68 @@
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import http_client
+
+# ==========================================
+# 공유 Session의 DNS 캐시: 이 Session의 연결에만 적용되고 크기가 제한되는지 확인
+# ==========================================
+
+
+class OkHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), OkHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield httpd
+    httpd.shutdown()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    http_client._dns_cache.clear()
+    yield
+    http_client._dns_cache.clear()
+
+
+def test_session_does_not_patch_global_resolver():
+    original = socket.getaddrinfo
+    http_client.get_session()
+    assert socket.getaddrinfo is original
+
+
+def test_session_requests_use_cached_lookup(server, monkeypatch):
+    lookups = []
+    original = socket.getaddrinfo
+
+    def counting(host, *args, **kwargs):
+        lookups.append(host)
+        return original(host, *args, **kwargs)
+
+    monkeypatch.setattr(socket, 'getaddrinfo', counting)
+    session = http_client._build_session()
+    url = f"http://localhost:{server.server_port}/"
+    for _ in range(3):
+        # 매번 새 연결을 열도록 keep-alive를 끔
+        assert session.get(url, headers={'Connection': 'close'}).text == 'ok'
+    assert lookups.count('localhost') == 1
+    assert ('localhost', server.server_port) in http_client._dns_cache
+
+
+def test_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(http_client, 'DNS_CACHE_SIZE', 3)
+    for port in range(5):
+        http_client._resolve('127.0.0.1', 8000 + port)
+    assert list(http_client._dns_cache) == [('127.0.0.1', 8002), ('127.0.0.1', 8003), ('127.0.0.1', 8004)]
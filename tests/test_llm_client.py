@@ -0,0 +1,120 @@
+import json
+import time
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import llm_client
+
+# ==========================================
+# 로컬 OpenAI 대역 서버로 헤지 요청/장애 전환 확인
+# ==========================================
+# 모델 이름으로 대역 서버의 동작을 고릅니다.
+#   fast   : 바로 응답
+#   slow   : SLOW_SEC 뒤에 응답
+#   broken : 500 오류
+SLOW_SEC = 2.0
+MESSAGES = [{'role': 'system', 'content': 's'}, {'role': 'user', 'content': 'u'}]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        model = body['model']
+        self.server.calls.append(model)
+        if model == 'slow':
+            time.sleep(SLOW_SEC)
+        if model == 'broken':
+            self.send_response(500)
+            self.end_headers()
+            self.wfile.write(b'{}')
+            return
+        content = '```json\n{"model": "%s"}\n```' % model
+        data = json.dumps({
+            "id": "stub", "object": "chat.completion", "created": 0, "model": model,
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+        }).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    pytest.importorskip("openai")
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.calls = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv('OPENAI_BASE_URL', f'http://127.0.0.1:{server.server_port}/v1')
+    monkeypatch.setenv('OPENAI_API_KEY', 'stub')
+    monkeypatch.setattr(llm_client, 'HEDGE_SEC', 0.3)
+    yield server
+    server.shutdown()
+
+
+def make_client(spec, **kwargs):
+    stats = Counter()
+    return llm_client.LLMClient(llm_client.build_providers(spec), stats=stats, **kwargs), stats
+
+
+def test_fast_provider_answers_without_hedging(stub):
+    client, stats = make_client('openai:fast')
+    assert client.ask_json(MESSAGES) == {'model': 'fast'}
+    assert stats['llm_hedged'] == 0 and stats['llm_failover'] == 0
+
+
+def test_slow_provider_is_hedged_to_next_provider(stub):
+    client, stats = make_client('openai:slow,openai:fast')
+    started = time.time()
+    assert client.ask_json(MESSAGES) == {'model': 'fast'}
+    assert time.time() - started < SLOW_SEC
+    assert stats['llm_hedged'] == 1
+    assert stub.calls[:2] == ['slow', 'fast']
+
+
+def test_error_fails_over_without_waiting(stub):
+    client, stats = make_client('openai:broken,openai:fast')
+    started = time.time()
+    assert client.ask_json(MESSAGES) == {'model': 'fast'}
+    assert time.time() - started < llm_client.HEDGE_SEC
+    assert stats['llm_failover'] == 1
+
+
+def test_all_providers_failing_raises(stub):
+    client, _ = make_client('openai:broken')
+    with pytest.raises(Exception):
+        client.ask_json(MESSAGES)
+    assert stub.calls == ['broken'] * llm_client.MAX_ATTEMPTS
+
+
+def test_timeout_bounds_total_wait(stub):
+    client, _ = make_client('openai:slow', timeout=0.5)
+    started = time.time()
+    with pytest.raises(Exception):
+        client.ask_json(MESSAGES)
+    assert time.time() - started < SLOW_SEC
+
+
+def test_hedge_delay_uses_p95_of_recent_latencies():
+    client = llm_client.LLMClient(providers=[object()])
+    client.latencies.extend(float(i) for i in range(1, 10))   # 1..9초: 표본 부족
+    assert client.hedge_delay() == llm_client.HEDGE_SEC
+    client.latencies.append(10.0)
+    # nearest-rank p95: 10개 중 10번째 (9번째를 쓰면 p90)
+    assert client.hedge_delay() == 10.0
+    client.latencies.extend(float(i) for i in range(11, 21))
+    assert client.hedge_delay() == 19.0
+
+
+def test_parse_json_accepts_fenced_and_wrapped_text():
+    assert llm_client.parse_json('```json\n{"a": 1}\n```') == {'a': 1}
+    assert llm_client.parse_json('결과: {"a": 1} 입니다') == {'a': 1}
+    with pytest.raises(ValueError):
+        llm_client.parse_json('[1, 2]')
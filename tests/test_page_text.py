@@ -0,0 +1,159 @@
+import pytest
+
+from page_text import extract_text, read_text, NotHTML
+
+# ==========================================
+# 본문 추출이 이전 BeautifulSoup 방식과 같은지 확인
+# ==========================================
+# (의도한 차이: noscript 안의 텍스트는 본문에서 뺌)
+
+ARTICLE = """<!doctype html>
+<html><head><meta charset="utf-8"><title>글 제목</title>
+<style>.body { font-size: 16px; line-height: 1.6; margin: 0 auto; }</style>
+<script>window.__STATE__ = {"user": null, "items": [1, 2, 3], "flags": {"beta": true}};</script>
+</head><body>
+<header><nav><ul><li>메뉴 하나 항목<li>메뉴 두 번째 항목</ul></nav></header>
+<article>
+  <h2>콘텐츠 기획자가 알아야 할 것들</h2>
+  <p>첫 번째 문단입니다. <b>강조</b>와 <a href="/x">링크</a>가 섞여 있습니다.</p>
+  <p>두 번째 문단은 닫는 태그가 없습니다
+  <p>세 번째 문단 <span>안쪽 span 텍스트가 충분히 깁니다</span> 끝.</p>
+  <ul><li>목록 첫 항목 텍스트<li>목록 둘째 항목 <br>줄바꿈 포함</ul>
+  <h3>소제목 텍스트입니다</h3>
+  <img src="a.png"><p>이미지 뒤 문단도 수집됩니다.</p>
+</article>
+<footer><p>저작권 안내 문구가 들어갑니다 © 2024</p></footer>
+</body></html>"""
+
+APP_SHELL = """<html><head><title>앱</title></head><body>
+<div id="root"></div>
+<script>var config = {"api": "https://example.com/api", "features": ["a", "b", "c"], "long": "xxxxxxxxxxxxxxxxxxxx"};</script>
+<template><div><p>템플릿 안의 문단은 화면에 없습니다</p></div></template>
+</body></html>"""
+
+LISTING = """<div class="list"><ul>
+<li><span>프로젝트 카드 제목 하나</span><span>서울 · 온라인</span>
+<li><span>프로젝트 카드 제목 둘</span><div>설명 문구가 들어가는 영역</div>
+</ul><p>목록 아래 안내 문단입니다</p></div>"""
+
+CONFIGS = [
+    {'tags': ['p', 'h2', 'h3', 'li', 'span'], 'min_text_len': 10},
+    {'tags': ['p', 'h2', 'h3'], 'min_text_len': 20},
+    {'tags': ['div', 'p', 'li', 'span'], 'min_text_len': 10},
+]
+
+
+def bs4_text(html, config):
+    bs4 = pytest.importorskip("bs4")
+    soup = bs4.BeautifulSoup(html, 'html.parser')
+    return " ".join([e.get_text().strip() for e in soup.find_all(config['tags'])
+                     if len(e.get_text().strip()) > config['min_text_len']])
+
+
+@pytest.mark.parametrize("html", [ARTICLE, APP_SHELL, LISTING], ids=["article", "app_shell", "listing"])
+@pytest.mark.parametrize("config", CONFIGS, ids=["projects", "articles", "jobs"])
+def test_matches_beautifulsoup(html, config):
+    assert extract_text(html, dict(config, max_text_len=100000)) == bs4_text(html, config)
+
+
+def test_script_and_noscript_text_is_not_content():
+    html = '<div><noscript>이 사이트를 보려면 JavaScript를 켜 주세요</noscript>' \
+           '<script>{"payload": "인라인 JSON 데이터가 아주 깁니다"}</script></div>'
+    assert extract_text(html, {'tags': ['div'], 'min_text_len': 10}) == ""
+
+
+def test_stops_at_max_text_len():
+    html = "".join(f"<p>{i:04d} 문단 텍스트가 충분히 깁니다</p>" for i in range(500))
+    text = extract_text(html, {'tags': ['p'], 'min_text_len': 10, 'max_text_len': 200})
+    assert len(text) == 200 and text.startswith("0000")
+
+
+class FakeResponse:
+    def __init__(self, body, content_type="text/html; charset=utf-8", chunk=7):
+        self.body, self.chunk = body, chunk
+        self.headers = {"Content-Type": content_type}
+        self.encoding = "utf-8"
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size=1):
+        # 멀티바이트 문자가 조각 경계에서 잘리도록 작은 조각으로 나눔
+        for i in range(0, len(self.body), self.chunk):
+            yield self.body[i:i + self.chunk]
+
+    def close(self):
+        pass
+
+
+class FakeSession:
+    def __init__(self, response):
+        self.response = response
+
+    def get(self, url, headers=None, stream=False):
+        return self.response
+
+
+def test_streaming_matches_whole_document():
+    config = dict(CONFIGS[0], max_text_len=100000)
+    streamed = read_text(FakeSession(FakeResponse(ARTICLE.encode("utf-8"))), "http://x", config)
+    assert streamed == extract_text(ARTICLE, config)
+
+
+def test_non_html_is_rejected_before_reading():
+    with pytest.raises(NotHTML):
+        read_text(FakeSession(FakeResponse(b"%PDF", "application/pdf")), "http://x", CONFIGS[0])
+
+
+# ==========================================
+# <head> 메타데이터 우선 사용 (metadata_min_len)
+# ==========================================
+LONG_DESCRIPTION = "메타 설명 문구가 충분히 길게 들어갑니다. " * 5
+ARTICLE_BODY = "JSON-LD 본문 전체 텍스트입니다. " * 10
+
+
+def with_head(head, body=ARTICLE):
+    return body.replace("<title>글 제목</title>", "<title>글 제목</title>" + head)
+
+
+class CountingResponse(FakeResponse):
+    def __init__(self, body):
+        super().__init__(body, chunk=64)
+        self.read = 0
+
+    def iter_content(self, chunk_size=1):
+        for piece in super().iter_content(chunk_size):
+            self.read += len(piece)
+            yield piece
+
+
+def test_metadata_early_exit_skips_body():
+    html = with_head(f'<meta property="og:description" content="{LONG_DESCRIPTION}">'
+                     f'<script type="application/ld+json">{{"@type": "Article", "articleBody": "{ARTICLE_BODY}"}}</script>')
+    config = dict(CONFIGS[0], metadata_min_len=100)
+    text = extract_text(html, config)
+    # 본문 전체(articleBody)가 가장 앞에 오고, 본문 요소의 텍스트는 쓰지 않음
+    assert text == " ".join([ARTICLE_BODY.strip(), LONG_DESCRIPTION.strip()])
+    assert "첫 번째 문단" not in text
+
+
+def test_metadata_early_exit_stops_streaming_at_head():
+    html = with_head(f'<meta name="description" content="{LONG_DESCRIPTION}">').encode("utf-8")
+    response = CountingResponse(html)
+    config = dict(CONFIGS[0], metadata_min_len=100)
+    assert read_text(FakeSession(response), "http://x", config) == LONG_DESCRIPTION.strip()
+    # </head> 직후 조각에서 멈추고 본문은 받지 않음
+    assert response.read <= html.index(b"</head>") + 2 * 64
+
+
+def test_short_metadata_falls_back_to_full_parse():
+    html = with_head('<meta property="og:description" content="짧은 설명">')
+    config = dict(CONFIGS[0], max_text_len=100000)
+    assert extract_text(html, dict(config, metadata_min_len=100)) == extract_text(html, config)
+    assert extract_text(html, dict(config, metadata_min_len=100)) == bs4_text(html, CONFIGS[0])
+
+
+def test_metadata_ignored_without_metadata_min_len():
+    html = with_head(f'<meta property="og:description" content="{LONG_DESCRIPTION}">')
+    config = dict(CONFIGS[0], max_text_len=100000)
+    assert extract_text(html, config) == bs4_text(html, CONFIGS[0])
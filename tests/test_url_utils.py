@@ -0,0 +1,94 @@
+import pytest
+
+from url_utils import canonicalize, url_key, SOURCE_RULES
+from dedupe_urls import plan_source
+
+# ==========================================
+# URL 정규화: 저장 형태는 접속 가능한 그대로, 비교 키에서만 통일
+# ==========================================
+
+
+@pytest.mark.parametrize("url", [
+    "http://blog.example.com/post/1/",
+    "http://blog.example.com/post/1",
+    "https://blog.example.com/post/1/",
+])
+def test_canonicalize_keeps_scheme_and_path(url):
+    assert canonicalize(url, 'mix') == url
+
+
+def test_canonicalize_strips_tracking_params_only():
+    url = "https://blog.example.com/p?utm_source=x&b=%EA%B0%80&fbclid=1&a=1&ref=home#top"
+    assert canonicalize(url, 'mix') == "https://blog.example.com/p?b=%EA%B0%80&a=1&ref=home"
+
+
+def test_canonicalize_normalizes_host_case_and_default_port():
+    assert canonicalize("HTTPS://Blog.Example.com:443/Post", 'mix') == "https://blog.example.com/Post"
+    assert canonicalize("http://example.com:443/a", 'mix') == "http://example.com:443/a"
+
+
+def test_canonicalize_leaves_non_urls_alone():
+    assert canonicalize("  ", 'mix') == ""
+    assert canonicalize("not a url", 'mix') == "not a url"
+
+
+@pytest.mark.parametrize("variant", [
+    "http://blog.example.com/post/1/",
+    "https://www.blog.example.com/post/1",
+    "https://blog.example.com//post//1/?utm_medium=social",
+    "https://blog.example.com:443/post/1#comments",
+])
+def test_url_key_folds_scheme_www_and_slashes(variant):
+    assert url_key(variant, 'mix') == "blog.example.com/post/1"
+
+
+def test_url_key_ignores_query_order_but_keeps_values():
+    assert url_key("https://a.com/p?x=1&y=2", 'mix') == url_key("https://a.com/p?y=2&x=1", 'mix')
+    assert url_key("https://a.com/p?x=1", 'mix') != url_key("https://a.com/p?x=2", 'mix')
+
+
+def test_url_key_keeps_non_default_port():
+    assert url_key("http://a.com:8080/p", 'mix') != url_key("http://a.com/p", 'mix')
+
+
+def test_source_rules_cover_every_source():
+    assert set(SOURCE_RULES) == {'letspl', 'side', 'offercent', 'surfit', 'mix'}
+
+
+def test_letspl_and_offercent_drop_all_query_params():
+    for source in ('letspl', 'offercent'):
+        assert canonicalize("https://letspl.me/project/12?ref=home&tab=info", source) == "https://letspl.me/project/12"
+
+
+def test_side_template_unifies_listing_and_detail_urls():
+    expected = "https://sideproject.co.kr/projects/?bmode=view&idx=5"
+    assert canonicalize("https://sideproject.co.kr/projects/?idx=5&bmode=view&t=board", 'side') == expected
+    assert url_key("http://www.sideproject.co.kr/projects?bmode=view&idx=5", 'side') == url_key(expected, 'side')
+    # idx가 없으면 템플릿을 쓰지 않고 그대로 둠
+    assert canonicalize("https://sideproject.co.kr/projects/", 'side') == "https://sideproject.co.kr/projects/"
+
+
+def test_naver_blog_posts_stay_distinct_for_article_sources():
+    base = "https://m.blog.naver.com/PostView.naver?blogId=a&logNo={}"
+    for source in ('mix', 'surfit'):
+        assert url_key(base.format(1), source) != url_key(base.format(2), source)
+        assert canonicalize(base.format(1) + "&ref=rss", source) == base.format(1) + "&ref=rss"
+
+
+def test_dedupe_plan_keeps_most_advanced_row_and_original_scheme():
+    all_v = [
+        ['title', 'url', 'status'],
+        ['a', 'http://blog.example.com/post/1/?utm_source=x', 'archived'],
+        ['a', 'https://www.blog.example.com/post/1', 'published'],
+        ['b', 'http://other.example.com/2/', 'archived'],
+    ]
+    url_idx, deletes, rewrites = plan_source(all_v, 'mix')
+    assert url_idx == 1
+    assert deletes == [2]
+    # 남긴 행은 이미 정규화된 형태라 고쳐 쓰지 않고, http 전용 글도 그대로 둠
+    assert rewrites == []
+
+
+def test_dedupe_plan_rewrites_only_tracking_params():
+    all_v = [['title', 'url', 'status'], ['a', 'http://blog.example.com/p/?utm_source=x&id=3', 'archived']]
+    assert plan_source(all_v, 'mix')[2] == [(2, 'http://blog.example.com/p/?id=3')]
@@ -0,0 +1,81 @@
+import re
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode, unquote_plus
+
+# ==========================================
+# [공통] URL 정규화
+# ==========================================
+# 같은 글이 추적 파라미터, 끝 슬래시, http/https, www 유무만 다른 URL로 다시 들어오면
+# 중복 검사를 통과해 센더에서 페이지 수집과 LLM 호출이 한 번 더 일어납니다.
+#
+#   canonicalize(url, source) : 시트에 저장할 URL. 추적 파라미터만 빼고 scheme, 경로(끝 슬래시 포함),
+#                               나머지 쿼리는 원래대로 둠 (http 전용/슬래시를 구분하는 외부 블로그도 그대로 접속)
+#   url_key(url, source)      : 비교용 키. scheme, www, 끝 슬래시, 중복 슬래시, 쿼리 순서를 여기서만 통일
+#
+# 소스별 규칙:
+#   keep     : 남길 쿼리 파라미터 목록 (None이면 추적 파라미터만 제거)
+#   template : 남긴 파라미터로 URL을 다시 조립 (같은 글의 여러 주소 형태를 하나로)
+#
+# 'ref'처럼 실제 파라미터로도 쓰이는 이름은 공통 추적 파라미터에 넣지 않습니다.
+
+TRACKING_PARAMS = {'fbclid', 'gclid', 'dclid', 'msclkid', 'igshid', 'mc_cid', 'mc_eid', 'ref_src'}
+TRACKING_PREFIXES = ('utm_',)
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+SOURCE_RULES = {
+    'letspl': {'keep': []},
+    'side': {'keep': ['idx'], 'template': "https://sideproject.co.kr/projects/?bmode=view&idx={idx}"},
+    'offercent': {'keep': []},
+    # Mix/서핏은 외부 매체 글로 연결되고 쿼리가 글을 구분하기도 하므로
+    # (예: PostView.naver?blogId=..&logNo=..) 추적 파라미터만 제거
+    'surfit': {'keep': None},
+    'mix': {'keep': None},
+}
+
+
+def _is_tracking(name):
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def _param_name(piece):
+    return unquote_plus(piece.split('=', 1)[0])
+
+
+def canonicalize(url, source=None):
+    url = (url or '').strip()
+    if not url: return url
+    parts = urlsplit(url)
+    if not parts.netloc: return url
+
+    rule = SOURCE_RULES.get(source, {'keep': None})
+    # 남기는 파라미터는 원래 인코딩/순서 그대로
+    pieces = [p for p in parts.query.split('&') if p]
+    if rule['keep'] is None:
+        pieces = [p for p in pieces if not _is_tracking(_param_name(p))]
+    else:
+        pieces = [p for p in pieces if _param_name(p) in rule['keep']]
+
+    if rule.get('template'):
+        values = dict(parse_qsl('&'.join(pieces), keep_blank_values=True))
+        if all(k in values for k in rule['keep']):
+            return rule['template'].format(**values)
+
+    scheme = parts.scheme.lower()
+    host = parts.hostname.lower() if parts.hostname else parts.netloc.lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    return urlunsplit((scheme, host, parts.path, '&'.join(pieces), ''))
+
+
+def url_key(url, source=None):
+    canonical = canonicalize(url, source)
+    parts = urlsplit(canonical)
+    if not parts.netloc: return canonical
+
+    host = re.sub(r'^www\.', '', parts.hostname or parts.netloc.lower())
+    if parts.port and parts.port not in DEFAULT_PORTS.values():
+        host = f"{host}:{parts.port}"
+    path = re.sub(r'/{2,}', '/', parts.path or '/')
+    if len(path) > 1: path = path.rstrip('/')
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return host + path + (f"?{query}" if query else '')